@@ -1,2 +1,13 @@
 from app.datasources.justeat_datasource import JustEatDataSource
+from app.datasources.sqlite_datasource import SQLiteReviewDatasource
 from app.datasources.xlsx_datasource import MemoryXLSXDatasource
+from app.interface.abstract import AbstractReviewDatasource
+from app.interface.enums import ReviewBackend
+from app.settings import get_settings
+
+
+def get_review_datasource() -> AbstractReviewDatasource:
+    """Return the review datasource selected in the settings."""
+    if get_settings().reviews_backend == ReviewBackend.sqlite:
+        return SQLiteReviewDatasource()
+    return MemoryXLSXDatasource()
@@ -0,0 +1,98 @@
+from html.parser import HTMLParser
+from types import MappingProxyType
+
+from app.datasources.justeat_scripts import ReviewFields
+
+# The card markup of the modal with a load more button.
+_CARD_CLASS = 'c-reviews-item'
+_RATING_CLASS = 'c-rating-mask'
+_CARD_FIELDS = MappingProxyType({
+    'review-author': 'name',
+    'review-date': 'date',
+    'review-text': 'text',
+})
+_VOID_ELEMENTS = frozenset((
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link',
+    'meta', 'source', 'track', 'wbr',
+))
+
+
+def review_cards(page: str) -> list[ReviewFields]:
+    """Return the fields of the server-rendered review cards."""
+    parser = _ReviewCardParser()
+    parser.feed(page)
+    parser.close()
+    return parser.cards
+
+
+class _ReviewCardParser(HTMLParser):
+    """Reads review cards like the extraction script does in a browser."""
+
+    def __init__(self):
+        """Start outside of any card."""
+        super().__init__(convert_charrefs=True)
+        self.cards: list[ReviewFields] = []
+        self._depth = 0
+        self._card: dict[str, str | None] | None = None
+        self._card_depth = 0
+        self._field: str | None = None
+        self._field_depth = 0
+        self._text: list[str] = []
+
+    def handle_starttag(self, tag: str, attrs: list) -> None:
+        """Open a card, or a field of the open card."""
+        if tag not in _VOID_ELEMENTS:
+            self._depth += 1
+        attributes = dict(attrs)
+        classes = (attributes.get('class') or '').split()
+        if _CARD_CLASS in classes:
+            self._card = dict.fromkeys(('name', 'date', 'rating', 'text'))
+            self._card_depth = self._depth
+        elif self._card is not None:
+            self._read_attributes(self._card, attributes, classes)
+
+    def handle_data(self, text: str) -> None:
+        """Collect the text of an open field."""
+        if self._field is not None:
+            self._text.append(text)
+
+    def handle_endtag(self, tag: str) -> None:
+        """Close the field or the card the element belongs to."""
+        if tag in _VOID_ELEMENTS:
+            return
+        if self._field is not None and self._depth == self._field_depth:
+            self._close_field()
+        if self._card is not None and self._depth == self._card_depth:
+            self._close_card(self._card)
+        self._depth -= 1
+
+    def _read_attributes(
+        self,
+        card: dict[str, str | None],
+        attributes: dict[str, str | None],
+        classes: list[str],
+    ) -> None:
+        if any(_RATING_CLASS in class_name for class_name in classes):
+            card['rating'] = attributes.get('style')
+        field = _CARD_FIELDS.get(attributes.get('data-test-id') or '')
+        if field is not None and self._field is None:
+            self._field = field
+            self._field_depth = self._depth
+            self._text = []
+
+    def _close_field(self) -> None:
+        if self._card is not None and self._field is not None:
+            self._card[self._field] = ''.join(self._text).strip()
+        self._field = None
+
+    def _close_card(self, card: dict[str, str | None]) -> None:
+        name, date = card['name'], card['date']
+        if not name or not date:
+            raise ValueError('Review card without an author or a date')
+        self.cards.append({
+            'name': name,
+            'date': date,
+            'rating': card['rating'],
+            'text': card['text'] or None,
+        })
+        self._card = None
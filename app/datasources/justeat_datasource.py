@@ -1,11 +1,18 @@
+import asyncio
+from abc import abstractmethod
+from collections.abc import AsyncIterator
 from collections.abc import MutableMapping
+from datetime import date
 from datetime import datetime
+from datetime import timedelta
 from datetime import timezone
 from decimal import Decimal
 
+from cachetools import LRUCache
 from cachetools import TTLCache
 from selenium.common.exceptions import NoSuchElementException
 from selenium.common.exceptions import TimeoutException
+from selenium.common.exceptions import WebDriverException
 from selenium.webdriver import Remote
 from selenium.webdriver.common.by import By
 from selenium.webdriver.remote.webdriver import WebDriver
@@ -13,10 +20,21 @@ from selenium.webdriver.remote.webelement import WebElement
 from selenium.webdriver.support import expected_conditions as e_cond
 from selenium.webdriver.support.ui import WebDriverWait
 
+from app.datasources.justeat_http import JustEatHTTPEngine
+from app.datasources.justeat_scripts import AUTO_SCROLL_MODAL_REVIEWS
+from app.datasources.justeat_scripts import BUTTON_MODAL_REVIEWS
+from app.datasources.justeat_scripts import FIRST_MATCHING_SELECTOR
+from app.datasources.justeat_scripts import ReviewFields
+from app.datasources.review_stats import ReviewAggregates
+from app.datasources.scrape_cache import MemoryScrapeCache
+from app.datasources.scrape_demand import RestaurantDemand
+from app.datasources.scrape_flight import ScrapeFlight
 from app.datasources.scraping_utils import humanize_with_pauses
 from app.datasources.scraping_utils import sleep_with_jitter
 from app.initializers.logger import get_logger
+from app.initializers.pacing import PACER
 from app.initializers.selenium import DRIVER_POOL
+from app.initializers.selenium import run_in_driver_thread
 from app.interface import abstract
 from app.interface import exceptions as ex
 from app.interface import schemas
@@ -32,11 +50,59 @@ _LOCATION_TIMEOUT = 10
 _PAGE_LOAD_TIMEOUT = 30
 _CACHE_EXPIRATION = 3600
 _CACHE_SIZE = 1000
+# Long enough for any scrape, a dead worker only delays the next one.
+_REFRESH_LEASE_SECONDS = 600
+_NO_LEAD = timedelta()
+# Errors of a strategy the page no longer has the structure for.
+_STRATEGY_ERRORS = (WebDriverException, ValueError, ArithmeticError)
 
+# Aggregates and the exact buffer they were counted from.
+_CountedBuffer = tuple[list[schemas.Review], ReviewAggregates]
 
-class ButtonLoadModalStrategy(abstract.AbstractReviewScrapingStrategy):
+
+class _ScriptedParsingStrategy(abstract.AbstractReviewScrapingStrategy):
+    """Strategy reading all review cards with a single script.
+
+    Every WebDriver call is a round trip to Selenium, so one script
+    returns the raw fields of every card asked for. Cards are only read
+    element by element when the script fails.
+    """
+
+    extraction_script: str
+
+    def parse_reviews(
+        self,
+        driver: WebDriver,
+        first_card: int = 0,
+    ) -> list[schemas.Review]:
+        """Parse reviews from the modal window, from the first card on."""
+        try:
+            cards = driver.execute_script(self.extraction_script, first_card)
+        except WebDriverException as error:
+            logger.warning('Review extraction script failed: %s', error.msg)
+            cards = list(map(
+                self._read_review_element,
+                self._find_review_elements(driver)[first_card:],
+            ))
+        return [self.parse_card(card) for card in cards]
+
+    @abstractmethod
+    def parse_card(self, card: ReviewFields) -> schemas.Review:
+        """Build a review from the raw fields of its card."""
+
+    @abstractmethod
+    def _find_review_elements(self, driver: WebDriver) -> list[WebElement]:
+        """Find the elements of all cards, in one call."""
+
+    @abstractmethod
+    def _read_review_element(self, review_element: WebElement) -> ReviewFields:
+        """Read the fields of a card, one call per element."""
+
+
+class ButtonLoadModalStrategy(_ScriptedParsingStrategy):
     """Strategy for a modal window with a button fro pagination."""
     modal_locator = (By.CSS_SELECTOR, "[data-test-id='reviews-modal']")
+    extraction_script = BUTTON_MODAL_REVIEWS
 
     async def load_more_reviews(self, driver: WebDriver) -> None:
         """Load more reviews by scrolling and clicking."""
@@ -44,17 +110,19 @@ class ButtonLoadModalStrategy(abstract.AbstractReviewScrapingStrategy):
         await self._click_load_more_button(driver)
         await self._wait_for_reviews(driver)
 
-    def parse_reviews(self, driver: WebDriver) -> list[schemas.Review]:
-        """Parse reviews from the modal window."""
-        review_elements = driver.find_element(
-            By.CLASS_NAME, 'c-reviews-items',
-        ).find_elements(
-            By.CLASS_NAME, 'c-reviews-item',
+    def parse_card(self, card: ReviewFields) -> schemas.Review:
+        """Build a review from the raw fields of its card."""
+        return schemas.Review(
+            created_at=self._parse_date(card['date']),
+            reviewer_name=card['name'],
+            rating=self._parse_rating(card['rating']),
+            review_text=card['text'],
+            sentiment=None,
         )
-        return [self._parse_review(element) for element in review_elements]
 
     @humanize_with_pauses(pre=1)
-    async def _scroll_to_load_more_button(self, driver: WebDriver) -> None:
+    @run_in_driver_thread
+    def _scroll_to_load_more_button(self, driver: WebDriver) -> None:
         try:
             load_more_button = driver.find_element(
                 By.CSS_SELECTOR, "[data-test-id='review-show-more-button']",
@@ -67,7 +135,8 @@ class ButtonLoadModalStrategy(abstract.AbstractReviewScrapingStrategy):
         )
 
     @humanize_with_pauses(pre=1, post=2)
-    async def _click_load_more_button(self, driver: WebDriver) -> None:
+    @run_in_driver_thread
+    def _click_load_more_button(self, driver: WebDriver) -> None:
         try:
             button = WebDriverWait(driver, _LOCATION_TIMEOUT).until(
                 e_cond.element_to_be_clickable(
@@ -84,7 +153,8 @@ class ButtonLoadModalStrategy(abstract.AbstractReviewScrapingStrategy):
             )
         button.click()
 
-    async def _wait_for_reviews(self, driver: WebDriver) -> None:
+    @run_in_driver_thread
+    def _wait_for_reviews(self, driver: WebDriver) -> None:
         try:
             WebDriverWait(driver, _LOCATION_TIMEOUT).until(
                 lambda drv: drv.find_elements(By.CLASS_NAME, 'c-reviews-item'),
@@ -93,21 +163,30 @@ class ButtonLoadModalStrategy(abstract.AbstractReviewScrapingStrategy):
             logger.warning('No new reviews loaded after clicking')
             raise ex.NoMoreReviewsError('No new reviews loaded after clicking')
 
-    def _parse_review(self, review_element: WebElement) -> schemas.Review:
-        name = review_element.find_element(
-            By.CSS_SELECTOR, "[data-test-id='review-author']",
-        ).text
-        date_str = review_element.find_element(
-            By.CSS_SELECTOR, "[data-test-id='review-date']",
-        ).text
-        return schemas.Review(
-            created_at=self._parse_date(date_str),
-            reviewer_name=name,
-            rating=self._parse_rating(review_element),
-            review_text=self._parse_review_text(review_element),
-            sentiment=None,
+    def _find_review_elements(self, driver: WebDriver) -> list[WebElement]:
+        return driver.find_element(
+            By.CLASS_NAME, 'c-reviews-items',
+        ).find_elements(
+            By.CLASS_NAME, 'c-reviews-item',
         )
 
+    def _read_review_element(self, review_element: WebElement) -> ReviewFields:
+        rating_element = review_element.find_element(
+            By.CSS_SELECTOR, "[data-test-id='rating-multi-star-component']",
+        )
+        return {
+            'name': review_element.find_element(
+                By.CSS_SELECTOR, "[data-test-id='review-author']",
+            ).text,
+            'date': review_element.find_element(
+                By.CSS_SELECTOR, "[data-test-id='review-date']",
+            ).text,
+            'rating': rating_element.find_element(
+                By.CSS_SELECTOR, "[class*='c-rating-mask']",
+            ).get_attribute('style'),
+            'text': self._parse_review_text(review_element),
+        }
+
     def _parse_review_text(self, review_element: WebElement) -> str | None:
         try:
             return review_element.find_element(
@@ -116,16 +195,10 @@ class ButtonLoadModalStrategy(abstract.AbstractReviewScrapingStrategy):
         except NoSuchElementException:
             return None
 
-    def _parse_rating(self, review_element: WebElement) -> Decimal:
-        rating_element = review_element.find_element(
-            By.CSS_SELECTOR, "[data-test-id='rating-multi-star-component']",
-        )
-        stars = rating_element.find_element(
-            By.CSS_SELECTOR, "[class*='c-rating-mask']",
-        )
-        style = stars.get_attribute('style') or _DEFAULT_RATING_PERCENTAGE
+    def _parse_rating(self, style: str | None) -> Decimal:
         rating = Decimal(
-            self._parse_percentage(style) / _PERCENTAGE_TO_RATING_STEP,
+            self._parse_percentage(style or _DEFAULT_RATING_PERCENTAGE)
+            / _PERCENTAGE_TO_RATING_STEP,
         )
         return rating.quantize(Decimal('0.1'))
 
@@ -139,19 +212,15 @@ class ButtonLoadModalStrategy(abstract.AbstractReviewScrapingStrategy):
         return datetime(year, month, day, tzinfo=timezone.utc)
 
 
-class AutoScrollModalStrategy(abstract.AbstractReviewScrapingStrategy):
+class AutoScrollModalStrategy(_ScriptedParsingStrategy):
     """Strategy for a modal window with automatic loading on scrolling."""
 
     modal_locator = (By.CSS_SELECTOR, "[data-qa='restaurant-info-modal']")
+    extraction_script = AUTO_SCROLL_MODAL_REVIEWS
 
     async def load_more_reviews(self, driver: WebDriver):
         """Load more reveiws by scrolling the modal window."""
-        modal = driver.find_element(
-            By.CSS_SELECTOR, "[data-qa='restaurant-info-modal']",
-        )
-        scroll_content = modal.find_element(
-            By.CSS_SELECTOR, "[data-qa='modal-scroll-content']",
-        )
+        scroll_content = await self._find_scroll_content(driver)
         last_height, new_height = await self._scroll_element(
             driver,
             scroll_content,
@@ -159,84 +228,111 @@ class AutoScrollModalStrategy(abstract.AbstractReviewScrapingStrategy):
         if new_height == last_height:
             raise ex.NoMoreReviewsError('No more reviews to load')
 
-    def parse_reviews(self, driver: WebDriver) -> list[schemas.Review]:
-        """Parse reviews from the modal window."""
-        review_elements = driver.find_elements(
-            By.CSS_SELECTOR, "[data-qa='review-card-component-element']",
+    def parse_card(self, card: ReviewFields) -> schemas.Review:
+        """Build a review from the raw fields of its card."""
+        raw_rating = card['rating'] or _DEFAULT_RATING_FLOAT
+        return schemas.Review(
+            created_at=datetime.strptime(
+                card['date'], '%A, %d %B %Y',
+            ).replace(tzinfo=timezone.utc),
+            reviewer_name=card['name'],
+            rating=Decimal(raw_rating.split()[0]),
+            review_text=card['text'],
+            sentiment=None,
+        )
+
+    @run_in_driver_thread
+    def _find_scroll_content(self, driver: WebDriver) -> WebElement:
+        modal = driver.find_element(
+            By.CSS_SELECTOR, "[data-qa='restaurant-info-modal']",
+        )
+        return modal.find_element(
+            By.CSS_SELECTOR, "[data-qa='modal-scroll-content']",
         )
-        return [self._parse_review(element) for element in review_elements]
 
     @humanize_with_pauses(pre=1)
     async def _scroll_element(self, driver: WebDriver, element: WebElement):
-        last_height = driver.execute_script(
-            'return arguments[0].scrollHeight', element,
+        last_height = await DRIVER_POOL.run(
+            driver.execute_script, 'return arguments[0].scrollHeight', element,
         )
-        driver.execute_script(
-            'arguments[0].scrollTo(0, arguments[0].scrollHeight);', element,
+        await DRIVER_POOL.run(
+            driver.execute_script,
+            'arguments[0].scrollTo(0, arguments[0].scrollHeight);',
+            element,
         )
         await sleep_with_jitter(2)
-        new_height = driver.execute_script(
-            'return arguments[0].scrollHeight', element,
+        new_height = await DRIVER_POOL.run(
+            driver.execute_script, 'return arguments[0].scrollHeight', element,
         )
         return last_height, new_height
 
-    def _parse_review(self, review_element: WebElement) -> schemas.Review:
-        name, date_obj = self._parse_label(
-            review_element.find_element(
-                By.XPATH, ".//div[starts-with(@id, 'label-')]",
-            ),
-        )
-        rating, text = self._parse_description(
-            review_element.find_element(
-                By.XPATH, ".//div[starts-with(@id, 'description-')]",
-            ),
-        )
-        return schemas.Review(
-            created_at=date_obj,
-            reviewer_name=name,
-            rating=rating,
-            review_text=text,
-            sentiment=None,
+    def _find_review_elements(self, driver: WebDriver) -> list[WebElement]:
+        return driver.find_elements(
+            By.CSS_SELECTOR, "[data-qa='review-card-component-element']",
         )
 
-    def _parse_label(self, label_element: WebElement) -> tuple[str, datetime]:
-        name = label_element.find_element(
-            By.CSS_SELECTOR, "[data-qa='text']",
-        ).text
-        date_str = label_element.find_element(
-            By.CSS_SELECTOR, "b[data-qa='text']",
-        ).text
-        date_obj = datetime.strptime(
-            date_str, '%A, %d %B %Y',
-        ).replace(tzinfo=timezone.utc)
-        return name, date_obj
-
-    def _parse_description(
-        self,
-        description_element: WebElement,
-    ) -> tuple[Decimal, str | None]:
-        rating_el = description_element.find_element(
-            By.CSS_SELECTOR, "[data-qa='rating-display-element']",
+    def _read_review_element(self, review_element: WebElement) -> ReviewFields:
+        label_element = review_element.find_element(
+            By.XPATH, ".//div[starts-with(@id, 'label-')]",
+        )
+        description_element = review_element.find_element(
+            By.XPATH, ".//div[starts-with(@id, 'description-')]",
         )
-        raw_rating = rating_el.get_attribute('title') or _DEFAULT_RATING_FLOAT
-        rating = Decimal(raw_rating.split()[0])
-        text_element = description_element.find_elements(
+        text_elements = description_element.find_elements(
             By.CSS_SELECTOR, "[data-qa='review-card-comment']",
         )
-        text = text_element[0].text if text_element else None
-        return rating, text
+        return {
+            'name': label_element.find_element(
+                By.CSS_SELECTOR, "[data-qa='text']",
+            ).text,
+            'date': label_element.find_element(
+                By.CSS_SELECTOR, "b[data-qa='text']",
+            ).text,
+            'rating': description_element.find_element(
+                By.CSS_SELECTOR, "[data-qa='rating-display-element']",
+            ).get_attribute('title'),
+            'text': text_elements[0].text if text_elements else None,
+        }
 
 
 class JustEatDataSource:
-    """Just Eat site scraper as a data source."""
+    """Just Eat site scraper as a data source.
+
+    Scraped reviews are shared through the scrape cache. Once they are
+    older than its TTL, they are still served while a single scrape
+    refreshes them in the background.
+    """
 
     strategy: abstract.AbstractReviewScrapingStrategy
     possible_strategies = (AutoScrollModalStrategy, ButtonLoadModalStrategy)
+    # The strategy that parsed a page, by its URL. The URL names the
+    # site variant as well as the restaurant.
+    strategies: MutableMapping[
+        str, type[abstract.AbstractReviewScrapingStrategy],
+    ] = TTLCache(maxsize=_CACHE_SIZE, ttl=settings.scrape_strategy_ttl)
     url_template = 'https://www.just-eat.co.uk/{rbf}/reviews?openOnWeb=true'
-    buffer_cache: MutableMapping[str, list[schemas.Review]] = TTLCache(
+    scrape_cache: abstract.AbstractScrapeCache = MemoryScrapeCache()
+    scrape_ttl = timedelta(seconds=_CACHE_EXPIRATION)
+    # Reads the first reviews without a browser, when set.
+    http_engine: JustEatHTTPEngine | None = None
+    # The reviews this worker reads and scrapes into, per restaurant.
+    buffer_cache: MutableMapping[str, schemas.ScrapedReviews] = LRUCache(
+        maxsize=_CACHE_SIZE,
+    )
+    statistics_cache: MutableMapping[str, _CountedBuffer] = TTLCache(
         maxsize=_CACHE_SIZE,
         ttl=_CACHE_EXPIRATION,
     )
+    # Concurrent requests for a restaurant share a single scrape.
+    flights: MutableMapping[str, ScrapeFlight] = TTLCache(
+        maxsize=_CACHE_SIZE,
+        ttl=_CACHE_EXPIRATION,
+    )
+    refreshes: set[asyncio.Task] = set()
+    # Requests of this worker, for pre-scraping the popular restaurants.
+    demand = RestaurantDemand()
+    # Sessions left to others before taking a browser, for pre-scrapes.
+    reserved_sessions = 0
 
     def __init__(
         self,
@@ -245,95 +341,484 @@ class JustEatDataSource:
         """Set up basic configuration."""
         self.restaurant_slug = restaurant_slug
         self.base_url = self.url_template.format(rbf=restaurant_slug)
-        self.review_buffer = self.buffer_cache.get(restaurant_slug, [])
+        self.scraped = self.buffer_cache.get(
+            restaurant_slug,
+            schemas.ScrapedReviews(scraped_at=datetime.now(timezone.utc)),
+        )
         self.driver_manager = DRIVER_POOL.get_driver()
         self.driver: Remote | None = None
+        self._parsed_cards = 0
+        self._strategy_known = False
+        self._flight: ScrapeFlight | None = None
+
+    @classmethod
+    def use_scrape_cache(
+        cls,
+        scrape_cache: abstract.AbstractScrapeCache,
+        ttl_seconds: int,
+    ) -> None:
+        """Share scraped reviews through the cache, fresh for the TTL."""
+        cls.scrape_cache = scrape_cache
+        cls.scrape_ttl = timedelta(seconds=ttl_seconds)
+
+    @classmethod
+    def use_http_engine(cls, http_engine: JustEatHTTPEngine | None) -> None:
+        """Read the first reviews over HTTP, before taking a browser."""
+        cls.http_engine = http_engine
+
+    @property
+    def review_buffer(self) -> list[schemas.Review]:
+        """The reviews scraped so far, in page order."""
+        return self.scraped.reviews
+
+    @property
+    def strategy_name(self) -> str | None:
+        """The strategy of the scrape waited for, once it chose one."""
+        if self._flight is None:
+            return None
+        return self._flight.strategy_name
 
     async def __aenter__(self):
-        """Do nothing except open the context."""
+        """Catch up with the reviews scraped by other workers."""
+        flight = self.flights.get(self.restaurant_slug)
+        # A running scrape keeps filling the reviews it started with.
+        if flight is None or flight.landed:
+            await self._load_cached()
+        if self._is_stale():
+            await self._start_refresh()
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        """Store the cache, release the driver and reset page state."""
-        cache_size = len(self.buffer_cache.get(self.restaurant_slug, []))
-        buffer_size = len(self.review_buffer)
-        if cache_size < buffer_size:
-            self.buffer_cache[self.restaurant_slug] = self.review_buffer
-        if self.driver is None:
-            return
-        self.driver.get('about:blank')
-        self.driver = None
-        await self.driver_manager.__aexit__(exc_type, exc_val, exc_tb)
+        """Do nothing, the scrape releases its driver when it lands."""
 
-    async def initialize_driver(self):
-        """Acquire a driver for the scraper."""
-        self.driver = await self.driver_manager.__aenter__()  # noqa: WPS609
+    async def refresh(self, review_count: int) -> None:
+        """Scrape as many reviews anew, then share them."""
+        self.scraped = schemas.ScrapedReviews(
+            scraped_at=datetime.now(timezone.utc),
+        )
+        flight = ScrapeFlight(self.review_buffer, self._scrape)
+        await flight.wait_for(max(review_count, 1))
+        await flight.task
+
+    async def prescrape(self, review_count: int, lead: timedelta) -> None:
+        """Scrape the reviews ahead of requests, unless fresh beyond the lead.
+
+        Restaurants never scraped are scraped as for a request, others
+        are refreshed by a single worker, as stale ones are.
+        """
+        flight = self.flights.get(self.restaurant_slug)
+        if flight is not None and not flight.landed:
+            return
+        await self._load_cached()
+        if not self.review_buffer:
+            await self._scrape_until(review_count)
+        elif self._is_stale(lead) and await self._claim_refresh():
+            await self.refresh(max(review_count, len(self.review_buffer)))
 
     async def load_page(self):
-        """Load the page and determine the parsing strategy."""
+        """Load the page and determine the parsing strategy.
+
+        A strategy that parsed the page before is used without probing
+        the page, until it fails to parse it.
+        """
         await self._validate_url()
-        self.strategy = await self._determine_strategy()
+        known_strategy = self.strategies.get(self.base_url)
+        self._strategy_known = known_strategy is not None
+        if known_strategy is None:
+            self.strategy = await self._determine_strategy()
+        else:
+            self.strategy = known_strategy()
+        self._parsed_cards = 0
 
     async def get_reviews(
         self,
         pagination: schemas.PaginationOptions,
-    ) -> list[schemas.Review]:
+    ) -> schemas.MultipleReviewsResponse:
         """Get reviews with pagination.
 
-        Will try to use cached values if possible.
+        Will try to use cached values if possible. A cursor points at a
+        buffer position, so later pages never re-read earlier reviews.
         """
-        required_buffer_length = pagination.skip + pagination.limit
-        if len(self.review_buffer) >= required_buffer_length:
-            return self.review_buffer[pagination.skip:required_buffer_length]
-        await self.initialize_driver()
-        await self.load_page()
-        while len(self.review_buffer) < required_buffer_length:
+        self._check_cursor(pagination)
+        required_buffer_length = _first_index(pagination) + pagination.limit
+        self.demand.record(self.restaurant_slug, required_buffer_length)
+        await self._scrape_until(required_buffer_length)
+        return self.buffered_page(pagination)
+
+    async def stream_reviews(
+        self,
+        pagination: schemas.PaginationOptions,
+    ) -> AsyncIterator[list[schemas.Review]]:
+        """Return the reviews of the page in batches, as they are scraped.
+
+        The cursor is checked before, so that the batches can be streamed
+        right away. Once every stream and request for the restaurant went
+        away, the scrape stops.
+        """
+        self._check_cursor(pagination)
+        first_index = _first_index(pagination)
+        required_buffer_length = first_index + pagination.limit
+        self.demand.record(self.restaurant_slug, required_buffer_length)
+        return self._stream_batches(first_index, required_buffer_length)
+
+    def buffered_page(
+        self,
+        pagination: schemas.PaginationOptions,
+    ) -> schemas.MultipleReviewsResponse:
+        """Return the page from the reviews scraped so far, if any."""
+        self._check_cursor(pagination)
+        first_index = _first_index(pagination)
+        required_buffer_length = first_index + pagination.limit
+        cutoff = min(len(self.review_buffer), required_buffer_length)
+        next_cursor = None
+        if cutoff == required_buffer_length:
+            next_cursor = schemas.ReviewCursor(
+                created_at=self.review_buffer[cutoff - 1].created_at,
+                identity=cutoff - 1,
+            ).encode()
+        return schemas.MultipleReviewsResponse(
+            reviews=self.review_buffer[first_index:cutoff],
+            next_cursor=next_cursor,
+        )
+
+    def buffer_state(
+        self,
+        pagination: schemas.PaginationOptions,
+    ) -> tuple[str, datetime, int] | None:
+        """Identify the cached buffer, if the page can be read from it.
+
+        A scrape only adds reviews to the end, so the page stays the same
+        as long as the buffer is from the same scrape and as long.
+        """
+        buffer_length = len(self.review_buffer)
+        if buffer_length < _first_index(pagination) + pagination.limit:
+            return None
+        return self.restaurant_slug, self.scraped.scraped_at, buffer_length
+
+    def get_statistics(self) -> schemas.ReviewStatistics:
+        """Return aggregates over the cached reviews, without scraping.
+
+        Buffers only grow, so only reviews scraped since the last call
+        are counted.
+        """
+        if not self.review_buffer:
+            raise ex.ReviewsNotCachedError('No cached reviews to aggregate')
+        counted_buffer, aggregates = self.statistics_cache.get(
+            self.restaurant_slug, (None, ReviewAggregates()),
+        )
+        if counted_buffer is not self.review_buffer:
+            aggregates = ReviewAggregates()
+        aggregates.add(*self.review_buffer[len(aggregates):])
+        self.statistics_cache[self.restaurant_slug] = (
+            self.review_buffer, aggregates,
+        )
+        return aggregates.summary()
+
+    async def _scrape_until(self, required_buffer_length: int) -> None:
+        if len(self.review_buffer) < required_buffer_length:
+            flight = self._join_flight()
+            await flight.wait_for(required_buffer_length)
+            self._follow_replacement(flight)
+            # A pre-scrape gave way, so this request scrapes on its own.
+            if flight.gave_way and not self.reserved_sessions:
+                await self._scrape_until(required_buffer_length)
+
+    async def _stream_batches(
+        self,
+        position: int,
+        required_buffer_length: int,
+    ) -> AsyncIterator[list[schemas.Review]]:
+        # Buffered reviews come first, then each batch the scrape adds.
+        batch = self.review_buffer[position:required_buffer_length]
+        if batch:
+            yield batch
+        position += len(batch)
+        # A pre-scrape that gave way is followed by a scrape of our own.
+        while position < required_buffer_length:
+            flight = self._join_flight()
+            flight_batches = self._flight_batches(
+                flight, position, required_buffer_length,
+            )
+            async for flight_batch in flight_batches:
+                yield flight_batch
+                position += len(flight_batch)
+            if not flight.gave_way:
+                return
+
+    async def _flight_batches(
+        self,
+        flight: ScrapeFlight,
+        position: int,
+        required_buffer_length: int,
+    ) -> AsyncIterator[list[schemas.Review]]:
+        with flight.wanting(required_buffer_length):
+            while position < required_buffer_length:
+                await flight.wait_for(position + 1)
+                # Streams end with the buffer they started on, if replaced.
+                if flight.buffer is not self.review_buffer:
+                    return
+                batch = self.review_buffer[position:required_buffer_length]
+                if not batch:
+                    return
+                yield batch
+                position += len(batch)
+
+    def _join_flight(self) -> ScrapeFlight:
+        # The scrape fills the cached buffer, where every request sees it.
+        self.scraped = self.buffer_cache.setdefault(
+            self.restaurant_slug, self.scraped,
+        )
+        flight = self.flights.get(self.restaurant_slug)
+        if flight is None or flight.landed:
+            flight = ScrapeFlight(self.review_buffer, self._scrape)
+            self.flights[self.restaurant_slug] = flight
+        self._flight = flight
+        return flight
+
+    def _follow_replacement(self, flight: ScrapeFlight) -> None:
+        # Pages are read from the buffer the scrape replaced ours with.
+        published = self.buffer_cache.get(self.restaurant_slug)
+        if published is not None and published.reviews is flight.buffer:
+            self.scraped = published
+
+    async def _scrape(self, flight: ScrapeFlight) -> None:
+        if self.http_engine is not None and not self.review_buffer:
+            await self._fetch_over_http(flight, self.http_engine)
+        if flight.wants_more():
+            await self._scrape_in_browser(flight)
+        flight.land()
+        await self._publish()
+
+    async def _fetch_over_http(
+        self,
+        flight: ScrapeFlight,
+        http_engine: JustEatHTTPEngine,
+    ) -> None:
+        # The browser goes on from the cards after the ones read here.
+        http_reviews = await http_engine.fetch_reviews(
+            self.base_url, ButtonLoadModalStrategy().parse_card,
+        )
+        if http_reviews:
+            flight.strategy_name = type(http_engine).__name__
+            self.review_buffer.extend(http_reviews)
+            flight.report_progress()
+
+    async def _scrape_in_browser(self, flight: ScrapeFlight) -> None:
+        # Spare sessions may have been taken since the scrape started.
+        if self._gives_way():
+            logger.debug('Leaving the browser to requests: %s', self.base_url)
+            flight.gave_way = True
+            return
+        async with self.driver_manager as driver:
+            self.driver = driver
+            with PACER.for_host(self.base_url):
+                await self._scrape_pages(flight)
+            # Waiting requests need not wait for the driver to be reset.
+            flight.land()
+        self.driver = None
+
+    async def _scrape_pages(self, flight: ScrapeFlight) -> None:
+        try:
+            await self.load_page()
+        except TimeoutException:
+            PACER.record_anomaly()
+            raise
+        flight.strategy_name = type(self.strategy).__name__
+        while flight.wants_more():
             try:
-                await self._fill_buffer()
+                await self._fill_buffer(flight)
             except ex.NoMoreReviewsError:
+                # Also the end of the reviews, but often a slow page.
+                PACER.record_anomaly()
                 logger.info('No more reviews available')
                 break
+            PACER.record_success()
+            # A strategy that failed may have been replaced.
+            flight.strategy_name = type(self.strategy).__name__
+            flight.report_progress()
+
+    async def _load_cached(self) -> None:
+        # Reviews of this worker are only replaced by newer or more.
+        cached = await self.scrape_cache.get(
+            self.restaurant_slug, self.scraped if self.review_buffer else None,
+        )
+        if cached is not None:
+            self.scraped = cached
+            self.buffer_cache[self.restaurant_slug] = cached
+
+    async def _publish(self) -> None:
+        # A refresh that landed meanwhile is newer, and stays.
+        current = self.buffer_cache.get(self.restaurant_slug, self.scraped)
+        if current.scraped_at <= self.scraped.scraped_at:
+            self.buffer_cache[self.restaurant_slug] = self.scraped
+        await self.scrape_cache.put(self.restaurant_slug, self.scraped)
+
+    async def _start_refresh(self) -> None:
+        # Stale reviews are served meanwhile, by every worker.
+        if not await self._claim_refresh():
+            return
+        refresher = type(self)(self.restaurant_slug)
+        refresh = asyncio.create_task(
+            refresher.refresh(len(self.review_buffer)),
+        )
+        self.refreshes.add(refresh)
+        refresh.add_done_callback(self.refreshes.discard)
 
-        cutoff = min(len(self.review_buffer), required_buffer_length)
-        return self.review_buffer[pagination.skip:cutoff]
+    async def _claim_refresh(self) -> bool:
+        return await self.scrape_cache.claim_refresh(
+            self.restaurant_slug, _REFRESH_LEASE_SECONDS,
+        )
+
+    def _is_stale(self, lead: timedelta = _NO_LEAD) -> bool:
+        # Within the lead of the TTL, reviews count as stale already.
+        age = datetime.now(timezone.utc) - self.scraped.scraped_at
+        return bool(self.review_buffer) and age > self.scrape_ttl - lead
+
+    def _gives_way(self) -> bool:
+        if not self.reserved_sessions:
+            return False
+        return DRIVER_POOL.spare_sessions() <= self.reserved_sessions
+
+    def _check_cursor(self, pagination: schemas.PaginationOptions) -> None:
+        # Cursors only point at reviews scraped already, so forged ones
+        # are rejected before they could make a request scrape.
+        cursor = pagination.decode_cursor()
+        if cursor is not None:
+            self._validate_cursor(cursor)
+
+    def _validate_cursor(self, cursor: schemas.ReviewCursor) -> None:
+        if cursor.identity >= len(self.review_buffer):
+            raise ex.InvalidCursorError('Cursor points past the last review')
+        cursor_review = self.review_buffer[cursor.identity]
+        if cursor_review.created_at != cursor.created_at:
+            raise ex.InvalidCursorError('Cursor does not match the review')
 
     @humanize_with_pauses(pre=1)
-    async def _fill_buffer(self):
+    async def _fill_buffer(self, flight: ScrapeFlight):
         if self.driver is None:
             raise ex.ScraperNotInitializedError('Driver not initialized')
-        await self.strategy.load_more_reviews(self.driver)
-        new_reviews = self.strategy.parse_reviews(self.driver)
+        new_reviews = await self._read_new_cards(self.driver)
         if not new_reviews:
             logger.warning('No new reviews parsed after loading')
             raise ex.NoMoreReviewsError('No new reviews loaded')
-        self.review_buffer.extend(new_reviews)
+        self._merge_cards(new_reviews, flight)
+        self._parsed_cards += len(new_reviews)
+
+    def _merge_cards(
+        self,
+        new_reviews: list[schemas.Review],
+        flight: ScrapeFlight,
+    ) -> None:
+        # Cards are buffered in page order, so the buffer of an earlier
+        # scrape or of the HTTP engine may hold these cards already. They
+        # are only skipped if they are the same reviews, otherwise a new
+        # buffer goes on from the cards parsed so far.
+        buffered = self.review_buffer[
+            self._parsed_cards:self._parsed_cards + len(new_reviews)
+        ]
+        same_reviews = map(_review_identity, new_reviews[:len(buffered)])
+        if list(same_reviews) != list(map(_review_identity, buffered)):
+            logger.warning(
+                'Buffered reviews differ from the cards on %s, replacing',
+                self.base_url,
+            )
+            self._replace_scraped(flight)
+            buffered = []
+        self.review_buffer.extend(new_reviews[len(buffered):])
+
+    def _replace_scraped(self, flight: ScrapeFlight) -> None:
+        # Readers keep the buffer they hold, which only ever grows.
+        replaced = self.scraped
+        self.scraped = schemas.ScrapedReviews(
+            scraped_at=datetime.now(timezone.utc),
+            reviews=replaced.reviews[:self._parsed_cards],
+        )
+        flight.buffer = self.review_buffer
+        # A refresh publishes its buffer once it lands, as before.
+        if self.buffer_cache.get(self.restaurant_slug) is replaced:
+            self.buffer_cache[self.restaurant_slug] = self.scraped
+
+    async def _read_new_cards(
+        self,
+        driver: WebDriver,
+    ) -> list[schemas.Review]:
+        try:
+            new_reviews = await self._load_new_cards(driver)
+        except _STRATEGY_ERRORS as error:
+            if not self._strategy_known:
+                raise
+            logger.warning(
+                'Known strategy %s failed on %s, probing again: %r',
+                type(self.strategy).__name__, self.base_url, error,
+            )
+            self.strategy = await self._determine_strategy()
+            self._strategy_known = False
+            return await self._read_new_cards(driver)
+        if not self._strategy_known:
+            self.strategies[self.base_url] = type(self.strategy)
+            self._strategy_known = True
+        return new_reviews
+
+    async def _load_new_cards(self, driver: WebDriver) -> list[schemas.Review]:
+        await self.strategy.load_more_reviews(driver)
+        # Loaded cards stay on the page, so only the new ones are parsed.
+        return await DRIVER_POOL.run(
+            self.strategy.parse_reviews, driver, self._parsed_cards,
+        )
 
     async def _validate_url(self):
         if self.driver is None:
             raise ex.ScraperNotInitializedError('Driver not initialized')
-        page = self.driver.get(self.base_url)
-        try:
-            WebDriverWait(self.driver, _PAGE_LOAD_TIMEOUT).until(
-                e_cond.presence_of_element_located((By.TAG_NAME, 'body')),
-            )
-        except TimeoutException:
-            logger.error('Page failed to load: %s', str(page))
-            raise
+        await _load_url(self.driver, self.base_url)
 
     async def _determine_strategy(
         self,
     ) -> abstract.AbstractReviewScrapingStrategy:
-        for strategy_builder in self.possible_strategies:
-            logger.debug('Trying strategy %s', strategy_builder.__name__)
-            if await self._try_strategy(strategy_builder.modal_locator):
-                return strategy_builder()
-        raise ex.UnsupportedPageStructureError('Unsupported page structure')
-
-    async def _try_strategy(self, element_locator: tuple[str, str]) -> bool:
         if self.driver is None:
             raise ex.ScraperNotInitializedError('Driver not initialized')
-        try:
-            self.driver.find_element(*element_locator)
-        except NoSuchElementException:
-            return False
-        return True
+        # Modal locators are CSS selectors, so one script checks them all.
+        strategy_index = await _first_matching_selector(self.driver, [
+            strategy_builder.modal_locator[1]
+            for strategy_builder in self.possible_strategies
+        ])
+        if strategy_index < 0:
+            raise ex.UnsupportedPageStructureError(
+                'Unsupported page structure',
+            )
+        strategy_builder = self.possible_strategies[strategy_index]
+        logger.debug('Page matches strategy %s', strategy_builder.__name__)
+        return strategy_builder()
+
+
+@run_in_driver_thread
+def _load_url(driver: WebDriver, url: str) -> None:
+    driver.get(url)
+    try:
+        WebDriverWait(driver, _PAGE_LOAD_TIMEOUT).until(
+            e_cond.presence_of_element_located((By.TAG_NAME, 'body')),
+        )
+    except TimeoutException:
+        logger.error('Page failed to load: %s', url)
+        raise
+
+
+@run_in_driver_thread
+def _first_matching_selector(driver: WebDriver, selectors: list[str]) -> int:
+    return driver.execute_script(FIRST_MATCHING_SELECTOR, selectors)
+
+
+def _review_identity(review: schemas.Review) -> tuple[str, date, str]:
+    # Cards only show the day, the page state may have the time as well.
+    return (
+        review.reviewer_name,
+        review.created_at.date(),
+        review.review_text or '',
+    )
+
+
+def _first_index(pagination: schemas.PaginationOptions) -> int:
+    # A cursor points at a buffer position, skip counts from right after.
+    cursor = pagination.decode_cursor()
+    if cursor is None:
+        return pagination.skip
+    return pagination.skip + cursor.identity + 1
@@ -0,0 +1,78 @@
+import asyncio
+from collections.abc import Callable
+from types import MappingProxyType
+
+import httpx
+
+from app.datasources.justeat_page import parse_review_page
+from app.datasources.justeat_scripts import ReviewFields
+from app.initializers.logger import get_logger
+from app.initializers.pacing import PACER
+from app.interface import schemas
+
+logger = get_logger()
+
+_MAX_CONNECTIONS = 10
+_TIMEOUT_SECONDS = 15
+# Nominal pause before a page is fetched, scaled by the pacer.
+_PAGE_PAUSE_SECONDS = 1
+_HEADERS = MappingProxyType({
+    'Accept': 'text/html,application/xhtml+xml',
+    'Accept-Language': 'en-GB,en;q=0.9',
+})
+
+
+class JustEatHTTPEngine:
+    """Reads the first reviews of a restaurant over HTTP, without a browser.
+
+    Review pages render their first reviews on the server, in the page
+    state they embed or as review cards. Deeper reviews are only loaded
+    by the scripts of the page, so they are left to a browser. Requests
+    share a pool of keep-alive connections, and are paced as the browser
+    actions on the host are.
+    """
+
+    def __init__(self, max_connections: int = _MAX_CONNECTIONS):
+        """Set up the connection pool, connecting on the first request."""
+        self._client = httpx.AsyncClient(
+            headers=dict(_HEADERS),
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+            ),
+            timeout=_TIMEOUT_SECONDS,
+            follow_redirects=True,
+        )
+
+    async def fetch_reviews(
+        self,
+        url: str,
+        parse_card: Callable[[ReviewFields], schemas.Review],
+    ) -> list[schemas.Review]:
+        """Return the reviews on the page, or none if it cannot be read."""
+        with PACER.for_host(url):
+            await PACER.pause(_PAGE_PAUSE_SECONDS)
+            page = await self._get_page(url)
+        if page is None:
+            return []
+        try:
+            # Pages are large, so they are parsed off the event loop.
+            return await asyncio.to_thread(parse_review_page, page, parse_card)
+        except (ValueError, ArithmeticError) as error:
+            logger.warning('Review page not parsed: %r', error)
+            return []
+
+    async def aclose(self) -> None:
+        """Close the pooled connections."""
+        await self._client.aclose()
+
+    async def _get_page(self, url: str) -> str | None:
+        try:
+            response = (await self._client.get(url)).raise_for_status()
+        except httpx.HTTPError as error:
+            # Refusals and timeouts slow down the next actions on the host.
+            PACER.record_anomaly()
+            logger.warning('Review page not fetched: %r', error)
+            return None
+        PACER.record_success()
+        return response.text
@@ -0,0 +1,108 @@
+import json
+import re
+from collections import deque
+from collections.abc import Callable
+from datetime import datetime
+from decimal import Decimal
+from typing import Any
+
+from pydantic import TypeAdapter
+
+from app.datasources.justeat_cards import review_cards
+from app.datasources.justeat_scripts import ReviewFields
+from app.interface import schemas
+
+_NEXT_DATA = re.compile(
+    r'<script[^>]*\bid="__NEXT_DATA__"[^>]*>(.*?)</script>',
+    re.DOTALL,
+)
+# Names the fields of review records go by in embedded page state.
+_NAME_KEYS = ('reviewerName', 'customerName', 'authorName', 'name')
+_DATE_KEYS = ('date', 'createdAt', 'created', 'reviewDate', 'orderDate')
+_RATING_KEYS = ('rating', 'starRating', 'stars', 'score')
+_TEXT_KEYS = ('comment', 'reviewText', 'text', 'body')
+_RATING_STEP = Decimal('0.1')
+# Review records are only looked for under keys that name reviews.
+_REVIEWS_KEY = 'review'
+# Also reads a trailing Z, which Python 3.10 does not.
+_TIMESTAMP = TypeAdapter(datetime)
+
+
+def parse_review_page(
+    page: str,
+    parse_card: Callable[[ReviewFields], schemas.Review],
+) -> list[schemas.Review]:
+    """Return the reviews a review page renders, in page order.
+
+    The embedded page state is read first, then the review cards. A
+    record or card that cannot be parsed fails the whole page, as it
+    does in the browser.
+    """
+    return embedded_reviews(page) or list(map(parse_card, review_cards(page)))
+
+
+def embedded_reviews(page: str) -> list[schemas.Review]:
+    """Return the reviews in the state a Next.js page embeds, if any.
+
+    The shallowest list under a reviews key whose items all look like
+    reviews is taken, so that lists of restaurants or menu items are not.
+    """
+    state = _NEXT_DATA.search(page)
+    if state is None:
+        return []
+    return list(map(
+        _review_from_record, _find_review_records(json.loads(state[1])),
+    ))
+
+
+def _find_review_records(state: Any) -> list[dict[str, Any]]:
+    pending: deque[tuple[Any, bool]] = deque([(state, False)])
+    while pending:
+        node, under_reviews = pending.popleft()
+        if under_reviews and isinstance(node, list) and node:
+            if all(map(_is_review_record, node)):
+                return node
+        pending.extend(_children(node, under_reviews))
+    return []
+
+
+def _children(node: Any, under_reviews: bool) -> list[tuple[Any, bool]]:
+    if isinstance(node, dict):
+        return [
+            (child, under_reviews or _REVIEWS_KEY in key.lower())
+            for key, child in node.items()
+        ]
+    if isinstance(node, list):
+        return [(child, under_reviews) for child in node]
+    return []
+
+
+def _is_review_record(node: Any) -> bool:
+    if not isinstance(node, dict):
+        return False
+    return all(
+        _first_value(node, field_keys) is not None
+        for field_keys in (_NAME_KEYS, _DATE_KEYS, _RATING_KEYS)
+    )
+
+
+def _review_from_record(record: dict[str, Any]) -> schemas.Review:
+    text = _first_value(record, _TEXT_KEYS) or ''
+    return schemas.Review(
+        created_at=_TIMESTAMP.validate_python(str(_first_value(
+            record, _DATE_KEYS,
+        ))),
+        reviewer_name=str(_first_value(record, _NAME_KEYS)).strip(),
+        rating=Decimal(str(_first_value(
+            record, _RATING_KEYS,
+        ))).quantize(_RATING_STEP),
+        review_text=str(text).strip() or None,
+        sentiment=None,
+    )
+
+
+def _first_value(record: dict[str, Any], field_keys: tuple[str, ...]) -> Any:
+    return next(
+        (record[key] for key in field_keys if record.get(key) is not None),
+        None,
+    )
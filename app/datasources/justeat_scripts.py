@@ -0,0 +1,76 @@
+from typing import TypedDict
+
+# A card missing a required element fails the whole script, like a
+# missing element fails parsing it element by element. The cards before
+# the index passed as the first argument are left out.
+_HELPERS = """
+function required(parent, selector) {
+    var element = parent.querySelector(selector);
+    if (element === null) {
+        throw new Error('No element matches ' + selector);
+    }
+    return element;
+}
+function requiredText(parent, selector) {
+    return required(parent, selector).innerText.trim();
+}
+function optionalText(parent, selector) {
+    var element = parent.querySelector(selector);
+    return element && element.innerText.trim();
+}
+"""
+
+_BUTTON_MODAL = """
+var container = required(document, '.c-reviews-items');
+var cards = container.querySelectorAll('.c-reviews-item');
+return Array.from(cards).slice(arguments[0]).map(card => {
+    var ratings = required(
+        card, "[data-test-id='rating-multi-star-component']",
+    );
+    return {
+        name: requiredText(card, "[data-test-id='review-author']"),
+        date: requiredText(card, "[data-test-id='review-date']"),
+        rating: required(
+            ratings, "[class*='c-rating-mask']",
+        ).getAttribute('style'),
+        text: optionalText(card, "[data-test-id='review-text']"),
+    };
+});
+"""
+
+_AUTO_SCROLL_MODAL = """
+var cards = document.querySelectorAll(
+    "[data-qa='review-card-component-element']",
+);
+return Array.from(cards).slice(arguments[0]).map(card => {
+    var label = required(card, "div[id^='label-']");
+    var description = required(card, "div[id^='description-']");
+    return {
+        name: requiredText(label, "[data-qa='text']"),
+        date: requiredText(label, "b[data-qa='text']"),
+        rating: required(
+            description, "[data-qa='rating-display-element']",
+        ).getAttribute('title'),
+        text: optionalText(description, "[data-qa='review-card-comment']"),
+    };
+});
+"""
+
+# The index of the first selector any element matches, or -1.
+FIRST_MATCHING_SELECTOR = """
+return arguments[0].findIndex(
+    selector => document.querySelector(selector) !== null,
+);
+"""
+
+BUTTON_MODAL_REVIEWS = ''.join((_HELPERS, _BUTTON_MODAL))
+AUTO_SCROLL_MODAL_REVIEWS = ''.join((_HELPERS, _AUTO_SCROLL_MODAL))
+
+
+class ReviewFields(TypedDict):
+    """Raw text of a review card, before it is parsed."""
+
+    name: str
+    date: str
+    rating: str | None
+    text: str | None
@@ -0,0 +1,93 @@
+from collections.abc import AsyncIterator
+
+import pydantic
+import pydantic_core
+
+from app.interface import schemas
+from app.interface.abstract import AbstractReviewDatasource
+
+_LINE_SEPARATOR = b'\n'
+_BATCH_SIZE = 1000
+# Far above the longest valid review, so that a line missing its
+# separator cannot grow without bound.
+_MAX_LINE_BYTES = 2 ** 14  # noqa: WPS432
+_MAX_REPORTED_ERRORS = 100
+
+
+async def ingest_ndjson(
+    chunks: AsyncIterator[bytes],
+    datasource: AbstractReviewDatasource,
+) -> schemas.BulkIngestionReport:
+    """Add reviews from newline-delimited JSON, a batch at a time.
+
+    Every line is validated on its own and invalid lines are reported
+    by number. Only a batch of reviews and a line are held in memory,
+    however large the upload is.
+    """
+    report = schemas.BulkIngestionReport()
+    batch: list[schemas.Review] = []
+    async for line_number, line in _numbered_lines(chunks):
+        review = _validate_line(line_number, line, report)
+        if review is not None:
+            batch.append(review)
+        if len(batch) == _BATCH_SIZE:
+            await datasource.add_reviews(*batch)
+            report.accepted += len(batch)
+            batch.clear()
+    if batch:
+        await datasource.add_reviews(*batch)
+        report.accepted += len(batch)
+    return report
+
+
+async def _numbered_lines(
+    chunks: AsyncIterator[bytes],
+) -> AsyncIterator[tuple[int, bytes]]:
+    # Blank lines are skipped, but still counted.
+    line_number = 0
+    pending = b''
+    async for chunk in chunks:
+        *lines, pending = (pending + chunk).split(_LINE_SEPARATOR)
+        for line in lines:
+            line_number += 1
+            if line.strip():
+                yield line_number, line
+        # The rest of an overlong line is dropped, it is rejected anyway.
+        pending = pending[:_MAX_LINE_BYTES + 1]
+    if pending.strip():
+        yield line_number + 1, pending
+
+
+def _validate_line(
+    line_number: int,
+    line: bytes,
+    report: schemas.BulkIngestionReport,
+) -> schemas.ReviewCreationBody | None:
+    if len(line) > _MAX_LINE_BYTES:
+        _reject(report, line_number, [
+            'Line is longer than {0} bytes'.format(_MAX_LINE_BYTES),
+        ])
+        return None
+    try:
+        return schemas.ReviewCreationBody.model_validate_json(line)
+    except pydantic.ValidationError as error:
+        _reject(report, line_number, list(map(_describe, error.errors())))
+    return None
+
+
+def _describe(line_error: pydantic_core.ErrorDetails) -> str:
+    # Errors of the whole review have no location.
+    location = '.'.join(map(str, line_error['loc']))
+    return ': '.join(filter(None, (location, line_error['msg'])))
+
+
+def _reject(
+    report: schemas.BulkIngestionReport,
+    line_number: int,
+    reasons: list[str],
+) -> None:
+    report.rejected += 1
+    if len(report.errors) < _MAX_REPORTED_ERRORS:
+        report.errors.append(
+            schemas.BulkLineError(line=line_number, errors=reasons),
+        )
@@ -0,0 +1,101 @@
+import asyncio
+from contextlib import suppress
+from datetime import timedelta
+from typing import NamedTuple
+
+from app.datasources.justeat_datasource import JustEatDataSource
+from app.initializers.logger import get_logger
+from app.initializers.selenium import DRIVER_POOL
+
+logger = get_logger()
+
+# Sessions a pre-scrape leaves to requests, even with a single one.
+_RESERVED_SESSIONS = 1
+
+
+class PrescrapePlan(NamedTuple):
+    """Which restaurants to keep scraped, how deep and how often."""
+
+    restaurant_slugs: tuple[str, ...] = ()
+    popular_count: int = 0
+    review_count: int = 10
+    max_review_count: int = 100
+    lead_seconds: float = 300
+    interval_seconds: float = 60
+    concurrency: int = 1
+
+
+class PrescrapeScheduler:
+    """Keeps the reviews of hot restaurants scraped ahead of requests.
+
+    Every round, the configured and the most asked for restaurants are
+    scraped if they never were, or refreshed once their reviews expire
+    within the lead. Scrapes run a few at a time, and only while the
+    driver pool has a session to spare beyond one kept for requests, so
+    requests do not queue behind them. That is checked again before a
+    browser is taken. A restaurant skipped for lack of one waits for the
+    next round.
+    """
+
+    def __init__(self, plan: PrescrapePlan):
+        """Plan the rounds, but do not start them."""
+        self.plan = plan
+        self._slots = asyncio.Semaphore(plan.concurrency)
+        self._rounds: asyncio.Task[None] | None = None
+
+    def start(self) -> None:
+        """Run the first round now and the next ones in the background."""
+        self._rounds = asyncio.create_task(self._run_rounds())
+
+    async def stop(self) -> None:
+        """Cancel the rounds, and the scrapes nobody else waits for."""
+        if self._rounds is None:
+            return
+        self._rounds.cancel()
+        with suppress(asyncio.CancelledError):
+            await self._rounds
+
+    async def run_round(self) -> None:
+        """Scrape the reviews that are missing or about to expire."""
+        targets = self._targets()
+        outcomes = await asyncio.gather(
+            *map(self._prescrape, targets.items()),
+            return_exceptions=True,
+        )
+        for restaurant_slug, outcome in zip(targets, outcomes):
+            if isinstance(outcome, Exception):
+                logger.warning(
+                    'Pre-scraping %s failed: %r', restaurant_slug, outcome,
+                )
+
+    async def _run_rounds(self) -> None:
+        while True:  # noqa: WPS457
+            await self.run_round()
+            await asyncio.sleep(self.plan.interval_seconds)
+
+    def _targets(self) -> dict[str, int]:
+        targets = dict.fromkeys(self.plan.restaurant_slugs, 0)
+        targets.update(JustEatDataSource.demand.most_wanted(
+            self.plan.popular_count,
+        ))
+        return {
+            restaurant_slug: min(
+                max(review_count, self.plan.review_count),
+                self.plan.max_review_count,
+            )
+            for restaurant_slug, review_count in targets.items()
+        }
+
+    async def _prescrape(self, target: tuple[str, int]) -> None:
+        restaurant_slug, review_count = target
+        async with self._slots:
+            if DRIVER_POOL.spare_sessions() <= _RESERVED_SESSIONS:
+                logger.debug(
+                    'No spare session to pre-scrape %s', restaurant_slug,
+                )
+                return
+            datasource = JustEatDataSource(restaurant_slug)
+            datasource.reserved_sessions = _RESERVED_SESSIONS
+            await datasource.prescrape(
+                review_count, timedelta(seconds=self.plan.lead_seconds),
+            )
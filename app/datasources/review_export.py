@@ -0,0 +1,48 @@
+import csv
+import io
+from collections.abc import AsyncIterator
+from types import MappingProxyType
+
+from app.interface.enums import StreamFormat
+from app.interface.schemas import Review
+
+MEDIA_TYPES = MappingProxyType({
+    StreamFormat.ndjson: 'application/x-ndjson',
+    StreamFormat.csv: 'text/csv',
+    StreamFormat.sse: 'text/event-stream',
+})
+_LINE_TEMPLATES = MappingProxyType({
+    StreamFormat.ndjson: '{0}\n',
+    StreamFormat.sse: 'data: {0}\n\n',
+})
+_CSV_FIELDS = tuple(Review.model_fields)
+
+
+async def encode_reviews(
+    chunks: AsyncIterator[list[Review]],
+    export_format: StreamFormat,
+) -> AsyncIterator[bytes]:
+    """Encode chunks of reviews into pieces of a response body.
+
+    All formats hold the same values as the JSON responses do. Csv
+    starts with a header row, and server-sent events carry a review
+    each.
+    """
+    if export_format == StreamFormat.csv:
+        yield _encode_csv([dict(zip(_CSV_FIELDS, _CSV_FIELDS))])
+        async for reviews in chunks:
+            yield _encode_csv([
+                review.model_dump(mode='json') for review in reviews
+            ])
+        return
+    line_template = _LINE_TEMPLATES[export_format]
+    async for chunk in chunks:
+        yield ''.join([
+            line_template.format(review.model_dump_json()) for review in chunk
+        ]).encode()
+
+
+def _encode_csv(records: list[dict]) -> bytes:
+    encoded = io.StringIO()
+    csv.DictWriter(encoded, _CSV_FIELDS).writerows(records)
+    return encoded.getvalue().encode()
@@ -0,0 +1,304 @@
+import heapq
+import itertools
+import math
+from array import array
+from collections import defaultdict
+from collections.abc import Callable
+from collections.abc import Iterator
+from typing import Any
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+from sortedcontainers import SortedList  # type: ignore[import-untyped]
+
+from app.datasources.review_index import key_of_cursor
+from app.datasources.review_index import make_key
+from app.datasources.review_index import ReviewTimeIndex
+from app.datasources.review_index import row_of
+from app.datasources.review_store import epoch_microseconds
+from app.interface import schemas
+
+_RATING_SCALE = 10
+_MAX_RATING_TENTHS = 50
+_MISSING_SENTIMENT = -128
+_FIRST_CHUNK_SIZE = 64
+_MAX_CHUNK_SIZE = 2 ** 16  # noqa: WPS432
+# Beyond any representable datetime, in epoch microseconds.
+_FAR_FUTURE = 2 ** 63  # noqa: WPS432
+_BEFORE_ALL_KEYS = make_key(_FAR_FUTURE, 0)
+_AFTER_ALL_KEYS = make_key(-_FAR_FUTURE, 0)
+
+
+class _Bucket:
+    """Rows sharing a field value, in index key order.
+
+    Base rows are a sorted array, since base keys grow with the row.
+    Rows added later are kept as keys in a SortedList.
+    """
+
+    def __init__(self, base_rows: np.ndarray | None = None):
+        self.base_rows = np.empty(0, np.int64)
+        if base_rows is not None:
+            self.base_rows = base_rows
+        self.tail_keys = SortedList()
+
+    def __len__(self) -> int:
+        return len(self.base_rows) + len(self.tail_keys)
+
+
+class _Condition(NamedTuple):
+    """An inclusive range of encoded values a field must fall into."""
+    field: str
+    lowest: int
+    highest: int
+
+
+class ReviewFilterIndex:
+    """Secondary indexes by rating, sentiment and reviewer name.
+
+    Every field is encoded as an integer column, and indexed by a map of
+    its values to buckets of rows in newest-first order. A filtered read
+    walks the buckets of the most selective condition within the time
+    window, and checks the remaining conditions against the columns in
+    vectorised chunks. Rows outside of those buckets are never touched.
+    """
+
+    def __init__(self, time_index: ReviewTimeIndex):
+        """Index the base segment in bulk and the other rows one by one."""
+        self._time_index = time_index
+        store = time_index.store
+        self._name_codes: dict[str, int] = {}
+        self._base_columns = self._encode_base(store.base.buffers())
+        self._tail_columns = {field: array('q') for field in self._base_columns}
+        self._buckets = {
+            field: _bucket_rows(column)
+            for field, column in self._base_columns.items()
+        }
+        tail_rows = range(len(store.base), len(store))
+        self.insert(
+            list(map(time_index.key_of, tail_rows)),
+            tuple(map(store.materialize, tail_rows)),
+        )
+
+    def insert(
+        self,
+        keys: list[int],
+        reviews: tuple[schemas.Review, ...],
+    ) -> None:
+        """Index reviews under their time index keys, a field at a time."""
+        encoded_columns = {
+            'rating_tenths': [
+                int(review.rating * _RATING_SCALE) for review in reviews
+            ],
+            'sentiment': [
+                _MISSING_SENTIMENT if review.sentiment is None
+                else review.sentiment
+                for review in reviews
+            ],
+            'reviewer_name': [
+                self._name_codes.setdefault(
+                    review.reviewer_name, len(self._name_codes),
+                )
+                for review in reviews
+            ],
+        }
+        for field, encoded_values in encoded_columns.items():
+            self._tail_columns[field].extend(encoded_values)
+            self._insert_keys(field, keys, encoded_values)
+
+    def find(
+        self,
+        filters: schemas.ReviewFilters,
+        cursor: schemas.ReviewCursor | None,
+        skip: int,
+        limit: int,
+    ) -> list[int]:
+        """Return up to limit rows meeting the filters, newest first.
+
+        Rows up to the cursor and then skip more rows are left out.
+        """
+        low, high = _key_window(filters)
+        if cursor is not None:
+            low = max(low, key_of_cursor(cursor) + 1)
+        conditions = self._conditions(filters)
+        if conditions:
+            driver = min(conditions, key=self._estimate_rows)
+            keys = heapq.merge(
+                self._base_keys(driver, conditions, low, high),
+                self._tail_keys(driver, conditions, low, high),
+            )
+        else:
+            # The time index alone covers the creation time window.
+            keys = map(self._time_index.key_of, self._time_index.iter_rows(
+                self._time_index.position_of(low),
+                self._time_index.position_of(high),
+            ))
+        return list(map(row_of, itertools.islice(keys, skip, skip + limit)))
+
+    def _insert_keys(
+        self,
+        field: str,
+        keys: list[int],
+        encoded_values: list[int],
+    ) -> None:
+        # Keys sharing a bucket are merged into it in one update.
+        grouped_keys: defaultdict[_Bucket, list[int]] = defaultdict(list)
+        for key, encoded_value in zip(keys, encoded_values):
+            grouped_keys[self._buckets[field][encoded_value]].append(key)
+        for bucket, bucket_keys in grouped_keys.items():
+            bucket.tail_keys.update(bucket_keys)
+
+    def _conditions(self, filters: schemas.ReviewFilters) -> list[_Condition]:
+        conditions = []
+        if filters.rating_min is not None or filters.rating_max is not None:
+            # Bounds between stored tenths round inwards, never outwards.
+            conditions.append(_Condition(
+                'rating_tenths',
+                math.ceil((filters.rating_min or 0) * _RATING_SCALE),
+                math.floor(
+                    filters.rating_max * _RATING_SCALE
+                    if filters.rating_max is not None
+                    else _MAX_RATING_TENTHS,
+                ),
+            ))
+        if filters.sentiment is not None:
+            conditions.append(_Condition(
+                'sentiment', filters.sentiment, filters.sentiment,
+            ))
+        if filters.reviewer_name is not None:
+            # Unknown names get a code no row has.
+            name_code = self._name_codes.get(filters.reviewer_name, -1)
+            conditions.append(_Condition('reviewer_name', name_code, name_code))
+        return conditions
+
+    def _matching_buckets(self, condition: _Condition) -> list[_Bucket]:
+        buckets = self._buckets[condition.field]
+        if condition.lowest == condition.highest:
+            bucket = buckets.get(condition.lowest)
+            return [] if bucket is None else [bucket]
+        return [
+            bucket
+            for encoded_value, bucket in buckets.items()
+            if condition.lowest <= encoded_value <= condition.highest
+        ]
+
+    def _estimate_rows(self, condition: _Condition) -> int:
+        return sum(map(len, self._matching_buckets(condition)))
+
+    def _base_keys(
+        self,
+        driver: _Condition,
+        conditions: list[_Condition],
+        low: int,
+        high: int,
+    ) -> Iterator[int]:
+        row = self._time_index.base_rows_before(low)
+        stop_row = self._time_index.base_rows_before(high)
+        buckets = self._matching_buckets(driver)
+        chunk_size = _FIRST_CHUNK_SIZE
+        while row < stop_row:
+            candidates = self._next_base_rows(buckets, row, chunk_size)
+            candidates = candidates[candidates < stop_row]
+            if not candidates.size:
+                return
+            yield from map(
+                self._time_index.key_of,
+                candidates[self._match_base(candidates, conditions)].tolist(),
+            )
+            row = int(candidates[-1]) + 1
+            chunk_size = min(chunk_size * 2, _MAX_CHUNK_SIZE)
+
+    def _next_base_rows(
+        self,
+        buckets: list[_Bucket],
+        row: int,
+        chunk_size: int,
+    ) -> np.ndarray:
+        # The first rows of a union are among the first rows of every part.
+        parts = [np.empty(0, np.int64)]
+        for bucket in buckets:
+            start = np.searchsorted(bucket.base_rows, row)
+            parts.append(bucket.base_rows[start:start + chunk_size])
+        return np.sort(np.concatenate(parts))[:chunk_size]
+
+    def _match_base(
+        self,
+        rows: np.ndarray,
+        conditions: list[_Condition],
+    ) -> np.ndarray:
+        matched = np.ones(rows.size, bool)
+        for condition in conditions:
+            encoded_values = self._base_columns[condition.field][rows]
+            matched &= encoded_values >= condition.lowest
+            matched &= encoded_values <= condition.highest
+        return matched
+
+    def _tail_keys(
+        self,
+        driver: _Condition,
+        conditions: list[_Condition],
+        low: int,
+        high: int,
+    ) -> Iterator[int]:
+        keys = heapq.merge(*(
+            bucket.tail_keys.irange(low, high, inclusive=(True, False))
+            for bucket in self._matching_buckets(driver)
+        ))
+        first_tail_row = len(self._time_index.store.base)
+        for key in keys:
+            tail_row = row_of(key) - first_tail_row
+            if all(map(self._tail_matcher(tail_row), conditions)):
+                yield key
+
+    def _tail_matcher(self, tail_row: int) -> Callable[[_Condition], bool]:
+        def matches(condition: _Condition) -> bool:  # noqa: WPS430
+            encoded_value = self._tail_columns[condition.field][tail_row]
+            return condition.lowest <= encoded_value <= condition.highest
+        return matches
+
+    def _encode_base(
+        self,
+        base_buffers: dict[str, Any],
+    ) -> dict[str, np.ndarray]:
+        name_codes, names = pd.factorize(_decode_names(base_buffers))
+        self._name_codes.update(zip(names, itertools.count()))
+        return {
+            'rating_tenths': np.frombuffer(
+                base_buffers['rating_tenths'], np.int16,
+            ),
+            'sentiment': np.frombuffer(base_buffers['sentiment'], np.int8),
+            'reviewer_name': name_codes,
+        }
+
+
+def _bucket_rows(encoded_values: np.ndarray) -> defaultdict[int, _Bucket]:
+    codes, uniques = pd.factorize(encoded_values)
+    rows = np.argsort(codes, kind='stable')
+    code_changes = np.diff(codes[rows])
+    row_groups = np.split(rows, np.flatnonzero(code_changes) + 1)
+    return defaultdict(_Bucket, zip(
+        uniques.tolist(),
+        map(_Bucket, row_groups[len(row_groups) - len(uniques):]),
+    ))
+
+
+def _decode_names(base_buffers: dict[str, Any]) -> pd.Series:
+    bounds = np.frombuffer(base_buffers['reviewer_name.offsets'], np.int64)
+    name_bytes = bytes(base_buffers['reviewer_name.buffer'])
+    names = [
+        str(name_bytes[start:stop], 'utf-8')
+        for start, stop in itertools.pairwise(bounds.tolist())
+    ]
+    return pd.Series(names, dtype=object)
+
+
+def _key_window(filters: schemas.ReviewFilters) -> tuple[int, int]:
+    # Newer reviews have lower keys, so the window end gives the low key.
+    low = _BEFORE_ALL_KEYS
+    high = _AFTER_ALL_KEYS
+    if filters.created_to is not None:
+        low = make_key(epoch_microseconds(filters.created_to) - 1, 0)
+    if filters.created_from is not None:
+        high = make_key(epoch_microseconds(filters.created_from) - 1, 0)
+    return low, high
@@ -0,0 +1,115 @@
+import heapq
+import itertools
+from bisect import bisect_left
+from collections.abc import Iterator
+
+from sortedcontainers import SortedList  # type: ignore[import-untyped]
+
+from app.datasources.review_store import ColumnarReviewStore
+from app.datasources.review_store import datetime_from_epoch
+from app.datasources.review_store import epoch_microseconds
+from app.interface.schemas import Review
+from app.interface.schemas import ReviewCursor
+
+# Keys pack the negated creation time and the row number into one int,
+# so they sort newest first and ties keep the order a stable sort would.
+_ROW_SPACE = 2 ** 32  # noqa: WPS432
+
+
+def make_key(created_at: int, row: int) -> int:
+    """Pack epoch microseconds and a row number into an index key."""
+    return -created_at * _ROW_SPACE + row
+
+
+def row_of(key: int) -> int:
+    """Unpack the row number from an index key."""
+    return key % _ROW_SPACE
+
+
+class ReviewTimeIndex:
+    """An ordered newest-first index over a columnar review store.
+
+    The base segment of the store is already sorted, so only rows added
+    later get keys in a SortedList. Both are merged on read. Inserts
+    cost O(log n), slicing by position or by cursor costs
+    O(log^2 n + k).
+    """
+
+    def __init__(self, store: ColumnarReviewStore | None = None):
+        """Index the rows the store has beyond its sorted base."""
+        self.store = store or ColumnarReviewStore()
+        self._tail_keys: SortedList = SortedList(
+            self.key_of(row)
+            for row in range(len(self.store.base), len(self.store))
+        )
+
+    def __len__(self) -> int:
+        """Return the amount of indexed reviews."""
+        return len(self.store)
+
+    def insert(self, *reviews: Review) -> list[int]:
+        """Store the reviews, index them without re-sorting, return keys."""
+        keys = list(map(self.key_of, self.store.extend(reviews)))
+        self._tail_keys.update(keys)
+        return keys
+
+    def key_of(self, row: int) -> int:
+        """Return the index key of a stored row."""
+        return make_key(self.store.created_at(row), row)
+
+    def position_of(self, key: int) -> int:
+        """Count the indexed keys below the key with a binary search."""
+        return self.base_rows_before(key) + self._tail_keys.bisect_left(key)
+
+    def position_after(self, cursor: ReviewCursor) -> int:
+        """Find the position right after the cursor."""
+        return self.position_of(key_of_cursor(cursor) + 1)
+
+    def base_rows_before(self, key: int) -> int:
+        """Count the base rows with keys below the key."""
+        return bisect_left(
+            range(len(self.store.base)),
+            key,
+            key=self.key_of,
+        )
+
+    def slice(self, start: int, stop: int) -> list[Review]:
+        """Materialise reviews between two positions, newest first."""
+        return [
+            self.store.materialize(row)
+            for row in self.iter_rows(start, stop)
+        ]
+
+    def cursor_at(self, position: int) -> ReviewCursor:
+        """Return a cursor pointing at the review in the position."""
+        return self.cursor_of(next(self.iter_rows(position, position + 1)))
+
+    def cursor_of(self, row: int) -> ReviewCursor:
+        """Return a cursor pointing at a stored row."""
+        return ReviewCursor(
+            created_at=datetime_from_epoch(self.store.created_at(row)),
+            identity=row,
+        )
+
+    def iter_rows(self, start: int, stop: int) -> Iterator[int]:
+        """Iterate over rows between two positions, newest first."""
+        # Base rows in front of the start position, found by bisecting
+        # over their positions in the merged order.
+        base_row = bisect_left(
+            range(len(self.store.base)),
+            start,
+            key=self._merged_position,
+        )
+        merged_keys = heapq.merge(
+            map(self.key_of, range(base_row, len(self.store.base))),
+            self._tail_keys.islice(start - base_row),
+        )
+        return map(row_of, itertools.islice(merged_keys, max(stop - start, 0)))
+
+    def _merged_position(self, base_row: int) -> int:
+        return base_row + self._tail_keys.bisect_left(self.key_of(base_row))
+
+
+def key_of_cursor(cursor: ReviewCursor) -> int:
+    """Return the index key a cursor points at."""
+    return make_key(epoch_microseconds(cursor.created_at), cursor.identity)
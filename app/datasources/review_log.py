@@ -0,0 +1,300 @@
+import asyncio
+import fcntl
+import os
+import threading
+import uuid
+import zlib
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import BinaryIO
+from typing import Optional
+
+import pydantic
+
+from app.datasources.review_snapshot import SegmentFile
+from app.datasources.review_store import ReviewSegment
+from app.initializers.logger import get_logger
+from app.interface.enums import DurabilityMode
+from app.interface.schemas import Review
+
+logger = get_logger()
+
+_HEADER_PREFIX = b'calton-review-log '
+_RECORD_SEPARATOR = b'\n'
+_DEFAULT_COMPACTION_BYTES = 8 * 2 ** 20  # noqa: WPS432
+
+# A batch of encoded records and the future of a request awaiting them.
+_PendingBatch = list[tuple[bytes, Optional[asyncio.Future]]]
+
+
+class LogPosition(pydantic.BaseModel):
+    """A byte offset in a particular generation of the log file."""
+    log_id: str
+    offset: int
+
+
+class LogFile:
+    """An append-only file of checksummed review records.
+
+    Every record is a line of a crc32 checksum and the review json.
+    Processes sharing the file append under an exclusive lock, and
+    reopen it once it was rotated by a compaction.
+    """
+
+    def __init__(self, path: Path):
+        """Point at the file, without opening it yet."""
+        self.path = path
+        self._lock_path = path.with_name('{0}.lock'.format(path.name))
+        self._thread_lock = threading.Lock()
+        self._append_file: BinaryIO | None = None
+
+    def append(self, payload: bytes) -> int:
+        """Append encoded records, fsync them and return the file size."""
+        with self._thread_lock:
+            with self._locked():
+                append_file = self._open_for_append()
+                append_file.write(payload)
+                append_file.flush()
+                os.fsync(append_file.fileno())
+                return os.fstat(append_file.fileno()).st_size
+
+    def read(
+        self,
+        folded: LogPosition | None = None,
+    ) -> tuple[list[Review], LogPosition]:
+        """Decode the records after the folded position, if it applies.
+
+        Returns the records and the position right after the last one.
+        """
+        try:
+            log_content = self.path.read_bytes()
+        except FileNotFoundError:
+            return [], LogPosition(log_id='', offset=0)
+        header_end = log_content.find(_RECORD_SEPARATOR) + 1
+        position = LogPosition(
+            log_id=log_content[len(_HEADER_PREFIX):header_end].strip().decode(),
+            # A torn last line is not a record yet.
+            offset=log_content.rfind(_RECORD_SEPARATOR) + 1,
+        )
+        start = header_end
+        if folded is not None and folded.log_id == position.log_id:
+            start = max(start, folded.offset)
+        records = _decode_records(log_content[start:position.offset])
+        return records, position
+
+    def rotate(self, folded: LogPosition) -> None:
+        """Replace the file, keeping only records after the position."""
+        with self._thread_lock:
+            with self._locked():
+                log_content = self.path.read_bytes()
+                self._replace_with(log_content[folded.offset:])
+
+    def close(self) -> None:
+        """Close the append handle, if it is open."""
+        if self._append_file is not None:
+            self._append_file.close()
+            self._append_file = None
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        with self._lock_path.open('ab') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            yield
+
+    def _open_for_append(self) -> BinaryIO:
+        if self._append_file and not self._is_rotated(self._append_file):
+            return self._append_file
+        self.close()
+        if not self.path.exists() or not self.path.stat().st_size:
+            self._replace_with(b'')
+        append_file = self.path.open('a+b')
+        append_file.seek(-1, os.SEEK_END)
+        if append_file.read(1) != _RECORD_SEPARATOR:
+            # A writer died mid-record, so end its torn line.
+            append_file.write(_RECORD_SEPARATOR)
+        self._append_file = append_file
+        return append_file
+
+    def _is_rotated(self, append_file: BinaryIO) -> bool:
+        try:
+            current_inode = self.path.stat().st_ino
+        except FileNotFoundError:
+            return True
+        return os.fstat(append_file.fileno()).st_ino != current_inode
+
+    def _replace_with(self, records: bytes) -> None:
+        header = _HEADER_PREFIX + uuid.uuid4().hex.encode()
+        temporary_path = self.path.with_name(
+            '{0}.{1}.tmp'.format(self.path.name, os.getpid()),
+        )
+        with temporary_path.open('wb') as log_file:
+            log_file.write(header + _RECORD_SEPARATOR)
+            log_file.write(records[:records.rfind(_RECORD_SEPARATOR) + 1])
+            log_file.flush()
+            os.fsync(log_file.fileno())
+        temporary_path.replace(self.path)
+        directory = os.open(self.path.parent, os.O_RDONLY)
+        try:  # noqa: WPS501
+            os.fsync(directory)
+        finally:
+            os.close(directory)
+
+
+class ReviewLog:
+    """A write-ahead log of added reviews, compacted in the background.
+
+    The durability mode decides when an append returns: after its own
+    fsync, after the fsync of the batch it was grouped into, or right
+    away. Compaction folds the records into a memory-mappable segment
+    file and starts a new log generation.
+    """
+
+    def __init__(
+        self,
+        log_path: str,
+        durability: DurabilityMode = DurabilityMode.batched,
+        compaction_bytes: int = _DEFAULT_COMPACTION_BYTES,
+    ):
+        """Point at the log files, without opening them yet."""
+        self.log_file = LogFile(Path(log_path))
+        self.segment_file = SegmentFile(Path('{0}.segment'.format(log_path)))
+        self.durability = durability
+        self.compaction_bytes = compaction_bytes
+        self._pending: _PendingBatch = []
+        self._wakeup = asyncio.Event()
+        self._closing = False
+        self._writer: asyncio.Task | None = None
+        self._compaction: asyncio.Task | None = None
+
+    def replay(self) -> tuple[ReviewSegment, list[Review]]:
+        """Read the compacted segment and the records logged after it."""
+        segment, folded = self._read_segment()
+        records, _ = self.log_file.read(folded)
+        return segment, records
+
+    def start(self) -> None:
+        """Start the task that commits grouped appends."""
+        self._writer = asyncio.create_task(self._write_batches())
+
+    async def append(self, *reviews: Review) -> None:
+        """Log the reviews, waiting as long as the durability mode says."""
+        payload = b''.join(map(_encode_record, reviews))
+        if self.durability == DurabilityMode.per_request:
+            log_size = await asyncio.to_thread(self.log_file.append, payload)
+            self._schedule_compaction(log_size)
+            return
+        committed = None
+        if self.durability == DurabilityMode.batched:
+            committed = asyncio.get_running_loop().create_future()
+        self._pending.append((payload, committed))
+        self._wakeup.set()
+        if committed is not None:
+            await committed
+
+    async def close(self) -> None:
+        """Commit the pending records and wait for background work."""
+        self._closing = True
+        self._wakeup.set()
+        if self._writer is not None:
+            await self._writer
+        if self._compaction is not None:
+            await self._compaction
+        self.log_file.close()
+
+    async def _write_batches(self) -> None:
+        while not self._closing or self._pending:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            batch = self._pending
+            self._pending = []
+            if batch:
+                await self._commit(batch)
+
+    async def _commit(self, batch: _PendingBatch) -> None:
+        payload = b''.join(records for records, _ in batch)
+        try:
+            log_size = await asyncio.to_thread(self.log_file.append, payload)
+        except OSError as error:
+            logger.error('Could not log %s appends: %s', len(batch), error)
+            _settle(batch, error)
+            return
+        _settle(batch)
+        self._schedule_compaction(log_size)
+
+    def _schedule_compaction(self, log_size: int) -> None:
+        if log_size < self.compaction_bytes:
+            return
+        if self._compaction is None or self._compaction.done():
+            self._compaction = asyncio.create_task(
+                asyncio.to_thread(self._compact),
+            )
+
+    def _compact(self) -> None:
+        lock_path = self.log_file.path.with_name(
+            '{0}.compaction.lock'.format(self.log_file.path.name),
+        )
+        with lock_path.open('ab') as lock_file:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                return  # Another worker is already compacting.
+            try:
+                self._fold()
+            except (OSError, ValueError) as error:
+                logger.warning('Could not compact the review log: %s', error)
+
+    def _fold(self) -> None:
+        # The segment is written before the rotation, so a crash between
+        # the two is recovered by skipping the folded part of the log.
+        segment, folded = self._read_segment()
+        records, position = self.log_file.read(folded)
+        self.segment_file.write(
+            _merged_segment(segment, records),
+            position.model_dump(),
+        )
+        self.log_file.rotate(position)
+        logger.info('Compacted %s review log records', len(records))
+
+    def _read_segment(self) -> tuple[ReviewSegment, LogPosition | None]:
+        if not self.segment_file.path.exists():
+            return ReviewSegment(), None
+        metadata, segment = self.segment_file.read()
+        return segment, LogPosition.model_validate(metadata)
+
+
+def _encode_record(review: Review) -> bytes:
+    body = review.model_dump_json().encode()
+    checksum = '{0:08x} '.format(zlib.crc32(body)).encode()
+    return checksum + body + _RECORD_SEPARATOR
+
+
+def _decode_records(log_content: bytes) -> list[Review]:
+    records = []
+    for line in log_content.splitlines():
+        checksum, _, body = line.partition(b' ')
+        if checksum == '{0:08x}'.format(zlib.crc32(body)).encode():
+            records.append(Review.model_validate_json(body))
+        else:
+            logger.warning('Skipped a corrupted review log record')
+    return records
+
+
+def _merged_segment(
+    segment: ReviewSegment,
+    records: list[Review],
+) -> ReviewSegment:
+    # Compacted rows are copied column by column, never decoded again.
+    merged = segment.thawed()
+    merged.extend(records)
+    return merged
+
+
+def _settle(batch: _PendingBatch, error: OSError | None = None) -> None:
+    for _, committed in batch:
+        if committed is None or committed.done():
+            continue
+        if error is None:
+            committed.set_result(None)
+        else:
+            committed.set_exception(error)
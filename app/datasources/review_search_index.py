@@ -0,0 +1,303 @@
+import asyncio
+import functools
+import itertools
+import math
+import re
+import unicodedata
+from array import array
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+from app.datasources.review_store import ColumnarReviewStore
+from app.interface.exceptions import InvalidCursorError
+from app.interface.exceptions import SearchIndexNotReadyError
+
+# Letters and digits, like the unicode61 tokenizer of SQLite FTS5.
+_TOKEN_PATTERN = re.compile(r'[^\W_]+')
+_COMBINING_MARKS = re.compile('[\u0300-\u036f]')
+# The usual BM25 term frequency saturation and length normalisation.
+_SATURATION = 1.2
+_LENGTH_WEIGHT = 0.75
+_BUILD_CHUNK_ROWS = 2 ** 16  # noqa: WPS432
+_ROW_SPACE = 2 ** 32  # noqa: WPS432
+_SPARSE_MATCHES_RATIO = 8
+_NO_MATCHES = (np.empty(0, np.uint32), np.empty(0))
+
+
+def tokenize(text: str) -> list[str]:
+    """Split text into casefolded words with diacritics removed."""
+    decomposed = unicodedata.normalize('NFKD', text.casefold())
+    return _TOKEN_PATTERN.findall(_COMBINING_MARKS.sub('', decomposed))
+
+
+class _TailPostings:
+    """Rows added after the bulk build that contain a term, and weights."""
+
+    def __init__(self):
+        self.rows = array('I')
+        self.weights = array('f')
+
+    def append(self, row: int, weight: float) -> None:
+        self.rows.append(row)
+        self.weights.append(weight)
+
+
+class _BasePostings:
+    """Postings of the rows indexed in bulk, as slices of two arrays.
+
+    Every term owns a slice of rows in ascending order and of their BM25
+    term frequency weights. The weights are computed once, with the
+    average document length of the bulk.
+    """
+
+    def __init__(self):
+        """Start with no postings."""
+        self.rows = np.empty(0, np.uint32)
+        self.weights = np.empty(0, np.float32)
+        self.slices: dict[str, tuple[int, int]] = {}
+        self.average_length = 1.0
+
+    @classmethod
+    def build(
+        cls,
+        store: ColumnarReviewStore,
+        stop_row: int,
+    ) -> '_BasePostings':
+        """Index the rows up to the stop row in vectorised chunks."""
+        postings = cls()
+        vocabulary: dict[str, int] = {}
+        chunk_postings = [
+            _count_chunk(store, chunk_rows, vocabulary)
+            for chunk_rows in _chunks(stop_row)
+        ]
+        if chunk_postings:
+            postings.average_length = sum(
+                int(frequencies.sum()) for _, _, frequencies in chunk_postings
+            ) / stop_row or 1.0
+            postings.load(vocabulary, *map(np.concatenate, zip(
+                *chunk_postings,
+            )))
+        return postings
+
+    def load(
+        self,
+        vocabulary: dict[str, int],
+        term_codes: np.ndarray,
+        rows: np.ndarray,
+        frequencies: np.ndarray,
+    ) -> None:
+        """Group postings by term and weigh them by document length."""
+        order = np.argsort(term_codes, kind='stable')
+        lengths = np.bincount(rows, weights=frequencies)
+        self.rows = rows[order].astype(np.uint32)
+        self.weights = _term_weights(
+            frequencies[order],
+            lengths[self.rows] / self.average_length,
+        )
+        bounds = np.searchsorted(
+            term_codes[order], np.arange(len(vocabulary) + 1),
+        )
+        self.slices = dict(zip(
+            vocabulary, itertools.pairwise(bounds.tolist()),
+        ))
+
+    def get(self, term: str) -> tuple[np.ndarray, np.ndarray]:
+        """Return the rows containing the term and their weights."""
+        start, stop = self.slices.get(term, (0, 0))
+        return self.rows[start:stop], self.weights[start:stop]
+
+
+class ReviewSearchIndex:
+    """An inverted index over reviewer names and review texts.
+
+    Matches of any query term are ranked by BM25, ties in row order.
+    The stored rows are indexed in bulk in a worker thread, and reviews
+    added in the meantime are indexed once it is done. Rows are never
+    removed.
+    """
+
+    def __init__(self, store: ColumnarReviewStore):
+        """Point at the store, without indexing anything yet."""
+        self.ready = False
+        self._store = store
+        self._base = _BasePostings()
+        self._tail: dict[str, _TailPostings] = {}
+        self._indexed_rows = 0
+        self._builder: asyncio.Task | None = None
+
+    def start(self) -> None:
+        """Start the task that indexes the rows already stored."""
+        self._builder = asyncio.create_task(self._build())
+
+    def update(self) -> None:
+        """Index rows stored since the last update, once built."""
+        if self.ready:
+            self._index_rows(len(self._store))
+
+    def search(
+        self,
+        query: str,
+        cursor_row: int | None,
+        skip: int,
+        limit: int,
+    ) -> list[int]:
+        """Return up to limit best matching rows, best first.
+
+        Rows ranked up to the cursor row and then skip more rows are
+        left out.
+        """
+        if not self.ready:
+            raise SearchIndexNotReadyError('The search index is being built')
+        rows, scores = self._score(set(tokenize(query)))
+        if cursor_row is not None:
+            after_cursor = _ranked_after(rows, scores, cursor_row)
+            rows = rows[after_cursor]
+            scores = scores[after_cursor]
+        return _best(rows, scores, skip + limit)[skip:]
+
+    async def _build(self) -> None:
+        # Rows stored after this point may be half-written, so the thread
+        # stops here and the rest is indexed back on the event loop.
+        stop_row = len(self._store)
+        self._base = await asyncio.to_thread(
+            _BasePostings.build, self._store, stop_row,
+        )
+        self._indexed_rows = stop_row
+        self._index_rows(len(self._store))
+        self.ready = True
+
+    def _index_rows(self, stop_row: int) -> None:
+        for row in range(self._indexed_rows, stop_row):
+            self._index_row(row)
+        self._indexed_rows = max(self._indexed_rows, stop_row)
+
+    def _index_row(self, row: int) -> None:
+        term_counts = Counter(_row_tokens(self._store, row))
+        frequencies = np.array(list(term_counts.values()))
+        weights = _term_weights(
+            frequencies,
+            frequencies.sum() / self._base.average_length,
+        )
+        for term, weight in zip(term_counts, weights.tolist()):
+            self._tail.setdefault(term, _TailPostings()).append(row, weight)
+
+    def _score(self, terms: set[str]) -> tuple[np.ndarray, np.ndarray]:
+        term_scores = [self._term_scores(term) for term in terms]
+        if len(term_scores) == 1:
+            # Rows of a single term are unique and in order already.
+            return term_scores[0]
+        rows, scores = map(np.concatenate, zip(_NO_MATCHES, *term_scores))
+        return _sum_scores(rows, scores, self._indexed_rows)
+
+    def _term_scores(self, term: str) -> tuple[np.ndarray, np.ndarray]:
+        rows, weights = self._postings(term)
+        return rows, np.multiply(
+            weights, self._inverse_frequency(len(rows)), dtype=np.float64,
+        )
+
+    def _postings(self, term: str) -> tuple[np.ndarray, np.ndarray]:
+        base_rows, base_weights = self._base.get(term)
+        tail = self._tail.get(term, _TailPostings())
+        return (
+            np.concatenate((base_rows, np.frombuffer(tail.rows, np.uint32))),
+            np.concatenate((
+                base_weights, np.frombuffer(tail.weights, np.float32),
+            )),
+        )
+
+    def _inverse_frequency(self, matching_rows: int) -> float:
+        other_rows = self._indexed_rows - matching_rows
+        return math.log(1 + (other_rows + 0.5) / (matching_rows + 0.5))
+
+
+def _chunks(stop_row: int) -> list[range]:
+    starts = range(0, stop_row, _BUILD_CHUNK_ROWS)
+    return [
+        range(start, min(start + _BUILD_CHUNK_ROWS, stop_row))
+        for start in starts
+    ]
+
+
+def _row_tokens(store: ColumnarReviewStore, row: int) -> list[str]:
+    return list(itertools.chain.from_iterable(
+        map(tokenize, filter(None, store.strings(row))),
+    ))
+
+
+def _count_chunk(
+    store: ColumnarReviewStore,
+    rows: range,
+    vocabulary: dict[str, int],
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    # Returns the term codes, rows and term counts of every posting.
+    row_tokens = list(map(functools.partial(_row_tokens, store), rows))
+    token_codes = _encode_terms(
+        list(itertools.chain.from_iterable(row_tokens)), vocabulary,
+    )
+    token_rows = np.repeat(rows, list(map(len, row_tokens)))
+    # Every term and row pair packed into one int is counted at once.
+    pairs, frequencies = np.unique(
+        token_codes * _ROW_SPACE + token_rows, return_counts=True,
+    )
+    return (*np.divmod(pairs, _ROW_SPACE), frequencies)
+
+
+def _encode_terms(tokens: list[str], vocabulary: dict[str, int]) -> np.ndarray:
+    token_codes, chunk_terms = pd.factorize(pd.Series(tokens, dtype=object))
+    term_codes = np.array(
+        [vocabulary.setdefault(term, len(vocabulary)) for term in chunk_terms],
+        np.int64,
+    )
+    return term_codes[token_codes]
+
+
+def _sum_scores(
+    rows: np.ndarray,
+    scores: np.ndarray,
+    row_count: int,
+) -> tuple[np.ndarray, np.ndarray]:
+    # Few matches are summed by sorting them, many in a dense array.
+    if len(rows) * _SPARSE_MATCHES_RATIO < row_count:
+        matching_rows, row_indices = np.unique(rows, return_inverse=True)
+        return matching_rows, np.bincount(row_indices, weights=scores)
+    row_scores = np.bincount(rows, weights=scores, minlength=row_count)
+    matching_rows = np.flatnonzero(row_scores)
+    return matching_rows, row_scores[matching_rows]
+
+
+def _term_weights(
+    frequencies: np.ndarray,
+    relative_lengths: np.ndarray | float,
+) -> np.ndarray:
+    saturation = _SATURATION * (
+        1 - _LENGTH_WEIGHT + _LENGTH_WEIGHT * relative_lengths
+    )
+    weights = frequencies * (_SATURATION + 1) / (frequencies + saturation)
+    return weights.astype(np.float32)
+
+
+def _ranked_after(
+    rows: np.ndarray,
+    scores: np.ndarray,
+    cursor_row: int,
+) -> np.ndarray:
+    position = np.searchsorted(rows, cursor_row)
+    if position == len(rows) or rows[position] != cursor_row:
+        raise InvalidCursorError('Cursor does not match the search')
+    cursor_score = scores[position]
+    tied_after = np.logical_and(scores == cursor_score, rows > cursor_row)
+    return np.logical_or(scores < cursor_score, tied_after)
+
+
+def _best(rows: np.ndarray, scores: np.ndarray, count: int) -> list[int]:
+    if count < len(rows):
+        # Partitioning finds the lowest score that still makes it, so only
+        # rows scoring at least as much are sorted.
+        negated_scores = np.partition(-scores, count - 1)
+        contenders = scores >= -negated_scores[count - 1]
+        rows = rows[contenders]
+        scores = scores[contenders]
+    ranking = np.lexsort((rows, -scores))
+    return rows[ranking[:count]].tolist()
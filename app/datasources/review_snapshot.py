@@ -0,0 +1,225 @@
+import hashlib
+import mmap
+import os
+from pathlib import Path
+from typing import Any
+from typing import BinaryIO
+
+import pydantic
+
+from app.datasources.review_store import ReviewSegment
+from app.datasources.review_store import SEGMENT_LAYOUT
+from app.initializers.logger import get_logger
+
+logger = get_logger()
+
+_MAGIC = b'CALTONRS'
+_FORMAT_VERSION = 2
+_HEADER_LENGTH_SIZE = 8
+_PREFIX_LENGTH = len(_MAGIC) + _HEADER_LENGTH_SIZE
+_ALIGNMENT = 8
+_HASH_CHUNK_SIZE = 2 ** 20  # noqa: WPS432
+
+
+class SourceFingerprint(pydantic.BaseModel):
+    """Identifies the exact spreadsheet a snapshot was parsed from."""
+    mtime_ns: int
+    size: int
+    sha256: str = ''
+
+    @classmethod
+    def quick(cls, source_path: Path) -> 'SourceFingerprint':
+        """Fingerprint by stat data only, without hashing."""
+        stat = source_path.stat()
+        return cls(mtime_ns=stat.st_mtime_ns, size=stat.st_size)
+
+    def with_hash(self, source_path: Path) -> 'SourceFingerprint':
+        """Add the content hash of the source file."""
+        digest = hashlib.sha256()
+        with source_path.open('rb') as source:
+            while chunk := source.read(_HASH_CHUNK_SIZE):
+                digest.update(chunk)
+        return self.model_copy(update={'sha256': digest.hexdigest()})
+
+    def matches(self, other: 'SourceFingerprint') -> bool:
+        """Compare stat data, which is enough for an untouched file."""
+        return (self.mtime_ns, self.size) == (other.mtime_ns, other.size)
+
+
+class _SegmentHeader(pydantic.BaseModel):
+    version: int = _FORMAT_VERSION
+    metadata: dict[str, Any]
+    rows: int
+    # Section name to its byte offset after the header, and its length.
+    sections: dict[str, tuple[int, int]]
+
+    @classmethod
+    def plan(
+        cls,
+        metadata: dict[str, Any],
+        buffers: dict[str, Any],
+    ) -> '_SegmentHeader':
+        offset = 0
+        sections = {}
+        for name, buffer in buffers.items():
+            sections[name] = (offset, memoryview(buffer).nbytes)
+            offset = _align(offset + sections[name][1])
+        return cls(
+            metadata=metadata,
+            rows=len(buffers['created_at']),
+            sections=sections,
+        )
+
+    @classmethod
+    def read(cls, mapped: mmap.mmap) -> tuple['_SegmentHeader', int]:
+        if mapped[:len(_MAGIC)] != _MAGIC:
+            raise ValueError('Not a review segment file')
+        header_length = int.from_bytes(
+            mapped[len(_MAGIC):_PREFIX_LENGTH], 'little',
+        )
+        header = cls.model_validate_json(
+            mapped[_PREFIX_LENGTH:_PREFIX_LENGTH + header_length],
+        )
+        if header.version != _FORMAT_VERSION:
+            raise ValueError('Unsupported segment file version')
+        return header, _align(_PREFIX_LENGTH + header_length)
+
+    def write(self, segment_file: BinaryIO) -> int:
+        encoded_header = self.model_dump_json().encode()
+        segment_file.write(_MAGIC)
+        segment_file.write(
+            len(encoded_header).to_bytes(_HEADER_LENGTH_SIZE, 'little'),
+        )
+        segment_file.write(encoded_header)
+        return _align(_PREFIX_LENGTH + len(encoded_header))
+
+    def slice_sections(self, sections_view: memoryview) -> dict[str, Any]:
+        # A truncated file would otherwise yield short or uncastable views.
+        section_ends = [
+            offset + length for offset, length in self.sections.values()
+        ]
+        if max(section_ends, default=0) > sections_view.nbytes:
+            raise ValueError('Truncated review segment file')
+        return {
+            name: sections_view[offset:offset + length].cast(
+                SEGMENT_LAYOUT[name],
+            )
+            for name, (offset, length) in self.sections.items()
+        }
+
+
+class SegmentFile:
+    """A memory-mappable file holding a review segment and its metadata.
+
+    Column buffers of a read segment are read-only views of the mapped
+    file, so worker processes share their pages through the OS page
+    cache.
+    """
+
+    def __init__(self, path: Path):
+        """Point at the file, without opening it yet."""
+        self.path = path
+
+    def read(self) -> tuple[dict[str, Any], ReviewSegment]:
+        """Map the file and return its metadata and segment.
+
+        Raises OSError or ValueError for missing or malformed files.
+        """
+        with self.path.open('rb') as segment_file:
+            mapped = mmap.mmap(
+                segment_file.fileno(), 0, access=mmap.ACCESS_READ,
+            )
+        header, sections_offset = _SegmentHeader.read(mapped)
+        sections_view = memoryview(mapped)[sections_offset:]
+        return header.metadata, ReviewSegment(
+            header.slice_sections(sections_view),
+        )
+
+    def write(self, segment: ReviewSegment, metadata: dict[str, Any]) -> None:
+        """Write the segment durably, replacing the old file atomically.
+
+        Raises OSError if the file cannot be written.
+        """
+        buffers = segment.buffers()
+        header = _SegmentHeader.plan(metadata, buffers)
+        temporary_path = self.path.with_name(
+            '{0}.{1}.tmp'.format(self.path.name, os.getpid()),
+        )
+        try:
+            self._write_file(temporary_path, header, buffers)
+        except OSError:
+            temporary_path.unlink(missing_ok=True)
+            raise
+
+    def _write_file(
+        self,
+        temporary_path: Path,
+        header: _SegmentHeader,
+        buffers: dict[str, Any],
+    ) -> None:
+        with temporary_path.open('wb') as segment_file:
+            sections_offset = header.write(segment_file)
+            for name, (offset, _) in header.sections.items():
+                segment_file.seek(sections_offset + offset)
+                segment_file.write(buffers[name])
+            segment_file.flush()
+            os.fsync(segment_file.fileno())
+        temporary_path.replace(self.path)
+
+
+class ReviewSnapshot:
+    """A binary snapshot of a parsed review spreadsheet.
+
+    It is stored next to the source and keyed by the source's mtime,
+    size and content hash.
+    """
+
+    def __init__(self, source_path: str):
+        """Locate the snapshot next to the source file."""
+        self.source_path = Path(source_path)
+        self.segment_file = SegmentFile(
+            Path('{0}.snapshot'.format(source_path)),
+        )
+
+    def load(self) -> ReviewSegment | None:
+        """Memory-map the snapshot, if it is still up to date."""
+        if not self.segment_file.path.exists():
+            return None
+        try:
+            metadata, segment = self.segment_file.read()
+        except (OSError, ValueError, TypeError) as error:
+            logger.warning('Ignoring unreadable snapshot: %s', error)
+            return None
+        recorded = SourceFingerprint.model_validate(metadata)
+        current = SourceFingerprint.quick(self.source_path)
+        if current.matches(recorded):
+            return segment
+        # The file may have only been touched or copied, so compare contents.
+        current = current.with_hash(self.source_path)
+        if current.sha256 != recorded.sha256:
+            logger.info('Snapshot %s is stale', self.segment_file.path)
+            return None
+        # With the new stat data recorded, the next start need not hash.
+        self._write_fingerprinted(segment, current)
+        return segment
+
+    def write(self, segment: ReviewSegment) -> None:
+        """Write the snapshot, logging instead of failing on errors."""
+        fingerprint = SourceFingerprint.quick(self.source_path)
+        self._write_fingerprinted(
+            segment, fingerprint.with_hash(self.source_path),
+        )
+
+    def _write_fingerprinted(
+        self,
+        segment: ReviewSegment,
+        fingerprint: SourceFingerprint,
+    ) -> None:
+        try:
+            self.segment_file.write(segment, fingerprint.model_dump())
+        except OSError as error:
+            logger.warning('Could not write snapshot: %s', error)
+
+
+def _align(offset: int) -> int:
+    return -(-offset // _ALIGNMENT) * _ALIGNMENT
@@ -0,0 +1,160 @@
+from collections import Counter
+from collections.abc import Iterable
+from datetime import timedelta
+from decimal import Decimal
+
+import numpy as np
+
+from app.datasources.review_store import datetime_from_epoch
+from app.datasources.review_store import epoch_microseconds
+from app.datasources.review_store import ReviewSegment
+from app.interface import schemas
+from app.interface.enums import SentimentEnum
+
+_RATING_SCALE = 10
+_MISSING_SENTIMENT = -128
+_MICROSECONDS_IN_DAY = 86400 * 10 ** 6  # noqa: WPS432
+_DAYS_IN_WEEK = 7
+# The epoch fell on a Thursday, three days after the start of its week.
+_EPOCH_WEEKDAY = 3
+_MEAN_PRECISION = Decimal('0.01')
+
+
+class ReviewAggregates:
+    """Review statistics maintained as reviews are added.
+
+    Only counters are kept: reviews by rating, by sentiment and by
+    creation day, with the rating sum of every day. Reading the
+    statistics costs O(days), however many reviews there are.
+    """
+
+    def __init__(self):
+        """Start with no reviews counted."""
+        self.ratings: Counter[int] = Counter()
+        self.sentiments: Counter[int] = Counter()
+        self.days: Counter[int] = Counter()
+        self.day_rating_sums: Counter[int] = Counter()
+        self._summary: schemas.ReviewStatistics | None = None
+
+    def __len__(self) -> int:
+        """Return the amount of counted reviews."""
+        return sum(self.ratings.values())
+
+    @classmethod
+    def from_counts(
+        cls,
+        ratings: Iterable[tuple[int, int]],
+        sentiments: Iterable[tuple[int, int]],
+        days: Iterable[tuple[int, int, int]],
+    ) -> 'ReviewAggregates':
+        """Restore counters, with every day given as its rating sum too."""
+        aggregates = cls()
+        aggregates.ratings.update(dict(ratings))
+        aggregates.sentiments.update(dict(sentiments))
+        for day, day_count, rating_sum in days:
+            aggregates.days[day] = day_count
+            aggregates.day_rating_sums[day] = rating_sum
+        return aggregates
+
+    def add(self, *reviews: schemas.Review) -> None:
+        """Count reviews one by one."""
+        self._summary = None
+        for review in reviews:
+            rating_tenths = int(review.rating * _RATING_SCALE)
+            day = epoch_microseconds(review.created_at) // _MICROSECONDS_IN_DAY
+            self.ratings[rating_tenths] += 1
+            self.sentiments[
+                _MISSING_SENTIMENT if review.sentiment is None
+                else review.sentiment
+            ] += 1
+            self.days[day] += 1
+            self.day_rating_sums[day] += rating_tenths
+
+    def add_segment(self, segment: ReviewSegment) -> None:
+        """Count every row of a segment with vectorised column scans."""
+        self._summary = None
+        buffers = segment.buffers()
+        rating_tenths = np.frombuffer(buffers['rating_tenths'], np.int16)
+        days = np.frombuffer(buffers['created_at'], np.int64) // (
+            _MICROSECONDS_IN_DAY
+        )
+        self.ratings.update(_value_counts(rating_tenths))
+        self.sentiments.update(
+            _value_counts(np.frombuffer(buffers['sentiment'], np.int8)),
+        )
+        self.days.update(_value_counts(days))
+        unique_days, day_groups = np.unique(days, return_inverse=True)
+        self.day_rating_sums.update(dict(zip(
+            unique_days.tolist(),
+            np.bincount(day_groups, weights=rating_tenths).astype(int).tolist(),
+        )))
+
+    def summary(self) -> schemas.ReviewStatistics:
+        """Build the statistics response, once per change of counters."""
+        if self._summary is None:
+            self._summary = self._summarize()
+        return self._summary
+
+    def _summarize(self) -> schemas.ReviewStatistics:
+        rating_sum = sum(
+            rating_tenths * rating_count
+            for rating_tenths, rating_count in self.ratings.items()
+        )
+        return schemas.ReviewStatistics(
+            count=len(self),
+            mean_rating=_mean_rating(rating_sum, len(self)) if self else None,
+            rating_histogram={
+                str(Decimal(rating_tenths).scaleb(-1)): rating_count
+                for rating_tenths, rating_count in sorted(self.ratings.items())
+            },
+            sentiment_counts={
+                _sentiment_name(sentiment): self.sentiments[sentiment]
+                for sentiment in sorted(self.sentiments)
+            },
+            daily=_buckets(self.days, self.day_rating_sums),
+            weekly=_buckets(*_weeks(self.days, self.day_rating_sums)),
+        )
+
+
+def _value_counts(column: np.ndarray) -> dict[int, int]:
+    unique_values, value_counts = np.unique(column, return_counts=True)
+    return dict(zip(unique_values.tolist(), value_counts.tolist()))
+
+
+def _sentiment_name(sentiment: int) -> str:
+    if sentiment == _MISSING_SENTIMENT:
+        return 'unknown'
+    return SentimentEnum(sentiment).name
+
+
+def _mean_rating(rating_sum: int, review_count: int) -> Decimal:
+    mean_tenths = Decimal(rating_sum) / review_count
+    return mean_tenths.scaleb(-1).quantize(_MEAN_PRECISION)
+
+
+def _weeks(
+    days: Counter[int],
+    day_rating_sums: Counter[int],
+) -> tuple[Counter[int], Counter[int]]:
+    # Weeks are keyed by the day they start on.
+    weeks: Counter[int] = Counter()
+    week_rating_sums: Counter[int] = Counter()
+    for day, day_count in days.items():
+        week = day - (day + _EPOCH_WEEKDAY) % _DAYS_IN_WEEK
+        weeks[week] += day_count
+        week_rating_sums[week] += day_rating_sums[day]
+    return weeks, week_rating_sums
+
+
+def _buckets(
+    counts: Counter[int],
+    rating_sums: Counter[int],
+) -> list[schemas.StatisticsBucket]:
+    return [
+        schemas.StatisticsBucket(
+            start=(datetime_from_epoch(0) + timedelta(days=day)).date(),
+            count=day_count,
+            mean_rating=_mean_rating(rating_sums[day], day_count),
+        )
+        for day, day_count in sorted(counts.items())
+    ]
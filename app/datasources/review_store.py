@@ -0,0 +1,294 @@
+import itertools
+from array import array
+from bisect import bisect_right
+from collections.abc import Iterable
+from collections.abc import Mapping
+from collections.abc import Sequence
+from datetime import datetime
+from datetime import timedelta
+from datetime import timezone
+from decimal import Decimal
+from types import MappingProxyType
+from typing import Any
+
+import pandas as pd
+
+from app.interface import enums
+from app.interface.schemas import Review
+
+_EPOCH = datetime.fromtimestamp(0, tz=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+_NANOSECONDS_IN_MICROSECOND = 1000
+_RATING_SCALE = 10
+_MISSING_SENTIMENT = -128
+_NUMPY_TYPES = MappingProxyType({'q': 'int64', 'h': 'int16', 'b': 'int8'})
+
+# Array type codes of every buffer a segment consists of.
+SEGMENT_LAYOUT: Mapping[str, str] = MappingProxyType({
+    'created_at': 'q',
+    'rating_tenths': 'h',
+    'sentiment': 'b',
+    'reviewer_name.offsets': 'q',
+    'reviewer_name.present': 'B',
+    'reviewer_name.buffer': 'B',
+    'review_text.offsets': 'q',
+    'review_text.present': 'B',
+    'review_text.buffer': 'B',
+})
+
+
+def epoch_microseconds(moment: datetime) -> int:
+    """Convert an aware datetime to integer microseconds since the epoch."""
+    return (moment - _EPOCH) // _MICROSECOND
+
+
+def datetime_from_epoch(microseconds: int) -> datetime:
+    """Convert integer microseconds since the epoch to a UTC datetime."""
+    return _EPOCH + timedelta(microseconds=microseconds)
+
+
+def build_review(
+    created_at: int,
+    reviewer_name: str | None,
+    rating_tenths: int,
+    sentiment: int | None,
+    review_text: str | None,
+) -> Review:
+    """Build a review model from stored column values, skipping validation."""
+    return Review.model_construct(
+        created_at=datetime_from_epoch(created_at),
+        reviewer_name=reviewer_name,
+        rating=Decimal(rating_tenths).scaleb(-1),
+        sentiment=None if sentiment is None else enums.SentimentEnum(sentiment),
+        review_text=review_text,
+    )
+
+
+class StringArena:
+    """Optional strings packed into one shared utf-8 buffer.
+
+    The buffers may be read-only views, e.g. of a memory-mapped file.
+    """
+
+    def __init__(
+        self,
+        offsets: Any = None,
+        present: Any = None,
+        buffer: Any = None,
+    ):
+        """Wrap existing buffers or start with empty ones."""
+        self._offsets = array('q', [0]) if offsets is None else offsets
+        self._present = bytearray() if present is None else present
+        self._buffer = bytearray() if buffer is None else buffer
+
+    def __len__(self) -> int:
+        """Return the amount of stored strings."""
+        return len(self._present)
+
+    def __getitem__(self, index: int) -> str | None:
+        """Decode a single string."""
+        if not self._present[index]:
+            return None
+        start = self._offsets[index]
+        stop = self._offsets[index + 1]
+        return str(self._buffer[start:stop], 'utf-8')
+
+    def buffers(self, prefix: str) -> dict[str, Any]:
+        """Return the offsets, presence flags and the utf-8 buffer."""
+        return {
+            '{0}.offsets'.format(prefix): self._offsets,
+            '{0}.present'.format(prefix): self._present,
+            '{0}.buffer'.format(prefix): self._buffer,
+        }
+
+    def extend(self, strings: Iterable[str | None]) -> None:
+        """Append strings to the end of the arena."""
+        encoded = [
+            None if string is None else string.encode()
+            for string in strings
+        ]
+        chunks = [chunk or b'' for chunk in encoded]
+        self._present.extend(chunk is not None for chunk in encoded)
+        self._buffer.extend(b''.join(chunks))
+        offsets = itertools.accumulate(
+            (len(chunk) for chunk in chunks),
+            initial=self._offsets[-1],
+        )
+        self._offsets.extend(itertools.islice(offsets, 1, None))
+
+
+class ReviewSegment:
+    """Review columns for a contiguous range of rows.
+
+    Rows are addressed by their position in the segment.
+    """
+
+    def __init__(self, buffers: Mapping[str, Any] | None = None):
+        """Wrap existing column buffers or start with empty arrays."""
+        buffers = buffers or {}
+        self._created_at = buffers.get('created_at', array('q'))
+        self._rating_tenths = buffers.get('rating_tenths', array('h'))
+        self._sentiment = buffers.get('sentiment', array('b'))
+        self._reviewer_name = StringArena(
+            buffers.get('reviewer_name.offsets'),
+            buffers.get('reviewer_name.present'),
+            buffers.get('reviewer_name.buffer'),
+        )
+        self._review_text = StringArena(
+            buffers.get('review_text.offsets'),
+            buffers.get('review_text.present'),
+            buffers.get('review_text.buffer'),
+        )
+
+    def __len__(self) -> int:
+        """Return the amount of stored rows."""
+        return len(self._created_at)
+
+    @classmethod
+    def from_columns(cls, frame: pd.DataFrame) -> 'ReviewSegment':
+        """Store validated review columns in bulk."""
+        timestamps = frame['created_at'].astype('int64')
+        sentiments = frame['sentiment'].astype(float).fillna(
+            _MISSING_SENTIMENT,
+        )
+        reviewer_names = StringArena()
+        reviewer_names.extend(frame['reviewer_name'].tolist())
+        review_texts = StringArena()
+        review_texts.extend(frame['review_text'].tolist())
+        return cls({
+            'created_at': _to_array(
+                'q', timestamps // _NANOSECONDS_IN_MICROSECOND,
+            ),
+            'rating_tenths': _to_array('h', frame['rating_tenths']),
+            'sentiment': _to_array('b', sentiments),
+            **reviewer_names.buffers('reviewer_name'),
+            **review_texts.buffers('review_text'),
+        })
+
+    def buffers(self) -> dict[str, Any]:
+        """Return every column buffer by its layout name."""
+        return {
+            'created_at': self._created_at,
+            'rating_tenths': self._rating_tenths,
+            'sentiment': self._sentiment,
+            **self._reviewer_name.buffers('reviewer_name'),
+            **self._review_text.buffers('review_text'),
+        }
+
+    def created_at(self, row: int) -> int:
+        """Return the creation time of a row in epoch microseconds."""
+        return self._created_at[row]
+
+    def thawed(self) -> 'ReviewSegment':
+        """Return a growable copy, e.g. of a memory-mapped segment."""
+        return ReviewSegment({
+            name: _growable_copy(SEGMENT_LAYOUT[name], buffer)
+            for name, buffer in self.buffers().items()
+        })
+
+    def extend(self, reviews: Sequence[Review]) -> None:
+        """Store reviews after the last row, a column at a time."""
+        self._created_at.extend(
+            epoch_microseconds(review.created_at) for review in reviews
+        )
+        self._rating_tenths.extend(
+            int(review.rating * _RATING_SCALE) for review in reviews
+        )
+        self._sentiment.extend(
+            _MISSING_SENTIMENT if review.sentiment is None
+            else review.sentiment
+            for review in reviews
+        )
+        self._reviewer_name.extend(review.reviewer_name for review in reviews)
+        self._review_text.extend(review.review_text for review in reviews)
+
+    def strings(self, row: int) -> tuple[str | None, str | None]:
+        """Return the reviewer name and the review text of a row."""
+        return self._reviewer_name[row], self._review_text[row]
+
+    def materialize(self, row: int) -> Review:
+        """Build a review model from a stored row."""
+        sentiment = self._sentiment[row]
+        return build_review(
+            created_at=self._created_at[row],
+            reviewer_name=self._reviewer_name[row],
+            rating_tenths=self._rating_tenths[row],
+            sentiment=None if sentiment == _MISSING_SENTIMENT else sentiment,
+            review_text=self._review_text[row],
+        )
+
+
+class ColumnarReviewStore:
+    """An append-only, array-backed review store.
+
+    Rows are addressed by their insertion number. The first rows live in
+    a base segment that may be read-only and must be ordered newest
+    first. Frozen segments of any order may follow it, and new rows go
+    to a growable tail. Review models are only materialised when a row
+    is read.
+    """
+
+    def __init__(
+        self,
+        base: ReviewSegment | None = None,
+        *frozen: ReviewSegment,
+    ):
+        """Start from loaded segments, if any."""
+        self._segments = [base or ReviewSegment(), *frozen, ReviewSegment()]
+        self._starts = list(itertools.accumulate(
+            map(len, self._segments[:-1]),
+            initial=0,
+        ))
+
+    def __len__(self) -> int:
+        """Return the amount of stored rows."""
+        return self._starts[-1] + len(self._segments[-1])
+
+    @property
+    def base(self) -> ReviewSegment:
+        """Return the sorted base segment."""
+        return self._segments[0]
+
+    def created_at(self, row: int) -> int:
+        """Return the creation time of a row in epoch microseconds."""
+        segment, segment_row = self._locate(row)
+        return segment.created_at(segment_row)
+
+    def extend(self, reviews: Sequence[Review]) -> range:
+        """Store reviews and return their row numbers."""
+        first_row = len(self)
+        self._segments[-1].extend(reviews)
+        return range(first_row, len(self))
+
+    def strings(self, row: int) -> tuple[str | None, str | None]:
+        """Return the reviewer name and the review text of a row."""
+        segment, segment_row = self._locate(row)
+        return segment.strings(segment_row)
+
+    def materialize(self, row: int) -> Review:
+        """Build a review model from a stored row."""
+        segment, segment_row = self._locate(row)
+        return segment.materialize(segment_row)
+
+    def _locate(self, row: int) -> tuple[ReviewSegment, int]:
+        # Empty segments share their start, the last of them is picked.
+        segment_index = bisect_right(self._starts, row) - 1
+        return (
+            self._segments[segment_index],
+            row - self._starts[segment_index],
+        )
+
+
+def _growable_copy(typecode: str, buffer: Any) -> Any:
+    raw_bytes = memoryview(buffer).cast('B')
+    if typecode == 'B':
+        return bytearray(raw_bytes)
+    typed_array = array(typecode)
+    typed_array.frombytes(raw_bytes)
+    return typed_array
+
+
+def _to_array(typecode: str, column: pd.Series) -> array:
+    typed_array = array(typecode)
+    typed_array.frombytes(column.to_numpy(_NUMPY_TYPES[typecode]).tobytes())
+    return typed_array
@@ -0,0 +1,191 @@
+import asyncio
+import sqlite3
+import threading
+import time
+
+from cachetools import LRUCache
+
+from app.datasources.review_store import epoch_microseconds
+from app.interface import schemas
+from app.interface.abstract import AbstractScrapeCache
+
+_MAX_RESTAURANTS = 1000
+_BUSY_TIMEOUT_SECONDS = 30
+
+_CREATE_TABLE = (
+    'CREATE TABLE IF NOT EXISTS scraped_reviews ('
+    + 'restaurant_slug TEXT PRIMARY KEY, '
+    + 'scraped_at INTEGER NOT NULL, '
+    + 'review_count INTEGER NOT NULL, '
+    + 'scraped TEXT NOT NULL, '
+    + 'refresh_until REAL NOT NULL DEFAULT 0)'
+)
+_SELECT_NEWER = (
+    'SELECT scraped FROM scraped_reviews '
+    + 'WHERE restaurant_slug = :restaurant_slug '
+    + 'AND (scraped_at, review_count) > (:scraped_at, :review_count)'
+)
+_UPSERT = (
+    'INSERT INTO scraped_reviews '
+    + '(restaurant_slug, scraped_at, review_count, scraped) '
+    + 'VALUES (:restaurant_slug, :scraped_at, :review_count, :scraped) '
+    + 'ON CONFLICT (restaurant_slug) DO UPDATE SET '
+    + 'scraped_at = excluded.scraped_at, '
+    + 'review_count = excluded.review_count, '
+    + 'scraped = excluded.scraped '
+    + 'WHERE (excluded.scraped_at, excluded.review_count) '
+    + '> (scraped_at, review_count)'
+)
+# Only a refresh of stored reviews is claimed, and it is claimed again
+# once the lease runs out, in case the refreshing worker died.
+_CLAIM_REFRESH = (
+    'UPDATE scraped_reviews SET refresh_until = :now + :lease_seconds '
+    + 'WHERE restaurant_slug = :restaurant_slug AND refresh_until <= :now'
+)
+
+
+class MemoryScrapeCache(AbstractScrapeCache):
+    """Scraped reviews of the most recent restaurants, in this worker."""
+
+    def __init__(self, max_restaurants: int = _MAX_RESTAURANTS):
+        """Start empty."""
+        self._scraped: LRUCache[str, schemas.ScrapedReviews] = LRUCache(
+            maxsize=max_restaurants,
+        )
+        self._refreshes: LRUCache[str, float] = LRUCache(
+            maxsize=max_restaurants,
+        )
+
+    async def get(
+        self,
+        restaurant_slug: str,
+        known: schemas.ScrapedReviews | None = None,
+    ) -> schemas.ScrapedReviews | None:
+        """Return the cached reviews, if newer or more than the known ones."""
+        scraped = self._scraped.get(restaurant_slug)
+        if scraped is None or _version(scraped) <= _version(known):
+            return None
+        return scraped
+
+    async def put(
+        self,
+        restaurant_slug: str,
+        scraped: schemas.ScrapedReviews,
+    ) -> None:
+        """Cache the reviews, unless newer or more are cached already."""
+        cached = self._scraped.get(restaurant_slug)
+        if cached is None or _version(cached) < _version(scraped):
+            self._scraped[restaurant_slug] = scraped
+
+    async def claim_refresh(
+        self,
+        restaurant_slug: str,
+        lease_seconds: float,
+    ) -> bool:
+        """Tell whether the caller is the only one refreshing the reviews."""
+        now = time.monotonic()
+        if self._refreshes.get(restaurant_slug, now) > now:
+            return False
+        self._refreshes[restaurant_slug] = now + lease_seconds
+        return True
+
+
+class SQLiteScrapeCache(AbstractScrapeCache):
+    """Scraped reviews in a SQLite database shared by all workers.
+
+    Reviews are stored as JSON, and only read back when another worker
+    stored newer or more of them. The database outlives restarts.
+    """
+
+    def __init__(self, database_path: str):
+        """Create the table, unless it exists already."""
+        self._database_path = database_path
+        self._connections = threading.local()
+        with self._connect() as connection:
+            connection.execute(_CREATE_TABLE)
+
+    async def get(
+        self,
+        restaurant_slug: str,
+        known: schemas.ScrapedReviews | None = None,
+    ) -> schemas.ScrapedReviews | None:
+        """Return the cached reviews, if newer or more than the known ones."""
+        scraped_at, review_count = _version(known)
+        return await asyncio.to_thread(self._select_newer, {
+            'restaurant_slug': restaurant_slug,
+            'scraped_at': scraped_at,
+            'review_count': review_count,
+        })
+
+    async def put(
+        self,
+        restaurant_slug: str,
+        scraped: schemas.ScrapedReviews,
+    ) -> None:
+        """Cache the reviews, unless newer or more are cached already."""
+        # A running scrape keeps adding reviews, so a copy is encoded.
+        snapshot = scraped.model_copy(update={
+            'reviews': list(scraped.reviews),
+        })
+        await asyncio.to_thread(self._upsert, restaurant_slug, snapshot)
+
+    async def claim_refresh(
+        self,
+        restaurant_slug: str,
+        lease_seconds: float,
+    ) -> bool:
+        """Tell whether the caller is the only one refreshing the reviews."""
+        return await asyncio.to_thread(self._claim_refresh, {
+            'restaurant_slug': restaurant_slug,
+            'lease_seconds': lease_seconds,
+            'now': time.time(),
+        })
+
+    def _select_newer(
+        self,
+        query_parameters: dict[str, str | int],
+    ) -> schemas.ScrapedReviews | None:
+        row = self._connect().execute(
+            _SELECT_NEWER, query_parameters,
+        ).fetchone()
+        if row is None:
+            return None
+        return schemas.ScrapedReviews.model_validate_json(row[0])
+
+    def _upsert(
+        self,
+        restaurant_slug: str,
+        scraped: schemas.ScrapedReviews,
+    ) -> None:
+        scraped_at, review_count = _version(scraped)
+        with self._connect() as connection:
+            connection.execute(_UPSERT, {
+                'restaurant_slug': restaurant_slug,
+                'scraped_at': scraped_at,
+                'review_count': review_count,
+                'scraped': scraped.model_dump_json(),
+            })
+
+    def _claim_refresh(self, query_parameters: dict[str, str | float]) -> bool:
+        with self._connect() as connection:
+            return connection.execute(
+                _CLAIM_REFRESH, query_parameters,
+            ).rowcount == 1
+
+    def _connect(self) -> sqlite3.Connection:
+        # Calls run in worker threads, and each thread needs its own.
+        connection = getattr(self._connections, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(
+                self._database_path, timeout=_BUSY_TIMEOUT_SECONDS,
+            )
+            connection.execute('PRAGMA journal_mode=WAL')
+            self._connections.connection = connection
+        return connection
+
+
+def _version(scraped: schemas.ScrapedReviews | None) -> tuple[int, int]:
+    # Later scrapes win, and then the ones with more reviews.
+    if scraped is None:
+        return -1, -1
+    return epoch_microseconds(scraped.scraped_at), len(scraped.reviews)
@@ -0,0 +1,59 @@
+import time
+from typing import NamedTuple
+
+from cachetools import LRUCache
+
+_MAX_RESTAURANTS = 1000
+_HALF_LIFE_SECONDS = 3600
+
+
+class _Demand(NamedTuple):
+    score: float
+    review_count: int
+    updated_at: float
+
+
+class RestaurantDemand:
+    """How often and how deep the reviews of restaurants are asked for.
+
+    Scores halve every half-life, so restaurants asked for now rank
+    above the ones that were popular long ago.
+    """
+
+    def __init__(
+        self,
+        half_life_seconds: float = _HALF_LIFE_SECONDS,
+        max_restaurants: int = _MAX_RESTAURANTS,
+    ):
+        """Start without any requests."""
+        self.half_life_seconds = half_life_seconds
+        self._demand: LRUCache[str, _Demand] = LRUCache(
+            maxsize=max_restaurants,
+        )
+
+    def record(self, restaurant_slug: str, review_count: int) -> None:
+        """Count a request for as many reviews of the restaurant."""
+        now = time.monotonic()
+        demand = self._demand.get(restaurant_slug, _Demand(0, 0, now))
+        self._demand[restaurant_slug] = _Demand(
+            score=self._decayed_score(demand, now) + 1,
+            review_count=max(demand.review_count, review_count),
+            updated_at=now,
+        )
+
+    def most_wanted(self, restaurant_count: int) -> dict[str, int]:
+        """Return the top restaurants, with the most reviews asked for."""
+        now = time.monotonic()
+        ranked = sorted(
+            self._demand.items(),
+            key=lambda slug_demand: self._decayed_score(slug_demand[1], now),
+            reverse=True,
+        )
+        return {
+            restaurant_slug: demand.review_count
+            for restaurant_slug, demand in ranked[:restaurant_count]
+        }
+
+    def _decayed_score(self, demand: _Demand, now: float) -> float:
+        half_lives = (now - demand.updated_at) / self.half_life_seconds
+        return demand.score * 0.5 ** half_lives
@@ -0,0 +1,73 @@
+import asyncio
+from collections.abc import Callable
+from collections.abc import Coroutine
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any
+
+from app.interface import schemas
+
+
+class ScrapeFlight:
+    """A scrape in flight, shared by every request for a restaurant.
+
+    The scrape fills the buffer until it holds the length the deepest
+    waiting request wants. Requests that went away want nothing, so the
+    scrape stops early once nobody waits. Once it lands, later requests
+    have to start a scrape of their own. So do requests left short by a
+    scrape that gave way to them, without taking a browser.
+    """
+
+    def __init__(
+        self,
+        buffer: list[schemas.Review],
+        scrape: Callable[['ScrapeFlight'], Coroutine[Any, Any, None]],
+    ):
+        """Start scraping in a task of its own."""
+        self.buffer = buffer
+        self._wanted: list[int] = []
+        self.landed = False
+        self.gave_way = False
+        self.strategy_name: str | None = None
+        self._progress = asyncio.get_running_loop().create_future()
+        self.task: asyncio.Task[None] = asyncio.create_task(scrape(self))
+        self.task.add_done_callback(lambda _: self.land())
+
+    def wants_more(self) -> bool:
+        """Tell whether any request waits for more reviews."""
+        return len(self.buffer) < max(self._wanted, default=0)
+
+    @contextmanager
+    def wanting(self, buffer_length: int) -> Iterator[None]:
+        """Keep the scrape going for the length, while in the context."""
+        self._wanted.append(buffer_length)
+        try:
+            yield
+        finally:
+            self._wanted.remove(buffer_length)
+
+    def report_progress(self) -> None:
+        """Wake up the requests waiting for reviews."""
+        self._progress.set_result(None)
+        self._progress = asyncio.get_running_loop().create_future()
+
+    def land(self) -> None:
+        """Stop taking requests and let the waiting ones go."""
+        if not self.landed:
+            self.landed = True
+            self.report_progress()
+
+    async def wait_for(self, buffer_length: int) -> None:
+        """Wait until the buffer holds the length or the scrape lands.
+
+        The error that ended the scrape, if any, is raised to requests
+        it left short.
+        """
+        with self.wanting(buffer_length):
+            while len(self.buffer) < buffer_length and not self.landed:
+                await asyncio.wait(
+                    (self.task, self._progress),
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+        if len(self.buffer) < buffer_length and self.task.done():
+            self.task.result()
@@ -0,0 +1,135 @@
+import asyncio
+import uuid
+from datetime import datetime
+from datetime import timezone
+
+from cachetools import TTLCache
+
+from app.datasources.justeat_datasource import JustEatDataSource
+from app.initializers.logger import get_logger
+from app.interface import exceptions as ex
+from app.interface import schemas
+from app.interface.enums import ScrapeJobStatus
+
+logger = get_logger()
+
+_MAX_JOBS = 1000
+_JOB_TTL_SECONDS = 3600
+
+
+class ScrapeJob:
+    """A scrape of a restaurant, run apart from the request asking for it.
+
+    The reviews scraped so far can be read while it runs, since the job
+    scrapes into the buffer every request for the restaurant shares.
+    """
+
+    def __init__(self, restaurant_slug: str, review_count: int):
+        """Queue the job, with the reviews already scraped for a start."""
+        self.datasource = JustEatDataSource(restaurant_slug)
+        self.progress = schemas.ScrapeJobProgress(
+            job_id=uuid.uuid4().hex,
+            restaurant_slug=restaurant_slug,
+            review_count=review_count,
+            created_at=datetime.now(timezone.utc),
+        )
+        self._started_with = 0
+
+    async def run(self) -> None:
+        """Scrape until the buffer holds the reviews asked for."""
+        self.progress.status = ScrapeJobStatus.running
+        self.progress.started_at = datetime.now(timezone.utc)
+        self._started_with = len(self.datasource.review_buffer)
+        try:
+            async with self.datasource:
+                await self.datasource.get_reviews(schemas.PaginationOptions(
+                    limit=self.progress.review_count,
+                ))
+        except Exception as error:
+            logger.warning('Scrape job failed: %r', error)
+            self.progress.status = ScrapeJobStatus.failed
+            self.progress.error = str(error) or type(error).__name__
+        else:
+            self.progress.status = ScrapeJobStatus.done
+        self.progress.finished_at = datetime.now(timezone.utc)
+
+    def report(self) -> schemas.ScrapeJobProgress:
+        """Return the progress as of now."""
+        collected = min(
+            len(self.datasource.review_buffer), self.progress.review_count,
+        )
+        return self.progress.model_copy(update={
+            'collected': collected,
+            'strategy': self.datasource.strategy_name,
+            'eta_seconds': self._eta_seconds(collected),
+        })
+
+    def _eta_seconds(self, collected: int) -> float | None:
+        started_at = self.progress.started_at
+        running = self.progress.status == ScrapeJobStatus.running
+        if not running or started_at is None:
+            return None
+        scraped = collected - self._started_with
+        if scraped <= 0:
+            return None
+        elapsed = datetime.now(timezone.utc) - started_at
+        remaining = self.progress.review_count - collected
+        return elapsed.total_seconds() * remaining / scraped
+
+
+class ScrapeJobQueue:
+    """Scrape jobs waiting for a worker, and recent jobs by id.
+
+    There are as many workers as driver sessions, so jobs wait in this
+    bounded queue instead of for a session. Jobs are forgotten an hour
+    after they were submitted.
+    """
+
+    def __init__(self, workers: int, max_queued: int):
+        """Create the queue, but do not start the workers."""
+        self.workers = workers
+        self._queue: asyncio.Queue[ScrapeJob] = asyncio.Queue(
+            maxsize=max_queued,
+        )
+        self._jobs: TTLCache[str, ScrapeJob] = TTLCache(
+            maxsize=_MAX_JOBS,
+            ttl=_JOB_TTL_SECONDS,
+        )
+        self._worker_tasks: list[asyncio.Task[None]] = []
+
+    def start(self) -> None:
+        """Start the workers taking jobs off the queue."""
+        self._worker_tasks = [
+            asyncio.create_task(self._work()) for _ in range(self.workers)
+        ]
+
+    async def stop(self) -> None:
+        """Cancel the workers, and the jobs they run."""
+        for worker_task in self._worker_tasks:
+            worker_task.cancel()
+        await asyncio.gather(*self._worker_tasks, return_exceptions=True)
+        self._worker_tasks.clear()
+
+    def submit(self, restaurant_slug: str, review_count: int) -> ScrapeJob:
+        """Queue a scrape job, unless too many are waiting already."""
+        job = ScrapeJob(restaurant_slug, review_count)
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull as error:
+            raise ex.ScrapeQueueFullError(
+                'Too many scrape jobs are waiting',
+            ) from error
+        self._jobs[job.progress.job_id] = job
+        return job
+
+    def get(self, job_id: str) -> ScrapeJob:
+        """Return the job, unless it is unknown or expired."""
+        job = self._jobs.get(job_id)
+        if job is None:
+            raise ex.ScrapeJobNotFoundError('No such scrape job')
+        return job
+
+    async def _work(self) -> None:
+        while True:  # noqa: WPS457
+            job = await self._queue.get()
+            await job.run()
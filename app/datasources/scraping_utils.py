@@ -1,25 +1,27 @@
-import asyncio
-import random
-
 from app.initializers.logger import get_logger
+from app.initializers.pacing import DEFAULT_JITTER
+from app.initializers.pacing import PACER
+
 logger = get_logger()
 
 
 async def sleep_with_jitter(
     seconds: int,
-    distribution_bounding_box: tuple[float, float] = (0.75, 1.25),
+    distribution_bounding_box: tuple[float, float] = DEFAULT_JITTER,
 ) -> None:
-    """Sleep in a non-blocking way, with noise applied to the duration."""
-    multiplier = random.uniform(*distribution_bounding_box)  # noqa: S311
-    await asyncio.sleep(seconds * multiplier)
+    """Sleep in a non-blocking way, as paced for the scraped host."""
+    await PACER.pause(seconds, distribution_bounding_box)
 
 
 def humanize_with_pauses(
     pre: int = 0,
     post: int = 0,
-    distribution_bounding_box: tuple[float, float] = (0.75, 1.25),
+    distribution_bounding_box: tuple[float, float] = DEFAULT_JITTER,
 ):
-    """Add pauses before and/or after execution to humanize the behavior."""
+    """Add pauses before and/or after execution to humanize the behavior.
+
+    The pauses are nominal, the pacer scales them and spreads them out.
+    """
     if not (pre or post):
         raise ValueError('At least one of pre or post must be non-zero')
 
@@ -0,0 +1,343 @@
+import asyncio
+import math
+import sqlite3
+import threading
+from collections.abc import AsyncIterator
+from contextlib import closing
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any
+
+from app.datasources import sqlite_schema
+from app.datasources.review_search_index import tokenize
+from app.datasources.review_stats import ReviewAggregates
+from app.datasources.review_store import build_review
+from app.datasources.review_store import datetime_from_epoch
+from app.datasources.review_store import epoch_microseconds
+from app.interface import schemas
+from app.interface.abstract import AbstractReviewDatasource
+from app.interface.exceptions import InvalidCursorError
+
+_RATING_SCALE = 10
+_BUSY_TIMEOUT_SECONDS = 30
+_MMAP_SIZE = 2 ** 30  # noqa: WPS432
+_EXPORT_CHUNK_SIZE = 1000
+
+_SELECT_PAGE = (
+    'SELECT id, created_at, reviewer_name, rating_tenths, sentiment, '
+    + 'review_text FROM reviews {0} '
+    + 'ORDER BY created_at DESC, id LIMIT :limit OFFSET :skip'
+)
+_SELECT_SEARCH_PAGE = (
+    'SELECT id, created_at, reviews.reviewer_name, rating_tenths, '
+    + 'sentiment, reviews.review_text FROM reviews_search '
+    + 'JOIN reviews ON reviews.id = reviews_search.rowid '
+    + 'WHERE reviews_search MATCH :query {0} '
+    + 'ORDER BY rank, id LIMIT :limit OFFSET :skip'
+)
+_SELECT_SEARCH_CURSOR = (
+    'SELECT rank, created_at FROM reviews_search '
+    + 'JOIN reviews ON reviews.id = reviews_search.rowid '
+    + 'WHERE reviews_search MATCH :query AND reviews_search.rowid = :id'
+)
+_AFTER_SEARCH_CURSOR = 'AND (rank > :rank OR (rank = :rank AND id > :id))'
+_AFTER_CURSOR = (
+    'created_at <= :created_at AND (created_at < :created_at OR id > :id)'
+)
+# A rating range cannot come out of an index in time order, so the
+# unary plus keeps the planner on the newest first index instead of
+# sorting the whole range. A single rating uses its own index.
+_FILTER_CONDITIONS = MappingProxyType({
+    'rating_min': '+rating_tenths >= :rating_min',
+    'rating_max': '+rating_tenths <= :rating_max',
+    'rating': 'rating_tenths = :rating',
+    'sentiment': 'sentiment = :sentiment',
+    'created_from': 'created_at >= :created_from',
+    'created_to': 'created_at < :created_to',
+    'reviewer_name': 'reviewer_name = :reviewer_name',
+})
+
+
+class SQLiteReviewDatasource(AbstractReviewDatasource):
+    """A review datasource shared by all worker processes.
+
+    The SQLite database runs in WAL mode, so readers in every worker
+    proceed while a single writer commits. Its pages are memory-mapped
+    and shared through the OS page cache instead of being copied into
+    each worker.
+    """
+
+    _instance = None
+    _database_path = 'reviews.sqlite3'
+    _connections = threading.local()
+    _version = 0
+
+    def __new__(cls):
+        """Return the single instance if created."""
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    @classmethod
+    def load_from(cls, xlsx_file_path: str, database_path: str) -> None:
+        """Import the spreadsheet, unless the database already has it.
+
+        Added reviews are kept when a changed spreadsheet is reimported.
+        """
+        cls._database_path = database_path
+        connection = cls._connect()
+        sqlite_schema.create_schema(connection)
+        with connection:
+            # Take the write lock first, so workers import only once.
+            connection.execute('BEGIN IMMEDIATE')
+            sqlite_schema.import_spreadsheet(connection, Path(xlsx_file_path))
+
+    def list_multiple_reviews_with(
+        self,
+        pagination: schemas.PaginationOptions,
+        filters: schemas.ReviewFilters | None = None,
+    ) -> schemas.MultipleReviewsResponse:
+        """Return a slice of the reviews and a cursor to the next one."""
+        conditions, query_parameters = _filter_conditions(
+            filters or schemas.ReviewFilters(),
+        )
+        cursor = pagination.decode_cursor()
+        if cursor is not None:
+            conditions.append(_AFTER_CURSOR)
+            query_parameters['created_at'] = epoch_microseconds(
+                cursor.created_at,
+            )
+            query_parameters['id'] = cursor.identity
+        # One extra row tells whether there is a next page.
+        query_parameters['limit'] = pagination.limit + 1
+        query_parameters['skip'] = pagination.skip
+        rows = self._connect().execute(
+            _SELECT_PAGE.format(_where(conditions)), query_parameters,
+        ).fetchall()
+        return _page(rows, pagination.limit)
+
+    async def search_reviews(
+        self,
+        query: str,
+        pagination: schemas.PaginationOptions,
+    ) -> schemas.MultipleReviewsResponse:
+        """Return a page of reviews ranked by the FTS5 index with BM25.
+
+        Common words match so many reviews that ranking them takes
+        seconds, so the query runs in a worker thread.
+        """
+        return await asyncio.to_thread(self._search, query, pagination)
+
+    async def export_reviews(
+        self,
+        filters: schemas.ReviewFilters,
+    ) -> AsyncIterator[list[schemas.Review]]:
+        """Stream the matching reviews from one read transaction.
+
+        The export gets a connection of its own, since its transaction
+        stays open while chunks are fetched in worker threads.
+        """
+        conditions, query_parameters = _filter_conditions(filters)
+        query_parameters.update(limit=-1, skip=0)
+        with closing(self._open(check_same_thread=False)) as connection:
+            rows = await asyncio.to_thread(
+                _select_snapshot,
+                connection,
+                _SELECT_PAGE.format(_where(conditions)),
+                query_parameters,
+            )
+            chunk = await asyncio.to_thread(rows.fetchmany, _EXPORT_CHUNK_SIZE)
+            while chunk:
+                yield [build_review(*row[1:]) for row in chunk]
+                chunk = await asyncio.to_thread(
+                    rows.fetchmany, _EXPORT_CHUNK_SIZE,
+                )
+
+    def get_statistics(self) -> schemas.ReviewStatistics:
+        """Read the aggregate tables the triggers keep up to date."""
+        with self._connect() as connection:
+            # One read transaction, so all tables come from one snapshot.
+            connection.execute('BEGIN')
+            aggregates = ReviewAggregates.from_counts(
+                connection.execute(
+                    'SELECT * FROM review_rating_counts WHERE reviews',
+                ),
+                connection.execute(
+                    'SELECT * FROM review_sentiment_counts WHERE reviews',
+                ),
+                connection.execute(
+                    'SELECT * FROM review_day_counts WHERE reviews',
+                ),
+            )
+        return aggregates.summary()
+
+    def version(self) -> int:
+        """Return a counter bumped whenever the database may have changed.
+
+        The data version of a connection changes when any other
+        connection commits, in any process. A connection seen for the
+        first time counts as a change too, as does every insert here.
+        """
+        data_version = self._connect().execute(
+            'PRAGMA data_version',
+        ).fetchone()[0]
+        if getattr(self._connections, 'data_version', None) != data_version:
+            self._connections.data_version = data_version
+            self._bump_version()
+        return self._version
+
+    async def add_reviews(self, *new_reviews: schemas.Review) -> None:
+        """Insert the reviews in one transaction, visible to all workers."""
+        await asyncio.to_thread(self._insert, new_reviews)
+
+    def _insert(self, new_reviews: tuple[schemas.Review, ...]) -> None:
+        with self._connect() as connection:
+            connection.execute('BEGIN IMMEDIATE')
+            connection.executemany(sqlite_schema.INSERT_REVIEW, [
+                (
+                    epoch_microseconds(review.created_at),
+                    review.reviewer_name,
+                    int(review.rating * _RATING_SCALE),
+                    review.sentiment,
+                    review.review_text,
+                    False,
+                )
+                for review in new_reviews
+            ])
+        self._bump_version()
+
+    def _search(
+        self,
+        query: str,
+        pagination: schemas.PaginationOptions,
+    ) -> schemas.MultipleReviewsResponse:
+        query_parameters: dict[str, Any] = {
+            # Any of the words, quoted so that they are never operators.
+            'query': ' OR '.join(map('"{0}"'.format, tokenize(query))),
+            'limit': pagination.limit + 1,
+            'skip': pagination.skip,
+        }
+        if not query_parameters['query']:
+            return schemas.MultipleReviewsResponse(reviews=[])
+        with self._connect() as connection:
+            # The cursor rank and the page come from one snapshot.
+            connection.execute('BEGIN')
+            cursor_condition = _search_cursor_condition(
+                connection, pagination.decode_cursor(), query_parameters,
+            )
+            rows = connection.execute(
+                _SELECT_SEARCH_PAGE.format(cursor_condition),
+                query_parameters,
+            ).fetchall()
+        return _page(rows, pagination.limit)
+
+    @classmethod
+    def _bump_version(cls) -> None:
+        cls._version += 1
+
+    @classmethod
+    def _connect(cls) -> sqlite3.Connection:
+        # Connections cannot be shared between threads, so each thread
+        # of the worker gets its own.
+        connection = getattr(cls._connections, 'connection', None)
+        if connection is None:
+            connection = cls._open()
+            cls._connections.connection = connection
+        return connection
+
+    @classmethod
+    def _open(cls, check_same_thread: bool = True) -> sqlite3.Connection:
+        connection = sqlite3.connect(
+            cls._database_path,
+            timeout=_BUSY_TIMEOUT_SECONDS,
+            isolation_level=None,
+            check_same_thread=check_same_thread,
+        )
+        connection.execute('PRAGMA journal_mode=WAL')
+        connection.execute('PRAGMA synchronous=NORMAL')
+        connection.execute('PRAGMA mmap_size={0}'.format(_MMAP_SIZE))
+        return connection
+
+
+def _select_snapshot(
+    connection: sqlite3.Connection,
+    query: str,
+    query_parameters: dict[str, Any],
+) -> sqlite3.Cursor:
+    # The transaction pins the snapshot until the connection is closed.
+    connection.execute('BEGIN')
+    return connection.execute(query, query_parameters)
+
+
+def _search_cursor_condition(
+    connection: sqlite3.Connection,
+    cursor: schemas.ReviewCursor | None,
+    query_parameters: dict[str, Any],
+) -> str:
+    if cursor is None:
+        return ''
+    query_parameters['id'] = cursor.identity
+    cursor_row = connection.execute(
+        _SELECT_SEARCH_CURSOR, query_parameters,
+    ).fetchone()
+    if cursor_row is None:
+        raise InvalidCursorError('Cursor does not match the search')
+    if cursor_row[1] != epoch_microseconds(cursor.created_at):
+        raise InvalidCursorError('Cursor does not match the review')
+    query_parameters['rank'] = cursor_row[0]
+    return _AFTER_SEARCH_CURSOR
+
+
+def _page(rows: list[tuple], limit: int) -> schemas.MultipleReviewsResponse:
+    # Rows hold one more review than the page when there is a next one.
+    page_rows = rows[:limit]
+    return schemas.MultipleReviewsResponse(
+        reviews=[build_review(*row[1:]) for row in page_rows],
+        next_cursor=_cursor_after(page_rows[-1]) if len(rows) > limit else None,
+    )
+
+
+def _cursor_after(row: tuple) -> str:
+    return schemas.ReviewCursor(
+        created_at=datetime_from_epoch(row[1]),
+        identity=row[0],
+    ).encode()
+
+
+def _filter_conditions(
+    filters: schemas.ReviewFilters,
+) -> tuple[list[str], dict[str, Any]]:
+    # Bounds between stored tenths round inwards, never outwards.
+    query_parameters = {
+        'rating_min': filters.rating_min and math.ceil(
+            filters.rating_min * _RATING_SCALE,
+        ),
+        'rating_max': filters.rating_max and math.floor(
+            filters.rating_max * _RATING_SCALE,
+        ),
+        'sentiment': filters.sentiment,
+        'created_from': filters.created_from and epoch_microseconds(
+            filters.created_from,
+        ),
+        'created_to': filters.created_to and epoch_microseconds(
+            filters.created_to,
+        ),
+        'reviewer_name': filters.reviewer_name,
+    }
+    if query_parameters['rating_min'] == query_parameters['rating_max']:
+        query_parameters['rating'] = query_parameters.pop('rating_min')
+        query_parameters.pop('rating_max')
+    set_parameters = {
+        name: parameter
+        for name, parameter in query_parameters.items()
+        if parameter is not None
+    }
+    return [_FILTER_CONDITIONS[name] for name in set_parameters], (
+        set_parameters
+    )
+
+
+def _where(conditions: list[str]) -> str:
+    if not conditions:
+        return ''
+    return 'WHERE {0}'.format(' AND '.join(conditions))
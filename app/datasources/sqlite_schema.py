@@ -0,0 +1,211 @@
+import sqlite3
+from collections.abc import Iterable
+from pathlib import Path
+from types import MappingProxyType
+
+from app.datasources.review_snapshot import SourceFingerprint
+from app.datasources.xlsx_ingestion import read_review_columns
+from app.initializers.logger import get_logger
+
+logger = get_logger()
+
+_NANOSECONDS_IN_MICROSECOND = 1000
+
+# Adds a new review row to every aggregate table. Reviews without a
+# sentiment are counted under -128, and days are UTC days since the epoch.
+_COUNT_REVIEW = (
+    'INSERT INTO review_rating_counts VALUES (NEW.rating_tenths, 1) '
+    + 'ON CONFLICT (rating_tenths) DO UPDATE SET reviews = reviews + 1; '
+    + 'INSERT INTO review_sentiment_counts '
+    + 'VALUES (IFNULL(NEW.sentiment, -128), 1) '
+    + 'ON CONFLICT (sentiment) DO UPDATE SET reviews = reviews + 1; '
+    + 'INSERT INTO review_day_counts '
+    + 'VALUES (NEW.created_at / 86400000000, 1, NEW.rating_tenths) '
+    + 'ON CONFLICT (day) DO UPDATE SET reviews = reviews + 1, '
+    + 'rating_tenths_sum = rating_tenths_sum + NEW.rating_tenths;'
+)
+# Takes a deleted review row away from every aggregate table.
+_UNCOUNT_REVIEW = (
+    'UPDATE review_rating_counts SET reviews = reviews - 1 '
+    + 'WHERE rating_tenths = OLD.rating_tenths; '
+    + 'UPDATE review_sentiment_counts SET reviews = reviews - 1 '
+    + 'WHERE sentiment = IFNULL(OLD.sentiment, -128); '
+    + 'UPDATE review_day_counts SET reviews = reviews - 1, '
+    + 'rating_tenths_sum = rating_tenths_sum - OLD.rating_tenths '
+    + 'WHERE day = OLD.created_at / 86400000000;'
+)
+_SCHEMA = (
+    'CREATE TABLE IF NOT EXISTS reviews ('
+    + 'id INTEGER PRIMARY KEY, created_at INTEGER NOT NULL, '
+    + 'reviewer_name TEXT, rating_tenths INTEGER NOT NULL, '
+    + 'sentiment INTEGER, review_text TEXT, '
+    + 'imported INTEGER NOT NULL DEFAULT 0)',
+    # Newest first, ties in insertion order, like the in-memory index.
+    'CREATE INDEX IF NOT EXISTS reviews_newest_first '
+    + 'ON reviews (created_at DESC, id)',
+    # Filtered pages come out of these in order, without sorting.
+    'CREATE INDEX IF NOT EXISTS reviews_by_rating '
+    + 'ON reviews (rating_tenths, created_at DESC, id)',
+    'CREATE INDEX IF NOT EXISTS reviews_by_sentiment '
+    + 'ON reviews (sentiment, created_at DESC, id)',
+    'CREATE INDEX IF NOT EXISTS reviews_by_reviewer '
+    + 'ON reviews (reviewer_name, created_at DESC, id)',
+    'CREATE TABLE IF NOT EXISTS imported_sources ('
+    + 'path TEXT PRIMARY KEY, fingerprint TEXT NOT NULL)',
+    # Aggregates kept up to date by triggers, so statistics never scan
+    # the reviews.
+    'CREATE TABLE IF NOT EXISTS review_rating_counts ('
+    + 'rating_tenths INTEGER PRIMARY KEY, reviews INTEGER NOT NULL)',
+    'CREATE TABLE IF NOT EXISTS review_sentiment_counts ('
+    + 'sentiment INTEGER PRIMARY KEY, reviews INTEGER NOT NULL)',
+    'CREATE TABLE IF NOT EXISTS review_day_counts ('
+    + 'day INTEGER PRIMARY KEY, reviews INTEGER NOT NULL, '
+    + 'rating_tenths_sum INTEGER NOT NULL)',
+    # A full-text index of names and texts that reads them from reviews.
+    'CREATE VIRTUAL TABLE IF NOT EXISTS reviews_search USING fts5('
+    + "reviewer_name, review_text, content='reviews', content_rowid='id', "
+    + "tokenize='unicode61 remove_diacritics 2')",
+)
+# Trigger names and definitions. Spreadsheet imports drop them for the
+# transaction, then recount and reindex in bulk, which is several times
+# faster than firing them for every row.
+_TRIGGERS = MappingProxyType({
+    'reviews_counted': 'AFTER INSERT ON reviews BEGIN {0} END'.format(
+        _COUNT_REVIEW,
+    ),
+    'reviews_uncounted': 'AFTER DELETE ON reviews BEGIN {0} END'.format(
+        _UNCOUNT_REVIEW,
+    ),
+    'reviews_searchable': (
+        'AFTER INSERT ON reviews BEGIN '
+        + 'INSERT INTO reviews_search (rowid, reviewer_name, review_text) '
+        + 'VALUES (NEW.id, NEW.reviewer_name, NEW.review_text); END'
+    ),
+    'reviews_unsearchable': (
+        'AFTER DELETE ON reviews BEGIN INSERT INTO reviews_search '
+        + '(reviews_search, rowid, reviewer_name, review_text) VALUES '
+        + "('delete', OLD.id, OLD.reviewer_name, OLD.review_text); END"
+    ),
+})
+_RECOUNT_STATISTICS = (
+    'DELETE FROM review_rating_counts',
+    'DELETE FROM review_sentiment_counts',
+    'DELETE FROM review_day_counts',
+    'INSERT INTO review_rating_counts '
+    + 'SELECT rating_tenths, COUNT(*) FROM reviews GROUP BY 1',
+    'INSERT INTO review_sentiment_counts '
+    + 'SELECT IFNULL(sentiment, -128), COUNT(*) FROM reviews GROUP BY 1',
+    'INSERT INTO review_day_counts SELECT created_at / 86400000000, '
+    + 'COUNT(*), SUM(rating_tenths) FROM reviews GROUP BY 1',
+)
+_COUNT_STATISTICS = (
+    'SELECT (SELECT IFNULL(SUM(reviews), 0) FROM review_rating_counts), '
+    + '(SELECT COUNT(*) FROM reviews)'
+)
+_COUNT_SEARCHABLE = (
+    'SELECT (SELECT COUNT(*) FROM reviews_search_docsize), '
+    + '(SELECT COUNT(*) FROM reviews)'
+)
+_REINDEX_SEARCH = (
+    "INSERT INTO reviews_search (reviews_search) VALUES ('rebuild')"
+)
+INSERT_REVIEW = (
+    'INSERT INTO reviews (created_at, reviewer_name, rating_tenths, '
+    + 'sentiment, review_text, imported) VALUES (?, ?, ?, ?, ?, ?)'
+)
+
+
+def create_schema(connection: sqlite3.Connection) -> None:
+    """Create the tables, indexes and triggers that do not exist yet."""
+    for statement in _SCHEMA:
+        connection.execute(statement)
+    _create_triggers(connection)
+
+
+def import_spreadsheet(connection: sqlite3.Connection, source: Path) -> None:
+    """Import the spreadsheet unless it is already, then catch up.
+
+    Statistics and the search index are rebuilt if they are behind the
+    reviews. Runs within the write transaction of the caller.
+    """
+    _import_if_changed(connection, source)
+    _recount_statistics(connection)
+    _reindex_search(connection)
+
+
+def _import_if_changed(connection: sqlite3.Connection, source: Path) -> None:
+    fingerprint = SourceFingerprint.quick(source)
+    recorded = connection.execute(
+        'SELECT fingerprint FROM imported_sources WHERE path = ?',
+        (str(source),),
+    ).fetchone()
+    if recorded is not None:
+        recorded_fingerprint = SourceFingerprint.model_validate_json(
+            recorded[0],
+        )
+        if fingerprint.matches(recorded_fingerprint):
+            return
+        fingerprint = fingerprint.with_hash(source)
+        if fingerprint.sha256 == recorded_fingerprint.sha256:
+            return
+    columns = read_review_columns(str(source))
+    columns.report_rejected_rows(str(source))
+    frame = columns.newest_first()
+    frame['created_at'] = (
+        frame['created_at'].astype('int64') // _NANOSECONDS_IN_MICROSECOND
+    )
+    frame['imported'] = True
+    if not fingerprint.sha256:
+        fingerprint = fingerprint.with_hash(source)
+    _replace_imported_rows(
+        connection,
+        frame.astype(object).itertuples(index=False, name=None),
+    )
+    connection.execute(
+        'INSERT OR REPLACE INTO imported_sources VALUES (?, ?)',
+        (str(source), fingerprint.model_dump_json()),
+    )
+    logger.info('Imported %s reviews from %s', len(frame), source)
+
+
+def _replace_imported_rows(
+    connection: sqlite3.Connection,
+    rows: Iterable[tuple],
+) -> None:
+    for trigger_name in _TRIGGERS:
+        connection.execute('DROP TRIGGER {0}'.format(trigger_name))
+    connection.execute('DELETE FROM reviews WHERE imported')
+    connection.executemany(INSERT_REVIEW, rows)
+    _create_triggers(connection)
+    # Edited rows may keep the row count, so the counts cannot tell.
+    _recount_statistics(connection, force=True)
+    connection.execute(_REINDEX_SEARCH)
+
+
+def _create_triggers(connection: sqlite3.Connection) -> None:
+    for trigger_name, definition in _TRIGGERS.items():
+        connection.execute('CREATE TRIGGER IF NOT EXISTS {0} {1}'.format(
+            trigger_name, definition,
+        ))
+
+
+def _recount_statistics(
+    connection: sqlite3.Connection,
+    force: bool = False,
+) -> None:
+    # Imports are not counted by the triggers, and databases created
+    # before the aggregates existed were not counted at all.
+    counted, stored = connection.execute(_COUNT_STATISTICS).fetchone()
+    if counted == stored and not force:
+        return
+    for statement in _RECOUNT_STATISTICS:
+        connection.execute(statement)
+    logger.info('Recounted statistics of %s reviews', stored)
+
+
+def _reindex_search(connection: sqlite3.Connection) -> None:
+    # Databases created before the search index existed lack it.
+    indexed, stored = connection.execute(_COUNT_SEARCHABLE).fetchone()
+    if indexed != stored:
+        connection.execute(_REINDEX_SEARCH)
+        logger.info('Indexed %s reviews for search', stored)
@@ -1,26 +1,38 @@
-from datetime import timezone
-from decimal import Decimal
-from logging import getLogger
-
-import pandas as pd
-import pydantic
-
-from app.interface import enums
+from collections.abc import AsyncIterator
+
+from app.datasources.review_filter_index import ReviewFilterIndex
+from app.datasources.review_index import ReviewTimeIndex
+from app.datasources.review_log import ReviewLog
+from app.datasources.review_search_index import ReviewSearchIndex
+from app.datasources.review_snapshot import ReviewSnapshot
+from app.datasources.review_stats import ReviewAggregates
+from app.datasources.review_store import ColumnarReviewStore
+from app.datasources.review_store import ReviewSegment
+from app.datasources.xlsx_ingestion import read_review_columns
+from app.interface.abstract import AbstractReviewDatasource
+from app.interface.exceptions import InvalidCursorError
+from app.interface.schemas import MultipleReviewsResponse
 from app.interface.schemas import PaginationOptions
 from app.interface.schemas import Review
+from app.interface.schemas import ReviewFilters
+from app.interface.schemas import ReviewStatistics
 
-logger = getLogger('app')
+_EXPORT_CHUNK_SIZE = 1000
 
 
-class MemoryXLSXDatasource:
+class MemoryXLSXDatasource(AbstractReviewDatasource):
     """An in-memory xlsx-file parser and reader singleton.
 
-    Allows adding elements, but won't persist them to disk.
+    Added elements are persisted to a write-ahead log, if one is given.
     """
 
     _instance = None
-    _sorted_review_data: list[Review] = []
-    _datasource_length: int = 0
+    _review_index: ReviewTimeIndex = ReviewTimeIndex()
+    _filter_index: ReviewFilterIndex = ReviewFilterIndex(_review_index)
+    _aggregates: ReviewAggregates = ReviewAggregates()
+    _search_index = ReviewSearchIndex(_review_index.store)
+    _review_log: ReviewLog | None = None
+    _version = 0
 
     def __new__(cls):
         """Return the single instance if created."""
@@ -32,79 +44,170 @@ class MemoryXLSXDatasource:
     # since this would not be the case in reality.
     # Otherwise we would make this code much more modular and generic.
     @classmethod
-    def load_from(cls, xlsx_file_path: str) -> None:
-        """Loads the file and parses the data."""
-        dataframe = pd.read_excel(xlsx_file_path)
-        reviews: list[Review] = []
-        for _, row in dataframe.iterrows():
-            try:
-                reviews.append(cls._parse_row(row))
-            except (pydantic.ValidationError, ValueError, TypeError) as error:
-                logger.debug(
-                    'Failed to parse row % in %: %',
-                    row,
-                    xlsx_file_path,
-                    error,
-                )
-        cls._sorted_review_data = _sort_by_time(reviews)
-        cls._datasource_length = len(reviews)
+    def load_from(
+        cls,
+        xlsx_file_path: str,
+        use_snapshot: bool = True,
+        review_log: ReviewLog | None = None,
+    ) -> None:
+        """Loads the file and validates the data column by column.
+
+        A binary snapshot next to the file is used instead, if it is
+        still up to date, and written after parsing otherwise. Reviews
+        from the log are replayed on top.
+        """
+        snapshot = ReviewSnapshot(xlsx_file_path)
+        segment = snapshot.load() if use_snapshot else None
+        if segment is None:
+            columns = read_review_columns(xlsx_file_path)
+            columns.report_rejected_rows(xlsx_file_path)
+            segment = ReviewSegment.from_columns(columns.newest_first())
+            if use_snapshot:
+                snapshot.write(segment)
+        compacted: ReviewSegment = ReviewSegment()
+        records: list[Review] = []
+        if review_log is not None:
+            compacted, records = review_log.replay()
+        cls._review_index = ReviewTimeIndex(
+            ColumnarReviewStore(segment, compacted),
+        )
+        cls._review_index.insert(*records)
+        cls._filter_index = ReviewFilterIndex(cls._review_index)
+        cls._aggregates = ReviewAggregates()
+        cls._aggregates.add_segment(segment)
+        cls._aggregates.add_segment(compacted)
+        cls._aggregates.add(*records)
+        cls._search_index = ReviewSearchIndex(cls._review_index.store)
+        cls._review_log = review_log
+        cls._version += 1
+
+    @classmethod
+    def start_indexing(cls) -> None:
+        """Build the search index in the background."""
+        cls._search_index.start()
 
     def list_multiple_reviews_with(
         self,
         pagination: PaginationOptions,
-    ) -> list[Review]:
-        """Return a slice of the reviews."""
-        if not self._sorted_review_data:
-            return []
-        if pagination.skip >= self._datasource_length:
-            return []
+        filters: ReviewFilters | None = None,
+    ) -> MultipleReviewsResponse:
+        """Return a slice of the reviews and a cursor to the next one."""
+        if filters is not None and not filters.is_empty():
+            return self._list_filtered(pagination, filters)
+        datasource_length = len(self._review_index)
+        first_index = pagination.skip
+        cursor = pagination.decode_cursor()
+        if cursor is not None:
+            first_index += self._review_index.position_after(cursor)
+        if first_index >= datasource_length:
+            return MultipleReviewsResponse(reviews=[])
         last_index = min(
-            self._datasource_length,
-            pagination.skip + pagination.limit,
+            datasource_length,
+            first_index + pagination.limit,
+        )
+        next_cursor = None
+        if last_index < datasource_length:
+            next_cursor = self._review_index.cursor_at(last_index - 1).encode()
+        return MultipleReviewsResponse(
+            reviews=self._review_index.slice(first_index, last_index),
+            next_cursor=next_cursor,
         )
-        return self._sorted_review_data[pagination.skip:last_index]
-
-    def add_reviews(self, *new_reviews: Review) -> None:
-        """Extend the review list and re-sort it.
-
-        This implementation offers no persistance to disk though.
-        """
-        self._datasource_length += len(new_reviews)
-        self._sorted_review_data.extend(new_reviews)
-        self._sorted_review_data = _sort_by_time(self._sorted_review_data)
 
     @classmethod
-    def _parse_row(cls, row: pd.Series) -> Review:
-        reviewer_name = str(row.iloc[1])
-        created_datetime = row.iloc[0].replace(tzinfo=timezone.utc)
-        rating = Decimal(str(row.iloc[4]))
-        rating = rating.quantize(Decimal('0.1'))
-        sentiment = (
-            enums.SentimentEnum(int(row.iloc[3]))
-            if pd.notna(row.iloc[3])
-            else None
-        )
-        review_text = (
-            str(row.iloc[2])
-            if pd.notna(row.iloc[2])
-            else None
-        )
+    async def close(cls) -> None:
+        """Flush the write-ahead log, if there is one."""
+        if cls._review_log is not None:
+            await cls._review_log.close()
+
+    async def add_reviews(self, *new_reviews: Review) -> None:
+        """Log the reviews, index them and count them in the aggregates."""
+        if self._review_log is not None:
+            await self._review_log.append(*new_reviews)
+        keys = self._review_index.insert(*new_reviews)
+        self._filter_index.insert(keys, new_reviews)
+        self._aggregates.add(*new_reviews)
+        self._search_index.update()
+        type(self)._version += 1  # noqa: WPS437
+
+    def version(self) -> int:
+        """Return the counter bumped on every load and insert."""
+        return self._version
+
+    async def search_reviews(
+        self,
+        query: str,
+        pagination: PaginationOptions,
+    ) -> MultipleReviewsResponse:
+        """Return a page of reviews ranked by the search index.
 
-        return Review(
-            created_at=created_datetime,
-            reviewer_name=reviewer_name,
-            rating=rating,
-            sentiment=sentiment,
-            review_text=review_text,
+        The index is updated by inserts on the event loop, so it is
+        searched there as well, which takes milliseconds.
+        """
+        cursor = pagination.decode_cursor()
+        cursor_row = None
+        if cursor is not None:
+            cursor_row = cursor.identity
+            if cursor_row >= len(self._review_index):
+                raise InvalidCursorError('Cursor points past the last review')
+            if self._review_index.cursor_of(cursor_row) != cursor:
+                raise InvalidCursorError('Cursor does not match the review')
+        # One extra row tells whether there is a next page.
+        rows = self._search_index.search(
+            query, cursor_row, pagination.skip, pagination.limit + 1,
         )
+        return self._page(rows, pagination.limit)
 
+    async def export_reviews(
+        self,
+        filters: ReviewFilters,
+    ) -> AsyncIterator[list[Review]]:
+        """Walk the indexes by cursor, skipping rows added meanwhile.
 
-def _sort_by_time(
-    multiple_reviews: list[Review],
-    reverse: bool = True,
-) -> list[Review]:
-    return sorted(
-        multiple_reviews,
-        key=lambda rv: rv.created_at,
-        reverse=reverse,
-    )
+        Stored rows never change, so the rows below the count taken at
+        the start are the snapshot. Indexes are only read between
+        chunks, when no insert is running.
+        """
+        stop_row = len(self._review_index)
+        cursor = None
+        while True:
+            rows = self._filter_index.find(
+                filters, cursor, 0, _EXPORT_CHUNK_SIZE,
+            )
+            yield [
+                self._review_index.store.materialize(row)
+                for row in rows
+                if row < stop_row
+            ]
+            if len(rows) < _EXPORT_CHUNK_SIZE:
+                return
+            cursor = self._review_index.cursor_of(rows[-1])
+
+    def get_statistics(self) -> ReviewStatistics:
+        """Return the aggregates kept up to date on every insert."""
+        return self._aggregates.summary()
+
+    def _list_filtered(
+        self,
+        pagination: PaginationOptions,
+        filters: ReviewFilters,
+    ) -> MultipleReviewsResponse:
+        # One extra row tells whether there is a next page.
+        rows = self._filter_index.find(
+            filters,
+            pagination.decode_cursor(),
+            pagination.skip,
+            pagination.limit + 1,
+        )
+        return self._page(rows, pagination.limit)
+
+    def _page(self, rows: list[int], limit: int) -> MultipleReviewsResponse:
+        page_rows = rows[:limit]
+        next_cursor = None
+        if len(rows) > limit:
+            next_cursor = self._review_index.cursor_of(page_rows[-1]).encode()
+        return MultipleReviewsResponse(
+            reviews=[
+                self._review_index.store.materialize(row) for row in page_rows
+            ],
+            next_cursor=next_cursor,
+        )
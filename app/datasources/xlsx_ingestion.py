@@ -0,0 +1,122 @@
+from dataclasses import dataclass
+from dataclasses import field
+
+import pandas as pd
+
+from app.initializers.logger import get_logger
+from app.interface import enums
+from app.interface.schemas import MAX_NAME_LENGTH
+from app.interface.schemas import MAX_REVIEW_LENGTH
+
+logger = get_logger()
+
+# A header row, and spreadsheets count rows from one.
+_SHEET_ROW_OFFSET = 2
+_MIN_RATING = 1
+_MAX_RATING = 5
+_RATING_SCALE = 10
+_SENTIMENT_VALUES = tuple(enums.SentimentEnum)
+
+
+@dataclass(frozen=True)
+class ReviewColumns:
+    """Validated review columns, one row per accepted spreadsheet row.
+
+    Timestamps are in UTC, ratings are integer tenths and missing values
+    are None.
+    """
+
+    frame: pd.DataFrame
+    rejected_rows: dict[str, list[int]] = field(default_factory=dict)
+
+    def __len__(self) -> int:
+        """Return the amount of accepted rows."""
+        return len(self.frame)
+
+    def newest_first(self) -> pd.DataFrame:
+        """Return the rows sorted by creation time, keeping ties in order."""
+        return self.frame.sort_values(
+            'created_at',
+            ascending=False,
+            kind='stable',
+        )
+
+    def report_rejected_rows(self, source: str) -> None:
+        """Log the rejected row numbers in bulk, once per invalid field."""
+        for reason, row_numbers in self.rejected_rows.items():
+            logger.warning(
+                'Skipped %s rows in %s with invalid %s: %s',
+                len(row_numbers),
+                source,
+                reason,
+                row_numbers,
+            )
+
+
+def read_review_columns(xlsx_file_path: str) -> ReviewColumns:
+    """Read the review sheet and validate it column by column."""
+    coerced = _coerce_columns(pd.read_excel(xlsx_file_path))
+    failures = _find_failures(coerced)
+    rejected = pd.concat(failures.values(), axis='columns').any(axis='columns')
+    return ReviewColumns(
+        frame=_finalize_columns(coerced[~rejected]),
+        rejected_rows={
+            reason: (failed.index[failed] + _SHEET_ROW_OFFSET).tolist()
+            for reason, failed in failures.items()
+            if failed.any()
+        },
+    )
+
+
+def _coerce_columns(dataframe: pd.DataFrame) -> pd.DataFrame:
+    return pd.DataFrame({
+        'created_at': _coerce_timestamps(dataframe.iloc[:, 0]),
+        'reviewer_name': _coerce_strings(dataframe.iloc[:, 1]),
+        'review_text': _coerce_strings(dataframe.iloc[:, 2]),
+        'raw_sentiment': dataframe.iloc[:, 3],
+        'sentiment': pd.to_numeric(dataframe.iloc[:, 3], errors='coerce'),
+        'rating': pd.to_numeric(dataframe.iloc[:, 4], errors='coerce'),
+    })
+
+
+def _coerce_timestamps(raw_timestamps: pd.Series) -> pd.Series:
+    timestamps = pd.to_datetime(raw_timestamps, errors='coerce')
+    if timestamps.dt.tz is None:
+        return timestamps.dt.tz_localize('UTC')
+    return timestamps.dt.tz_convert('UTC')
+
+
+def _coerce_strings(raw_strings: pd.Series) -> pd.Series:
+    return raw_strings.astype(str).where(raw_strings.notna())
+
+
+def _find_failures(coerced: pd.DataFrame) -> dict[str, pd.Series]:
+    text_lengths = coerced['review_text'].str.len()
+    known_sentiments = coerced['sentiment'].where(
+        coerced['raw_sentiment'].notna(),
+        enums.SentimentEnum.neutral,
+    )
+    return {
+        'created_at': coerced['created_at'].isna(),
+        'reviewer_name': ~coerced['reviewer_name'].str.len().between(
+            1, MAX_NAME_LENGTH,
+        ),
+        'review_text': ~text_lengths.fillna(1).between(1, MAX_REVIEW_LENGTH),
+        'sentiment': ~known_sentiments.isin(_SENTIMENT_VALUES),
+        'rating': ~coerced['rating'].round(1).between(_MIN_RATING, _MAX_RATING),
+    }
+
+
+def _finalize_columns(accepted: pd.DataFrame) -> pd.DataFrame:
+    rating_tenths = accepted['rating'] * _RATING_SCALE
+    sentiments = accepted['sentiment'].astype('Int8')
+    return pd.DataFrame({
+        'created_at': accepted['created_at'],
+        'reviewer_name': accepted['reviewer_name'],
+        'rating_tenths': rating_tenths.round().astype(int),
+        'sentiment': sentiments.astype(object).where(sentiments.notna(), None),
+        'review_text': accepted['review_text'].where(
+            accepted['review_text'].notna(),
+            None,
+        ),
+    })
@@ -0,0 +1,25 @@
+from app.datasources import JustEatDataSource
+from app.datasources.justeat_http import JustEatHTTPEngine
+from app.initializers.logger import get_logger
+from app.settings import get_settings
+
+settings = get_settings()
+logger = get_logger()
+
+
+async def open_http_engine():
+    """Read the first reviews over HTTP, unless disabled."""
+    if not settings.scrape_over_http:
+        logger.info('Scraping over HTTP is disabled.')
+        return
+    JustEatDataSource.use_http_engine(
+        JustEatHTTPEngine(max_connections=settings.scrape_http_connections),
+    )
+    logger.info('Opened the HTTP scraping engine.')
+
+
+async def close_http_engine():
+    """Close the connections of the HTTP scraping engine."""
+    if JustEatDataSource.http_engine is not None:
+        await JustEatDataSource.http_engine.aclose()
+        JustEatDataSource.use_http_engine(None)
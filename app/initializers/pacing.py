@@ -0,0 +1,159 @@
+import asyncio
+import random
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import NamedTuple
+from urllib.parse import urlsplit
+
+from cachetools import LRUCache
+
+from app.initializers.logger import get_logger
+from app.interface.enums import PacingMode
+from app.settings import get_settings
+
+settings = get_settings()
+logger = get_logger()
+
+_MAX_HOSTS = 100
+# Spread of the humanizing pauses around their scaled length.
+DEFAULT_JITTER = (0.75, 1.25)
+# The host the actions of the running scrape are paced for.
+_current_host: ContextVar[str] = ContextVar('_current_host', default='')
+
+
+class PacingPolicy(NamedTuple):
+    """How fast scrapes act, in pauses per second and delay scales."""
+
+    mode: PacingMode = PacingMode.adaptive
+    global_rate: float = 4
+    global_burst: int = 20
+    host_rate: float = 2
+    host_burst: int = 10
+    min_scale: float = 0.75
+    max_scale: float = 4
+    backoff_factor: float = 1.5
+    speedup_factor: float = 0.9
+
+
+class TokenBucket:
+    """Lets actions through at a steady rate, after an initial burst."""
+
+    def __init__(self, rate: float, burst: int):
+        """Start with a full bucket."""
+        self.rate = rate
+        self.burst = burst
+        self._tokens: float = burst
+        self._updated_at = time.monotonic()
+
+    def reserve(self) -> float:
+        """Take a token and return the seconds until it is due.
+
+        Tokens taken from an empty bucket are owed, so concurrent takers
+        are let through one after another, in the order they came.
+        """
+        now = time.monotonic()
+        refill = (now - self._updated_at) * self.rate
+        self._tokens = min(self.burst, self._tokens + refill) - 1
+        self._updated_at = now
+        return max(0, -self._tokens / self.rate)
+
+
+class _HostPace:
+    """The token bucket of a host and how much its delays are scaled."""
+
+    def __init__(self, bucket: TokenBucket):
+        """Start at the nominal delays."""
+        self.bucket = bucket
+        self.scale: float = 1
+
+
+class Pacer:
+    """Paces the browser actions of all scrapes.
+
+    Every pause takes a token from a global bucket and from the bucket
+    of the host scraped, so bursts of scrapes queue up instead of
+    flooding the site. The humanizing delay of a pause is scaled per
+    host, backing off on anomalies and speeding up on success, and
+    waiting for a token counts towards it. In the zero mode, pauses
+    return at once.
+    """
+
+    def __init__(self, policy: PacingPolicy):
+        """Start with full buckets and nominal delays."""
+        if policy.min_scale <= 0 or policy.min_scale > policy.max_scale:
+            raise ValueError('Pacing needs 0 < min_scale <= max_scale')
+        self.policy = policy
+        self._global_bucket = TokenBucket(
+            policy.global_rate, policy.global_burst,
+        )
+        self._hosts: LRUCache[str, _HostPace] = LRUCache(maxsize=_MAX_HOSTS)
+
+    @contextmanager
+    def for_host(self, url: str) -> Iterator[None]:
+        """Pace the actions within as actions on the host of the URL."""
+        host_token = _current_host.set(urlsplit(url).netloc)
+        try:
+            yield
+        finally:
+            _current_host.reset(host_token)
+
+    async def pause(
+        self,
+        seconds: float,
+        jitter: tuple[float, float] = DEFAULT_JITTER,
+    ) -> None:
+        """Pause for a scaled and jittered delay, or until a token is due."""
+        if self.policy.mode == PacingMode.zero:
+            return
+        host_pace = self._host_pace()
+        token_wait = max(
+            self._global_bucket.reserve(), host_pace.bucket.reserve(),
+        )
+        multiplier = random.uniform(*jitter)  # noqa: S311
+        delay = max(token_wait, seconds * host_pace.scale * multiplier)
+        logger.debug('Pausing for %.2f seconds', delay)
+        await asyncio.sleep(delay)
+
+    def record_success(self) -> None:
+        """Shorten the delays of the host, down to the minimum scale."""
+        host_pace = self._host_pace()
+        host_pace.scale = max(
+            self.policy.min_scale,
+            host_pace.scale * self.policy.speedup_factor,
+        )
+
+    def record_anomaly(self) -> None:
+        """Lengthen the delays of the host, up to the maximum scale."""
+        host_pace = self._host_pace()
+        host_pace.scale = min(
+            self.policy.max_scale,
+            host_pace.scale * self.policy.backoff_factor,
+        )
+        logger.info(
+            'Pacing %s at %.2f times the delays',
+            _current_host.get() or 'unknown host',
+            host_pace.scale,
+        )
+
+    def _host_pace(self) -> _HostPace:
+        host = _current_host.get()
+        host_pace = self._hosts.get(host)
+        if host_pace is None:
+            host_pace = _HostPace(TokenBucket(
+                self.policy.host_rate, self.policy.host_burst,
+            ))
+            self._hosts[host] = host_pace
+        return host_pace
+
+
+PACER = Pacer(PacingPolicy(
+    mode=settings.pacing_mode,
+    global_rate=settings.pacing_global_rate,
+    global_burst=settings.pacing_global_burst,
+    host_rate=settings.pacing_host_rate,
+    host_burst=settings.pacing_host_burst,
+    min_scale=settings.pacing_min_scale,
+    max_scale=settings.pacing_max_scale,
+))
@@ -0,0 +1,31 @@
+from app.datasources.prescrape import PrescrapePlan
+from app.datasources.prescrape import PrescrapeScheduler
+from app.initializers.logger import get_logger
+from app.settings import get_settings
+
+settings = get_settings()
+logger = get_logger()
+
+SCHEDULER = PrescrapeScheduler(PrescrapePlan(
+    restaurant_slugs=tuple(settings.prescrape_slugs),
+    popular_count=settings.prescrape_popular,
+    review_count=settings.prescrape_reviews,
+    max_review_count=settings.prescrape_max_reviews,
+    lead_seconds=settings.prescrape_lead,
+    interval_seconds=settings.prescrape_interval,
+    concurrency=settings.prescrape_concurrency,
+))
+
+
+async def start_prescraping():
+    """Keep the reviews of hot restaurants scraped in the background."""
+    if not settings.prescrape_slugs and not settings.prescrape_popular:
+        logger.info('Pre-scraping is disabled.')
+        return
+    SCHEDULER.start()
+    logger.info('Started pre-scraping hot restaurants.')
+
+
+async def stop_prescraping():
+    """Stop pre-scraping hot restaurants."""
+    await SCHEDULER.stop()
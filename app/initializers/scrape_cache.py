@@ -0,0 +1,23 @@
+from app.datasources import JustEatDataSource
+from app.datasources.scrape_cache import MemoryScrapeCache
+from app.datasources.scrape_cache import SQLiteScrapeCache
+from app.initializers.logger import get_logger
+from app.interface.enums import ScrapeCacheBackend
+from app.settings import get_settings
+
+settings = get_settings()
+logger = get_logger()
+
+
+async def open_scrape_cache():
+    """Share scraped reviews through the configured cache."""
+    if settings.scrape_cache_backend == ScrapeCacheBackend.sqlite:
+        scrape_cache = SQLiteScrapeCache(settings.scrape_cache_path)
+    else:
+        scrape_cache = MemoryScrapeCache()
+    JustEatDataSource.use_scrape_cache(
+        scrape_cache, settings.scrape_cache_ttl,
+    )
+    logger.info(
+        'Opened the %s scrape cache.', settings.scrape_cache_backend.value,
+    )
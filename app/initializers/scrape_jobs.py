@@ -0,0 +1,22 @@
+from app.datasources.scrape_jobs import ScrapeJobQueue
+from app.initializers.logger import get_logger
+from app.settings import get_settings
+
+settings = get_settings()
+logger = get_logger()
+
+SCRAPE_JOBS = ScrapeJobQueue(
+    workers=settings.selenium_max_drivers,
+    max_queued=settings.scrape_job_queue_size,
+)
+
+
+async def start_scrape_jobs():
+    """Start the workers running scrape jobs."""
+    SCRAPE_JOBS.start()
+    logger.info('Started %d scrape job workers.', SCRAPE_JOBS.workers)
+
+
+async def stop_scrape_jobs():
+    """Stop the workers, cancelling the jobs they run."""
+    await SCRAPE_JOBS.stop()
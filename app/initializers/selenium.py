@@ -1,81 +1,337 @@
 import asyncio
+import functools
+import time
+from collections import Counter
+from collections import deque
 from collections.abc import AsyncGenerator
+from collections.abc import Awaitable
+from collections.abc import Callable
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager
+from contextlib import contextmanager
+from typing import NamedTuple
+from typing import ParamSpec
+from typing import TypeVar
 
+from selenium.common.exceptions import WebDriverException
 from selenium.webdriver import Remote
 from selenium.webdriver.chrome.options import Options
+from urllib3.exceptions import HTTPError
 
 from app.initializers.logger import get_logger
+from app.interface import schemas
 from app.settings import get_settings
 
 settings = get_settings()
 logger = get_logger()
 
+_CallArguments = ParamSpec('_CallArguments')
+_CallReturn = TypeVar('_CallReturn')
+
+_DEFAULT_MAX_USES = 50
+_DEFAULT_MAX_AGE_SECONDS = 1800
+_DEFAULT_IDLE_TIMEOUT_SECONDS = 300
+_MAINTENANCE_INTERVAL_SECONDS = 30
+# A dead session fails with a WebDriver error, a dead server with an
+# HTTP one.
+_SESSION_ERRORS = (WebDriverException, HTTPError)
+_CALL_THREADS = 'webdriver'
+_HOUSEKEEPING_THREADS = 'webdriver-housekeeping'
+
+
+class SessionLifetime(NamedTuple):
+    """When sessions are replaced, in uses and seconds, or closed."""
+
+    max_uses: int = _DEFAULT_MAX_USES
+    max_age: float = _DEFAULT_MAX_AGE_SECONDS
+    idle_timeout: float = _DEFAULT_IDLE_TIMEOUT_SECONDS
+
+
+_DEFAULT_LIFETIME = SessionLifetime()
+
+
+class _PooledDriver:
+    """A WebDriver session and how much it has been used."""
+
+    def __init__(self, driver: Remote):
+        """Start counting from the creation of the session."""
+        self.driver = driver
+        self.created_at = time.monotonic()
+        self.returned_at = self.created_at
+        self.uses = 0
+
 
 class WebDriverPool:
-    """A pool of WebDriver instances."""
+    """An elastic pool of WebDriver sessions.
 
-    def __init__(self, max_drivers: int = 1):
-        """Initialize the semaphore and containers, btu not the drivers."""
+    Between the minimum and the maximum size, sessions are opened on
+    demand and idle ones beyond the minimum are closed. A session is
+    checked before it is handed out, and replaced after a number of uses
+    or an age, since browsers slow down and leak over many page loads.
+    WebDriver calls block on HTTP round trips to Selenium, so they run
+    on threads of the pool, one per session, and never on the event loop.
+    Opening, checking, resetting and quitting sessions has threads of its
+    own, so that scrapes never queue behind it.
+    """
+
+    def __init__(
+        self,
+        min_drivers: int = 1,
+        max_drivers: int = 1,
+        lifetime: SessionLifetime = _DEFAULT_LIFETIME,
+    ):
+        """Initialize the semaphore and containers, but not the drivers."""
+        self.min_drivers = min(min_drivers, max_drivers)
         self.max_drivers = max_drivers
-        self.drivers: list[Remote] = []
-        self.semaphore = asyncio.Semaphore(max_drivers)
-        self.selenium_url = 'http://{host}:{port}/wd/hub'.format(
-            host=settings.selenium_host,
-            port=settings.selenium_port,
-        )
+        self.lifetime = lifetime
+        # Created on first use, so that the pool works again after close.
+        self._executors: dict[str, ThreadPoolExecutor] = {}
+        # Recently returned sessions are on the right, stale on the left.
+        self._idle: deque[_PooledDriver] = deque()
+        self._semaphore = asyncio.Semaphore(max_drivers)
+        self._counts: Counter[str] = Counter()
+        self._total_wait: float = 0
+        self._longest_wait: float = 0
+        self._maintenance: asyncio.Task[None] | None = None
 
     @asynccontextmanager
     async def get_driver(self) -> AsyncGenerator[Remote, None]:
         """Get a context manager for the WebDriver."""
-        async with self.semaphore:
-            driver = await self._get_or_create_driver()
+        waiting_since = time.monotonic()
+        async with self._semaphore:
+            self._count_wait(time.monotonic() - waiting_since)
+            with self._taking():
+                pooled = await self._check_out()
+                try:
+                    yield pooled.driver
+                finally:
+                    await self._check_in(pooled)
+
+    async def run(
+        self,
+        blocking_call: Callable[_CallArguments, _CallReturn],
+        *args: _CallArguments.args,
+        **kwargs: _CallArguments.kwargs,
+    ) -> _CallReturn:
+        """Run a blocking WebDriver call on a thread of the pool."""
+        return await asyncio.get_running_loop().run_in_executor(
+            self._executor(_CALL_THREADS),
+            functools.partial(blocking_call, *args, **kwargs),
+        )
+
+    async def start(self) -> None:
+        """Open the minimum of sessions at once and keep it up."""
+        await self._fill_to_minimum()
+        self._maintenance = asyncio.create_task(self._maintain())
+
+    async def close(self) -> None:
+        """Stop the maintenance and quit every idle session."""
+        if self._maintenance is not None:
+            self._maintenance.cancel()
+            self._maintenance = None
+        await asyncio.gather(*map(self._quit, self._idle))
+        self._idle.clear()
+        for executor in self._executors.values():
+            executor.shutdown()
+        self._executors.clear()
+
+    def spare_sessions(self) -> int:
+        """Return how many sessions can be had without waiting for one."""
+        if self._semaphore.locked():
+            return 0
+        return self.max_drivers - self._counts['taken']
+
+    def statistics(self) -> schemas.DriverPoolStatistics:
+        """Return how busy the pool has been, for capacity planning."""
+        checkouts = self._counts['checkouts']
+        return schemas.DriverPoolStatistics(
+            min_drivers=self.min_drivers,
+            max_drivers=self.max_drivers,
+            in_use=self._counts['in_use'],
+            idle=len(self._idle),
+            checkouts=checkouts,
+            created=self._counts['created'],
+            recycled=self._counts['recycled'],
+            evicted=self._counts['evicted'],
+            failed_checks=self._counts['failed_checks'],
+            mean_wait_seconds=self._total_wait / max(checkouts, 1),
+            max_wait_seconds=self._longest_wait,
+        )
+
+    @contextmanager
+    def _taking(self) -> Iterator[None]:
+        # Counts the permit from the start, while a session is opened.
+        self._counts['taken'] += 1
+        try:
+            yield
+        finally:
+            self._counts['taken'] -= 1
+
+    async def _check_out(self) -> _PooledDriver:
+        while self._idle:
+            pooled = self._idle.pop()
+            if self._is_worn_out(pooled):
+                self._counts['recycled'] += 1
+            elif await self._housekeep(_is_alive, pooled.driver):
+                self._counts['in_use'] += 1
+                return pooled
+            else:
+                self._counts['failed_checks'] += 1
+            await self._quit(pooled)
+        pooled = await self._open()
+        self._counts['in_use'] += 1
+        return pooled
+
+    async def _check_in(self, pooled: _PooledDriver) -> None:
+        self._counts['in_use'] -= 1
+        pooled.uses += 1
+        if self._is_worn_out(pooled):
+            self._counts['recycled'] += 1
+            await self._quit(pooled)
+            return
+        try:
+            # The next user should not find the state of the last page.
+            await self._housekeep(pooled.driver.get, 'about:blank')
+        except _SESSION_ERRORS:
+            self._counts['failed_checks'] += 1
+            await self._quit(pooled)
+            return
+        pooled.returned_at = time.monotonic()
+        self._idle.append(pooled)
+
+    async def _open(self) -> _PooledDriver:
+        driver = await self._housekeep(
+            functools.partial(
+                Remote,
+                command_executor=_selenium_url(),
+                options=_setup_options(),
+            ),
+        )
+        self._counts['created'] += 1
+        return _PooledDriver(driver)
+
+    async def _quit(self, pooled: _PooledDriver) -> None:
+        try:
+            await self._housekeep(pooled.driver.quit)
+        except _SESSION_ERRORS as error:
+            logger.warning('WebDriver session did not quit: %s', error)
+
+    async def _maintain(self) -> None:
+        while True:  # noqa: WPS457
+            await asyncio.sleep(_MAINTENANCE_INTERVAL_SECONDS)
+            await self._evict_idle()
             try:
-                yield driver
-            finally:
-                await self._return_driver(driver)
+                await self._fill_to_minimum()
+            except _SESSION_ERRORS as error:
+                logger.warning('WebDriver pool maintenance failed: %s', error)
+
+    async def _evict_idle(self) -> None:
+        idle_since = time.monotonic() - self.lifetime.idle_timeout
+        while self._idle and self._idle[0].returned_at < idle_since:
+            if self._counts['in_use'] + len(self._idle) <= self.min_drivers:
+                return
+            self._counts['evicted'] += 1
+            await self._quit(self._idle.popleft())
+
+    async def _fill_to_minimum(self) -> None:
+        missing = self.min_drivers - self._counts['in_use'] - len(self._idle)
+        openings = [self._open() for _ in range(missing)]
+        now = time.monotonic()
+        for pooled in await asyncio.gather(*openings):
+            pooled.returned_at = now
+            self._idle.appendleft(pooled)
 
-    async def _get_or_create_driver(self) -> Remote:
-        if not self.drivers:
-            return await self._create_driver()
-        return self.drivers.pop()
+    async def _housekeep(
+        self,
+        blocking_call: Callable[..., _CallReturn],
+        *args: object,
+    ) -> _CallReturn:
+        return await asyncio.get_running_loop().run_in_executor(
+            self._executor(_HOUSEKEEPING_THREADS),
+            functools.partial(blocking_call, *args),
+        )
+
+    def _executor(self, thread_name_prefix: str) -> ThreadPoolExecutor:
+        executor = self._executors.get(thread_name_prefix)
+        if executor is None:
+            executor = ThreadPoolExecutor(
+                max_workers=self.max_drivers,
+                thread_name_prefix=thread_name_prefix,
+            )
+            self._executors[thread_name_prefix] = executor
+        return executor
+
+    def _is_worn_out(self, pooled: _PooledDriver) -> bool:
+        if pooled.uses >= self.lifetime.max_uses:
+            return True
+        return time.monotonic() - pooled.created_at >= self.lifetime.max_age
 
-    async def _create_driver(self) -> Remote:
-        options = self._setup_options()
-        return Remote(command_executor=self.selenium_url, options=options)
+    def _count_wait(self, wait_seconds: float) -> None:
+        self._counts['checkouts'] += 1
+        self._total_wait += wait_seconds
+        self._longest_wait = max(self._longest_wait, wait_seconds)
 
-    async def _return_driver(self, driver: Remote) -> None:
-        if len(self.drivers) < self.max_drivers:
-            self.drivers.append(driver)
-        else:
-            driver.quit()
 
-    def _setup_options(self) -> Options:
-        options = Options()
-        options.add_argument('--no-sandbox')
-        options.add_argument('--disable-dev-shm-usage')
-        options.add_argument('--window-size=1280,1024')
-        options.add_argument('--disable-gpu')
-        options.add_argument('--remote-debugging-port=9222')
-        options.add_argument('--disable-extensions')
-        options.add_argument('--disable-setuid-sandbox')
-        return options
+DRIVER_POOL = WebDriverPool(
+    min_drivers=settings.selenium_min_drivers,
+    max_drivers=settings.selenium_max_drivers,
+    lifetime=SessionLifetime(
+        max_uses=settings.selenium_driver_max_uses,
+        max_age=settings.selenium_driver_max_age,
+        idle_timeout=settings.selenium_driver_idle_timeout,
+    ),
+)
 
 
-DRIVER_POOL = WebDriverPool()
+def run_in_driver_thread(
+    blocking_call: Callable[_CallArguments, _CallReturn],
+) -> Callable[_CallArguments, Awaitable[_CallReturn]]:
+    """Turn a blocking WebDriver function into one awaited off the loop."""
+    @functools.wraps(blocking_call)
+    async def wrapper(
+        *args: _CallArguments.args,
+        **kwargs: _CallArguments.kwargs,
+    ) -> _CallReturn:
+        return await DRIVER_POOL.run(blocking_call, *args, **kwargs)
+    return wrapper
 
 
 async def initialize_driver_pool() -> None:
     """Initialize the WebDriver pool."""
     logger.info('Initializing WebDriver pool')
-    # Create the first WebDriver instance
-    async with DRIVER_POOL.get_driver():
-        logger.debug('WebDriver pool initialized')
+    await DRIVER_POOL.start()
+    logger.debug('WebDriver pool initialized')
 
 
 async def shutdown_driver_pool() -> None:
     """Shutdown the WebDriver pool."""
     logger.info('Shutting down WebDriver pool')
-    for driver in DRIVER_POOL.drivers:
-        driver.quit()
-    DRIVER_POOL.drivers.clear()
+    await DRIVER_POOL.close()
+
+
+def _is_alive(driver: Remote) -> bool:
+    # A live session has at least one window, and a dead one raises.
+    try:
+        return bool(driver.window_handles)
+    except _SESSION_ERRORS:
+        return False
+
+
+def _selenium_url() -> str:
+    return 'http://{host}:{port}/wd/hub'.format(
+        host=settings.selenium_host,
+        port=settings.selenium_port,
+    )
+
+
+def _setup_options() -> Options:
+    options = Options()
+    options.add_argument('--no-sandbox')
+    options.add_argument('--disable-dev-shm-usage')
+    options.add_argument('--window-size=1280,1024')
+    options.add_argument('--disable-gpu')
+    options.add_argument('--remote-debugging-port=9222')
+    options.add_argument('--disable-extensions')
+    options.add_argument('--disable-setuid-sandbox')
+    return options
@@ -1,5 +1,8 @@
 from app.datasources import MemoryXLSXDatasource
+from app.datasources import SQLiteReviewDatasource
+from app.datasources.review_log import ReviewLog
 from app.initializers.logger import get_logger
+from app.interface.enums import ReviewBackend
 from app.settings import get_settings
 
 settings = get_settings()
@@ -8,5 +11,29 @@ logger = get_logger()
 
 async def load_xlsx_datasource():
     """An async wrapper for an excel sheet loader."""
-    MemoryXLSXDatasource.load_from(settings.reviews_xlsx_path)
+    if settings.reviews_backend == ReviewBackend.sqlite:
+        SQLiteReviewDatasource.load_from(
+            settings.reviews_xlsx_path,
+            settings.reviews_sqlite_path,
+        )
+        logger.info('Loaded the XLSX datasource into SQLite.')
+        return
+    review_log = ReviewLog(
+        settings.reviews_log_path,
+        durability=settings.reviews_log_durability,
+        compaction_bytes=settings.reviews_log_compaction_bytes,
+    )
+    MemoryXLSXDatasource.load_from(
+        settings.reviews_xlsx_path,
+        use_snapshot=settings.reviews_snapshot,
+        review_log=review_log,
+    )
+    review_log.start()
+    MemoryXLSXDatasource.start_indexing()
     logger.info('Loaded the XLSX datasource.')
+
+
+async def close_xlsx_datasource():
+    """Flush the reviews added since startup to disk."""
+    await MemoryXLSXDatasource.close()
+    logger.info('Closed the XLSX datasource.')
@@ -1,5 +1,7 @@
 from abc import ABC
 from abc import abstractmethod
+from collections.abc import AsyncIterator
+from collections.abc import Hashable
 
 from selenium.webdriver.remote.webdriver import WebDriver
 
@@ -16,5 +18,87 @@ class AbstractReviewScrapingStrategy(ABC):
         """Perform actions for a page to load more reviews."""
 
     @abstractmethod
-    def parse_reviews(self, driver: WebDriver) -> list[schemas.Review]:
-        """Extract reviews from the current page."""
+    def parse_reviews(
+        self,
+        driver: WebDriver,
+        first_card: int = 0,
+    ) -> list[schemas.Review]:
+        """Extract reviews from the cards of the page, from the first on."""
+
+
+class AbstractReviewDatasource(ABC):
+    """Common interface for stored review backends."""
+
+    @abstractmethod
+    def list_multiple_reviews_with(
+        self,
+        pagination: schemas.PaginationOptions,
+        filters: schemas.ReviewFilters | None = None,
+    ) -> schemas.MultipleReviewsResponse:
+        """Return a page of matching reviews and a cursor to the next one."""
+
+    @abstractmethod
+    async def search_reviews(
+        self,
+        query: str,
+        pagination: schemas.PaginationOptions,
+    ) -> schemas.MultipleReviewsResponse:
+        """Return a page of reviews matching the query, best first.
+
+        Searches that take long run off the event loop.
+        """
+
+    @abstractmethod
+    def version(self) -> Hashable:
+        """Return a value that changes whenever the stored reviews do."""
+
+    @abstractmethod
+    def export_reviews(
+        self,
+        filters: schemas.ReviewFilters,
+    ) -> AsyncIterator[list[schemas.Review]]:
+        """Yield the matching reviews newest first, a chunk at a time.
+
+        The chunks come from the reviews stored when the export started,
+        however many are added meanwhile.
+        """
+
+    @abstractmethod
+    async def add_reviews(self, *new_reviews: schemas.Review) -> None:
+        """Store the reviews so that subsequent reads include them."""
+
+    @abstractmethod
+    def get_statistics(self) -> schemas.ReviewStatistics:
+        """Return aggregates over every stored review."""
+
+
+class AbstractScrapeCache(ABC):
+    """Common interface for caches of scraped reviews.
+
+    Implementations may share the reviews between workers and keep
+    them across restarts.
+    """
+
+    @abstractmethod
+    async def get(
+        self,
+        restaurant_slug: str,
+        known: schemas.ScrapedReviews | None = None,
+    ) -> schemas.ScrapedReviews | None:
+        """Return the cached reviews, if newer or more than the known ones."""
+
+    @abstractmethod
+    async def put(
+        self,
+        restaurant_slug: str,
+        scraped: schemas.ScrapedReviews,
+    ) -> None:
+        """Cache the reviews, unless newer or more are cached already."""
+
+    @abstractmethod
+    async def claim_refresh(
+        self,
+        restaurant_slug: str,
+        lease_seconds: float,
+    ) -> bool:
+        """Tell whether the caller is the only one refreshing the reviews."""
@@ -1,3 +1,4 @@
+from enum import Enum
 from enum import IntEnum
 
 
@@ -8,3 +9,49 @@ class SentimentEnum(IntEnum):
     positive = 1
     neutral = 0
     negative = -1
+
+
+class DurabilityMode(Enum):
+    """When an accepted review is considered written to disk."""
+    per_request = 'per_request'
+    batched = 'batched'
+    asynchronous = 'async'
+
+
+class ExportFormat(Enum):
+    """How exported reviews are encoded."""
+    ndjson = 'ndjson'
+    csv = 'csv'
+
+
+class StreamFormat(Enum):
+    """How reviews are encoded as they are streamed, export formats too."""
+    ndjson = 'ndjson'
+    csv = 'csv'
+    sse = 'sse'
+
+
+class PacingMode(Enum):
+    """Whether scrapes pause between their browser actions."""
+    adaptive = 'adaptive'
+    zero = 'zero'
+
+
+class ReviewBackend(Enum):
+    """Where stored reviews are kept."""
+    memory = 'memory'
+    sqlite = 'sqlite'
+
+
+class ScrapeCacheBackend(Enum):
+    """Where scraped reviews are cached."""
+    memory = 'memory'
+    sqlite = 'sqlite'
+
+
+class ScrapeJobStatus(Enum):
+    """Where a scrape job is in its life."""
+    queued = 'queued'
+    running = 'running'
+    done = 'done'
+    failed = 'failed'
@@ -12,3 +12,23 @@ class UnsupportedPageStructureError(ReviewScraperError):
 
 class ScraperNotInitializedError(ReviewScraperError):
     """Raised when the scraper is not initialized."""
+
+
+class ReviewsNotCachedError(ReviewScraperError):
+    """Raised when no reviews of a restaurant have been scraped yet."""
+
+
+class ScrapeJobNotFoundError(LookupError):
+    """Raised when a scrape job is unknown or expired."""
+
+
+class ScrapeQueueFullError(RuntimeError):
+    """Raised when too many scrape jobs are waiting already."""
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor cannot be resolved."""
+
+
+class SearchIndexNotReadyError(RuntimeError):
+    """Raised when searching before the search index is built."""
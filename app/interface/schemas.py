@@ -1,4 +1,6 @@
+import base64
 import textwrap
+from datetime import date
 from datetime import datetime
 from datetime import timezone
 from decimal import Decimal
@@ -12,11 +14,14 @@ from pydantic import model_validator
 from pydantic import ValidationInfo
 from typing_extensions import Self
 
+from app.interface.enums import ScrapeJobStatus
 from app.interface.enums import SentimentEnum
+from app.interface.exceptions import InvalidCursorError
 
 
-_MAX_REVIEW_LENGTH = 500
-_MAX_NAME_LENGTH = 100
+MAX_REVIEW_LENGTH = 500
+MAX_NAME_LENGTH = 100
+_CURSOR_SEPARATOR = '|'
 _constrained_review_decimal = Field(
     title='Rating as a decimal',
     description='A single decimal place number between 1.0 and 5.0.',
@@ -27,11 +32,11 @@ _constrained_review_decimal = Field(
 )
 _contrained_review_text = Field(
     min_length=1,
-    max_length=_MAX_REVIEW_LENGTH,
+    max_length=MAX_REVIEW_LENGTH,
 )
 _constrained_reviewer_name = Field(
     min_length=1,
-    max_length=_MAX_NAME_LENGTH,
+    max_length=MAX_NAME_LENGTH,
 )
 _sentiment_enum_field = Field(
     title='Sentiment as an integer',
@@ -110,12 +115,178 @@ class ReviewCreationBody(Review):
         raise ValueError('Both review_text and sentiment must be set or unset.')
 
 
+class ReviewCursor(BaseModel):
+    """A keyset position of the last review a client has seen."""
+    created_at: datetime
+    identity: Annotated[int, Field(ge=0)]
+
+    @classmethod
+    def decode(cls, token: str) -> Self:
+        """Parse an opaque cursor token."""
+        try:
+            created_at, identity = _split_cursor_token(token)
+        except ValueError as error:
+            raise InvalidCursorError('Malformed pagination cursor') from error
+        return cls(created_at=created_at, identity=identity)
+
+    def encode(self) -> str:
+        """Serialize the cursor into an opaque url-safe token."""
+        raw_cursor = _CURSOR_SEPARATOR.join(
+            (self.created_at.isoformat(), str(self.identity)),
+        )
+        token = base64.urlsafe_b64encode(raw_cursor.encode())
+        return token.decode().rstrip('=')
+
+
 class PaginationOptions(BaseModel):
-    """A skip/limit pagination configuration."""
+    """A skip/limit pagination configuration.
+
+    If a cursor is given, skip counts from the review right after it.
+    """
     skip: Annotated[int, Field(ge=0)] = 0
     limit: Annotated[int, Field(ge=1)] = 10
+    cursor: str | None = None
+
+    def decode_cursor(self) -> ReviewCursor | None:
+        """Return the decoded cursor, if any."""
+        if self.cursor is None:
+            return None
+        return ReviewCursor.decode(self.cursor)
+
+
+class ReviewFilters(BaseModel):
+    """Conditions a review must all meet to be listed.
+
+    The creation time window includes its start and excludes its end.
+    Naive datetimes are treated as UTC.
+    """
+    rating_min: Annotated[Decimal, Field(ge=1, le=5)] | None = None
+    rating_max: Annotated[Decimal, Field(ge=1, le=5)] | None = None
+    sentiment: SentimentEnum | None = None
+    created_from: datetime | None = None
+    created_to: datetime | None = None
+    reviewer_name: str | None = None
+
+    @field_validator('created_from', 'created_to')
+    @classmethod
+    def tz_aware_created_window(
+        cls,
+        raw_value: datetime | None,
+        _: ValidationInfo,
+    ) -> datetime | None:
+        """Treat naive datetimes as UTC."""
+        if raw_value is None or raw_value.tzinfo is not None:
+            return raw_value
+        return raw_value.replace(tzinfo=timezone.utc)
+
+    def is_empty(self) -> bool:
+        """Tell whether no condition is set."""
+        return not self.model_dump(exclude_none=True)
 
 
 class MultipleReviewsResponse(BaseModel):
     """An extensible container for reviews."""
     reviews: list[Review]
+    next_cursor: str | None = None
+
+
+class StatisticsBucket(BaseModel):
+    """Reviews created within a UTC day or an ISO week."""
+    start: date
+    count: int
+    mean_rating: Decimal
+
+
+class ReviewStatistics(BaseModel):
+    """Aggregates over a whole set of reviews.
+
+    Sentiment counts are keyed by sentiment name, with 'unknown' for
+    reviews without one.
+    """
+    count: int
+    mean_rating: Decimal | None = None
+    rating_histogram: dict[str, int]
+    sentiment_counts: dict[str, int]
+    daily: list[StatisticsBucket]
+    weekly: list[StatisticsBucket]
+
+
+class BulkLineError(BaseModel):
+    """The reasons a line of a bulk upload was rejected."""
+    line: int
+    errors: list[str]
+
+
+class BulkIngestionReport(BaseModel):
+    """The outcome of a bulk upload.
+
+    Only the first rejected lines are listed, so that the report stays
+    small however many lines are invalid.
+    """
+    accepted: int = 0
+    rejected: int = 0
+    errors: list[BulkLineError] = []
+
+
+class ScrapedReviews(BaseModel):
+    """Reviews of a restaurant in page order, since a scrape started.
+
+    Scrapes of the same start only ever add reviews to the end.
+    """
+    scraped_at: datetime
+    reviews: list[Review] = []
+
+
+class DriverPoolStatistics(BaseModel):
+    """Sessions of the WebDriver pool now, and counts since startup.
+
+    Waits are measured from asking for a session to getting a slot.
+    """
+    min_drivers: int
+    max_drivers: int
+    in_use: int
+    idle: int
+    checkouts: int
+    created: int
+    recycled: int
+    evicted: int
+    failed_checks: int
+    mean_wait_seconds: float
+    max_wait_seconds: float
+
+
+class ScrapeJobCreationBody(BaseModel):
+    """A restaurant to scrape, and how many of its reviews."""
+    restaurant_slug: Annotated[str, Field(min_length=1)]
+    review_count: Annotated[int, Field(ge=1)] = 10
+
+
+class ScrapeJobProgress(ScrapeJobCreationBody):
+    """How far a scrape job got.
+
+    The ETA extrapolates the reviews collected since the job started,
+    so it is only known once some were.
+    """
+    job_id: str
+    status: ScrapeJobStatus = ScrapeJobStatus.queued
+    created_at: datetime
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+    collected: int = 0
+    strategy: str | None = None
+    eta_seconds: float | None = None
+    error: str | None = None
+
+
+def _split_cursor_token(token: str) -> tuple[datetime, int]:
+    raw_cursor = base64.urlsafe_b64decode(
+        token + '=' * (-len(token) % 4),
+    ).decode()
+    created_at, raw_identity = raw_cursor.split(_CURSOR_SEPARATOR)
+    moment = datetime.fromisoformat(created_at)
+    if moment.tzinfo is None:
+        raise ValueError('Cursor timestamp must be timezone-aware')
+    identity = int(raw_identity)
+    if identity < 0:
+        raise ValueError('Cursor identity must not be negative')
+    return moment, identity
@@ -1,3 +1,7 @@
+from app.initializers import justeat_http
+from app.initializers import prescrape
+from app.initializers import scrape_cache
+from app.initializers import scrape_jobs
 from app.initializers import selenium
 from app.initializers import server
 from app.initializers import xlsx
@@ -12,9 +16,17 @@ app = server.get_app(
     lifespan=server.construct_lifespan(
         pre=[
             xlsx.load_xlsx_datasource,
+            scrape_cache.open_scrape_cache,
+            justeat_http.open_http_engine,
             selenium.initialize_driver_pool,
+            prescrape.start_prescraping,
+            scrape_jobs.start_scrape_jobs,
         ],
         post=[
+            xlsx.close_xlsx_datasource,
+            prescrape.stop_prescraping,
+            scrape_jobs.stop_scrape_jobs,
+            justeat_http.close_http_engine,
             selenium.shutdown_driver_pool,
         ],
     ),
@@ -0,0 +1,80 @@
+import hashlib
+from collections.abc import Hashable
+from typing import NamedTuple
+
+from cachetools import LRUCache
+from fastapi import Request
+from fastapi.responses import Response
+from pydantic import BaseModel
+
+_NOT_MODIFIED_STATUS_CODE = 304
+_DEFAULT_CACHE_BYTES = 64 * 2 ** 20  # noqa: WPS432
+_ETAG_DIGEST_SIZE = 16
+
+
+class _CachedPage(NamedTuple):
+    etag: str
+    body: bytes
+
+
+class PageCache:
+    """Serialized response bodies with strong ETags.
+
+    Keys have to change whenever the page would, e.g. by including the
+    version of the datasource, so that entries are never invalidated,
+    only evicted once the least recently used pages exceed the size.
+    ETags hash the body, so they stay valid across processes and
+    restarts.
+    """
+
+    def __init__(self, max_bytes: int = _DEFAULT_CACHE_BYTES):
+        """Start empty."""
+        self._pages: LRUCache[Hashable, _CachedPage] = LRUCache(
+            maxsize=max_bytes,
+            getsizeof=_page_size,
+        )
+
+    def get(
+        self,
+        request: Request,
+        key: Hashable | None,
+    ) -> Response | None:
+        """Return the cached page as a response, if there is one."""
+        if key is None:
+            return None
+        cached_page = self._pages.get(key)
+        if cached_page is None:
+            return None
+        return _respond(request, cached_page)
+
+    def put(self, request: Request, key: Hashable, page: BaseModel) -> Response:
+        """Serialize the page once, cache it and respond with it."""
+        body = page.model_dump_json().encode()
+        digest = hashlib.blake2b(body, digest_size=_ETAG_DIGEST_SIZE)
+        cached_page = _CachedPage(
+            etag='"{0}"'.format(digest.hexdigest()),
+            body=body,
+        )
+        if len(body) <= self._pages.maxsize:
+            self._pages[key] = cached_page
+        return _respond(request, cached_page)
+
+
+def _page_size(cached_page: _CachedPage) -> int:
+    return len(cached_page.body)
+
+
+def _respond(request: Request, cached_page: _CachedPage) -> Response:
+    headers = {'ETag': cached_page.etag}
+    # If-None-Match compares weakly, so weak validators match as well.
+    client_etags = {
+        etag.strip().removeprefix('W/')
+        for etag in request.headers.get('If-None-Match', '').split(',')
+    }
+    if cached_page.etag in client_etags or '*' in client_etags:
+        return Response(status_code=_NOT_MODIFIED_STATUS_CODE, headers=headers)
+    return Response(
+        cached_page.body,
+        media_type='application/json',
+        headers=headers,
+    )
@@ -1,52 +1,283 @@
+from datetime import datetime
+from types import MappingProxyType
 from typing import Annotated
 
 from fastapi import APIRouter
 from fastapi import Depends
 from fastapi import HTTPException
+from fastapi import Query
+from fastapi import Request
 from fastapi.responses import Response
+from fastapi.responses import StreamingResponse
 
 from app.datasources import JustEatDataSource
-from app.datasources import MemoryXLSXDatasource
+from app.datasources import get_review_datasource
+from app.datasources.ndjson_ingestion import ingest_ndjson
+from app.datasources.review_export import encode_reviews
+from app.datasources.review_export import MEDIA_TYPES
+from app.datasources.scrape_jobs import ScrapeJob
+from app.initializers.scrape_jobs import SCRAPE_JOBS
+from app.initializers.selenium import DRIVER_POOL
 from app.interface import exceptions as ex
 from app.interface import schemas
+from app.interface.enums import ExportFormat
+from app.interface.enums import StreamFormat
+from app.interface.abstract import AbstractReviewDatasource
+from app.routers.page_cache import PageCache
 
 router = APIRouter(prefix='/reviews')
 _CREATED_STATUS_CODE = 201
+_ACCEPTED_STATUS_CODE = 202
+_BAD_REQUEST_STATUS_CODE = 400
 _NOT_FOUND_STATUS_CODE = 404
+_SERVICE_UNAVAILABLE_STATUS_CODE = 503
+_ReviewDatasource = Annotated[
+    AbstractReviewDatasource,
+    Depends(get_review_datasource),
+]
+# The body is streamed rather than parsed, so it is described by hand.
+_NDJSON_BODY = MappingProxyType({
+    'required': True,
+    'content': {
+        'application/x-ndjson': {
+            'schema': {'type': 'string', 'format': 'binary'},
+        },
+    },
+})
+# Most requests ask for the first pages, which rarely change.
+_page_cache = PageCache()
+_SearchQuery = Annotated[
+    str,
+    Query(min_length=1, max_length=schemas.MAX_REVIEW_LENGTH),
+]
 
 
 @router.get('/', response_model=schemas.MultipleReviewsResponse)
 async def fetch_reviews(
+    request: Request,
     pagination: Annotated[schemas.PaginationOptions, Depends()],
-    datasource: Annotated[MemoryXLSXDatasource, Depends()],
+    filters: Annotated[schemas.ReviewFilters, Depends()],
+    datasource: _ReviewDatasource,
+) -> Response:
+    """Return a page of matching reviews from the datasource."""
+    page_key = (
+        datasource.version(),
+        pagination.model_dump_json(),
+        filters.model_dump_json(),
+    )
+    cached_response = _page_cache.get(request, page_key)
+    if cached_response is not None:
+        return cached_response
+    try:
+        page = datasource.list_multiple_reviews_with(pagination, filters)
+    except ex.InvalidCursorError as error:
+        raise _http_error(_BAD_REQUEST_STATUS_CODE, error) from error
+    return _page_cache.put(request, page_key, page)
+
+
+@router.get('/search', response_model=schemas.MultipleReviewsResponse)
+async def search_reviews(
+    query: _SearchQuery,
+    pagination: Annotated[schemas.PaginationOptions, Depends()],
+    datasource: _ReviewDatasource,
 ) -> schemas.MultipleReviewsResponse:
-    """Return a page of reviews from the datasource."""
-    reviews = datasource.list_multiple_reviews_with(pagination)
-    return schemas.MultipleReviewsResponse(reviews=reviews)
+    """Return a page of reviews mentioning any of the words, best first."""
+    try:
+        return await datasource.search_reviews(query, pagination)
+    except ex.InvalidCursorError as error:
+        raise _http_error(_BAD_REQUEST_STATUS_CODE, error) from error
+    except ex.SearchIndexNotReadyError as error:
+        raise _http_error(_SERVICE_UNAVAILABLE_STATUS_CODE, error) from error
+
+
+@router.get('/export', response_class=StreamingResponse)
+async def export_reviews(
+    filters: Annotated[schemas.ReviewFilters, Depends()],
+    datasource: _ReviewDatasource,
+    export_format: Annotated[ExportFormat, Query(alias='format')] = (
+        ExportFormat.ndjson
+    ),
+) -> StreamingResponse:
+    """Stream every matching review, newest first."""
+    # Every export format is a stream format as well.
+    stream_format = StreamFormat(export_format.value)
+    return StreamingResponse(
+        encode_reviews(datasource.export_reviews(filters), stream_format),
+        media_type=MEDIA_TYPES[stream_format],
+    )
+
+
+@router.get('/stats', response_model=schemas.ReviewStatistics)
+async def fetch_review_statistics(
+    datasource: _ReviewDatasource,
+) -> schemas.ReviewStatistics:
+    """Return aggregates over every stored review."""
+    return datasource.get_statistics()
 
 
 @router.post('/')
 async def add_review(
-    datasource: Annotated[MemoryXLSXDatasource, Depends()],
+    datasource: _ReviewDatasource,
     review_body: schemas.ReviewCreationBody,
 ) -> Response:
     """Add a review to the datasource."""
-    datasource.add_reviews(review_body)
+    await datasource.add_reviews(review_body)
     return Response(status_code=_CREATED_STATUS_CODE)
 
 
+@router.post(
+    '/bulk',
+    response_model=schemas.BulkIngestionReport,
+    openapi_extra={'requestBody': _NDJSON_BODY},
+)
+async def add_reviews_in_bulk(
+    datasource: _ReviewDatasource,
+    request: Request,
+) -> schemas.BulkIngestionReport:
+    """Add reviews streamed as newline-delimited JSON, one per line."""
+    return await ingest_ndjson(request.stream(), datasource)
+
+
 @router.get('/scrape/justeat', response_model=schemas.MultipleReviewsResponse)
 async def scrape_justeat(
+    request: Request,
     datasource: Annotated[JustEatDataSource, Depends()],
     pagination: Annotated[schemas.PaginationOptions, Depends()],
-) -> schemas.MultipleReviewsResponse:
-    """Scrape reviews from Just Eat."""
+) -> Response | schemas.MultipleReviewsResponse:
+    """Scrape reviews from Just Eat, unless they are cached already."""
+    async with datasource:
+        cached_response = _page_cache.get(
+            request, _justeat_page_key(datasource, pagination),
+        )
+        if cached_response is not None:
+            return cached_response
+        try:
+            page = await datasource.get_reviews(pagination)
+        except ex.InvalidCursorError as error:
+            raise _http_error(_BAD_REQUEST_STATUS_CODE, error) from error
+        except ex.UnsupportedPageStructureError as error:
+            raise _http_error(_NOT_FOUND_STATUS_CODE, error) from error
+    page_key = _justeat_page_key(datasource, pagination)
+    if page_key is None:
+        # The buffer ran out of reviews, so a longer one may come along.
+        return page
+    return _page_cache.put(request, page_key, page)
+
+
+@router.get('/scrape/justeat/stream', response_class=StreamingResponse)
+async def stream_justeat(
+    datasource: Annotated[JustEatDataSource, Depends()],
+    pagination: Annotated[schemas.PaginationOptions, Depends()],
+    stream_format: Annotated[StreamFormat, Query(alias='format')] = (
+        StreamFormat.ndjson
+    ),
+) -> StreamingResponse:
+    """Stream the reviews of a page from Just Eat as they are scraped."""
     async with datasource:
         try:
-            reviews = await datasource.get_reviews(pagination)
+            batches = await datasource.stream_reviews(pagination)
+        except ex.InvalidCursorError as error:
+            raise _http_error(_BAD_REQUEST_STATUS_CODE, error) from error
         except ex.UnsupportedPageStructureError as error:
-            raise HTTPException(
-                status_code=_NOT_FOUND_STATUS_CODE,
-                detail=str(error),
-            ) from error
-    return schemas.MultipleReviewsResponse(reviews=reviews)
+            raise _http_error(_NOT_FOUND_STATUS_CODE, error) from error
+    return StreamingResponse(
+        encode_reviews(batches, stream_format),
+        media_type=MEDIA_TYPES[stream_format],
+    )
+
+
+@router.get(
+    '/scrape/justeat/stats',
+    response_model=schemas.ReviewStatistics,
+)
+async def fetch_justeat_statistics(
+    datasource: Annotated[JustEatDataSource, Depends()],
+) -> schemas.ReviewStatistics:
+    """Return aggregates over the reviews scraped from Just Eat so far."""
+    async with datasource:
+        try:
+            return datasource.get_statistics()
+        except ex.ReviewsNotCachedError as error:
+            raise _http_error(_NOT_FOUND_STATUS_CODE, error) from error
+
+
+@router.post(
+    '/scrape/justeat/jobs',
+    response_model=schemas.ScrapeJobProgress,
+    status_code=_ACCEPTED_STATUS_CODE,
+)
+async def submit_justeat_scrape_job(
+    request: Request,
+    response: Response,
+    job_body: schemas.ScrapeJobCreationBody,
+) -> schemas.ScrapeJobProgress:
+    """Queue a scrape of Just Eat reviews, to be polled for by its id."""
+    try:
+        job = SCRAPE_JOBS.submit(
+            job_body.restaurant_slug, job_body.review_count,
+        )
+    except ex.ScrapeQueueFullError as error:
+        raise _http_error(_SERVICE_UNAVAILABLE_STATUS_CODE, error) from error
+    response.headers['Location'] = str(request.url_for(
+        'fetch_justeat_scrape_job', job_id=job.progress.job_id,
+    ))
+    return job.report()
+
+
+@router.get(
+    '/scrape/justeat/jobs/{job_id}',
+    response_model=schemas.ScrapeJobProgress,
+)
+async def fetch_justeat_scrape_job(job_id: str) -> schemas.ScrapeJobProgress:
+    """Return how far a scrape job got."""
+    return _get_scrape_job(job_id).report()
+
+
+@router.get(
+    '/scrape/justeat/jobs/{job_id}/reviews',
+    response_model=schemas.MultipleReviewsResponse,
+)
+async def fetch_justeat_scrape_job_reviews(
+    job_id: str,
+    pagination: Annotated[schemas.PaginationOptions, Depends()],
+) -> schemas.MultipleReviewsResponse:
+    """Return a page of the reviews a scrape job collected so far.
+
+    A page is only complete, with a cursor to the next one, once the
+    job collected all of its reviews.
+    """
+    job = _get_scrape_job(job_id)
+    try:
+        return job.datasource.buffered_page(pagination)
+    except ex.InvalidCursorError as error:
+        raise _http_error(_BAD_REQUEST_STATUS_CODE, error) from error
+
+
+@router.get(
+    '/scrape/pool',
+    response_model=schemas.DriverPoolStatistics,
+)
+async def fetch_driver_pool_statistics() -> schemas.DriverPoolStatistics:
+    """Return how busy the browser sessions used for scraping are."""
+    return DRIVER_POOL.statistics()
+
+
+def _justeat_page_key(
+    datasource: JustEatDataSource,
+    pagination: schemas.PaginationOptions,
+) -> tuple[tuple[str, datetime, int], str] | None:
+    buffer_state = datasource.buffer_state(pagination)
+    if buffer_state is None:
+        return None
+    return buffer_state, pagination.model_dump_json()
+
+
+def _get_scrape_job(job_id: str) -> ScrapeJob:
+    try:
+        return SCRAPE_JOBS.get(job_id)
+    except ex.ScrapeJobNotFoundError as error:
+        raise _http_error(_NOT_FOUND_STATUS_CODE, error) from error
+
+
+def _http_error(status_code: int, error: Exception) -> HTTPException:
+    return HTTPException(status_code=status_code, detail=str(error))
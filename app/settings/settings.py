@@ -6,6 +6,10 @@ from pydantic_settings import BaseSettings
 from pydantic_settings import SettingsConfigDict
 from typing_extensions import Self
 
+from app.interface.enums import DurabilityMode
+from app.interface.enums import PacingMode
+from app.interface.enums import ReviewBackend
+from app.interface.enums import ScrapeCacheBackend
 from app.settings.logging_config import construct_logging_config
 
 
@@ -15,8 +19,50 @@ class Settings(BaseSettings):
 
     selenium_host: str = Field(default='selenium-chrome')
     selenium_port: int = Field(default=4444)  # noqa: WPS432
+    selenium_min_drivers: int = Field(default=1, ge=0)
+    selenium_max_drivers: int = Field(default=1, ge=1)
+    selenium_driver_max_uses: int = Field(default=50, ge=1)  # noqa: WPS432
+    selenium_driver_max_age: int = Field(default=1800)  # noqa: WPS432
+    selenium_driver_idle_timeout: int = Field(default=300)  # noqa: WPS432
 
     reviews_xlsx_path: str = Field(default='reviews.xlsx')
+    reviews_backend: ReviewBackend = Field(default=ReviewBackend.memory)
+    reviews_sqlite_path: str = Field(default='reviews.sqlite3')
+    reviews_snapshot: bool = Field(default=True)
+    reviews_log_path: str = Field(default='reviews.log')
+    reviews_log_durability: DurabilityMode = Field(
+        default=DurabilityMode.batched,
+    )
+    reviews_log_compaction_bytes: int = Field(
+        default=8 * 2 ** 20,  # noqa: WPS432
+    )
+
+    scrape_cache_backend: ScrapeCacheBackend = Field(
+        default=ScrapeCacheBackend.sqlite,
+    )
+    scrape_cache_path: str = Field(default='scrape_cache.sqlite3')
+    scrape_cache_ttl: int = Field(default=3600)  # noqa: WPS432
+    scrape_over_http: bool = Field(default=True)
+    scrape_http_connections: int = Field(default=10, ge=1)
+    scrape_strategy_ttl: int = Field(default=86400, ge=1)  # noqa: WPS432
+
+    prescrape_slugs: list[str] = Field(default_factory=list)
+    prescrape_popular: int = Field(default=10, ge=0)
+    prescrape_reviews: int = Field(default=10, ge=1)
+    prescrape_max_reviews: int = Field(default=100, ge=1)
+    prescrape_lead: int = Field(default=300)  # noqa: WPS432
+    prescrape_interval: int = Field(default=60, ge=1)
+    prescrape_concurrency: int = Field(default=1, ge=1)
+
+    pacing_mode: PacingMode = Field(default=PacingMode.adaptive)
+    pacing_global_rate: float = Field(default=4, gt=0)
+    pacing_global_burst: int = Field(default=20, ge=1)  # noqa: WPS432
+    pacing_host_rate: float = Field(default=2, gt=0)
+    pacing_host_burst: int = Field(default=10, ge=1)
+    pacing_min_scale: float = Field(default=0.75, gt=0)  # noqa: WPS432
+    pacing_max_scale: float = Field(default=4, gt=0)
+
+    scrape_job_queue_size: int = Field(default=100, ge=1)  # noqa: WPS432
 
     environment: str = Field(default='development')
     testing: bool = Field(default=False)
@@ -41,6 +87,15 @@ class Settings(BaseSettings):
         )
         return self
 
+    @model_validator(mode='after')
+    def check_pacing_scales(self) -> Self:  # noqa: N805
+        """Rejects a minimum pacing scale above the maximum one."""
+        if self.pacing_min_scale > self.pacing_max_scale:
+            raise ValueError(
+                'PACING_MIN_SCALE must not exceed PACING_MAX_SCALE',
+            )
+        return self
+
 
 @lru_cache
 def get_settings() -> Settings:
@@ -0,0 +1,83 @@
+"""Latency of filtered review pages, combining several conditions.
+
+Run with `python -m benchmarks.filter_latency`.
+"""
+import argparse
+import statistics
+import time
+from datetime import datetime
+from datetime import timezone
+from decimal import Decimal
+
+from app.datasources.review_filter_index import ReviewFilterIndex
+from app.datasources.review_index import ReviewTimeIndex
+from app.datasources.review_store import ColumnarReviewStore
+from app.datasources.review_store import ReviewSegment
+from app.interface.enums import SentimentEnum
+from app.interface.schemas import ReviewFilters
+from benchmarks.synthetic import review_frame
+
+_ROWS = 1000000
+_REPEATS = 20
+_PAGE_ROWS = 21
+_DEEP_SKIP = 1000
+_MILLISECONDS = 1000
+_FILTERS = (
+    ('high rating', ReviewFilters(rating_min=Decimal('4.5'))),
+    ('positive, 4+', ReviewFilters(
+        rating_min=Decimal(4), sentiment=SentimentEnum.positive,
+    )),
+    ('negative, <=2, 2020', ReviewFilters(
+        rating_max=Decimal(2),
+        sentiment=SentimentEnum.negative,
+        created_from=datetime(2020, 1, 1, tzinfo=timezone.utc),
+        created_to=datetime(2021, 1, 1, tzinfo=timezone.utc),
+    )),
+    ('positive, 1.0, 1 month', ReviewFilters(
+        rating_max=Decimal(1),
+        sentiment=SentimentEnum.positive,
+        created_from=datetime(2018, 3, 1, tzinfo=timezone.utc),
+        created_to=datetime(2018, 4, 1, tzinfo=timezone.utc),
+    )),
+)
+
+
+def main() -> None:
+    """Print the page latency per combination of filters."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=_ROWS)
+    arguments = parser.parse_args()
+    segment = ReviewSegment.from_columns(review_frame(arguments.rows))
+    started = time.perf_counter()
+    filter_index = ReviewFilterIndex(
+        ReviewTimeIndex(ColumnarReviewStore(segment)),
+    )
+    print('index built in {0:.2f} s'.format(time.perf_counter() - started))
+    print('filters                  first page   page at 1000   rows')
+    for name, filters in _FILTERS:
+        first_page = _latencies(filter_index, filters, 0)
+        deep_page = _latencies(filter_index, filters, _DEEP_SKIP)
+        row_count = len(filter_index.find(filters, None, 0, _PAGE_ROWS))
+        print('{0:<22} {1:>9.2f} ms {2:>11.2f} ms {3:>6}'.format(
+            name,
+            statistics.median(first_page),
+            statistics.median(deep_page),
+            row_count,
+        ))
+
+
+def _latencies(
+    filter_index: ReviewFilterIndex,
+    filters: ReviewFilters,
+    skip: int,
+) -> list[float]:
+    latencies = []
+    for _ in range(_REPEATS):
+        started = time.perf_counter()
+        filter_index.find(filters, None, skip, _PAGE_ROWS)
+        latencies.append((time.perf_counter() - started) * _MILLISECONDS)
+    return latencies
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,129 @@
+"""Throughput of reading review pages over HTTP, against the browser.
+
+The HTTP engine reads the saved review page of the tests, padded to the
+size of a live page, from a local server and without pacing. With
+`--restaurant`, the first reviews of a live restaurant are scraped once
+over HTTP and once in the browser, which needs Selenium and network
+access. Run with `python -m benchmarks.http_scrape`.
+"""
+import argparse
+import asyncio
+import threading
+import time
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+
+from app.datasources.justeat_datasource import ButtonLoadModalStrategy
+from app.datasources.justeat_datasource import JustEatDataSource
+from app.datasources.justeat_http import JustEatHTTPEngine
+from app.datasources.scrape_cache import MemoryScrapeCache
+from app.initializers.pacing import PACER
+from app.initializers.pacing import PacingPolicy
+from app.initializers.selenium import DRIVER_POOL
+from app.interface.enums import PacingMode
+from app.interface.schemas import PaginationOptions
+from tests.test_justeat_page import read_fixture
+
+_PAGE_KILOBYTES = 600
+_PAGES = 200
+_CONCURRENCIES = (1, 10)
+_LIVE_LIMIT = 10
+_MILLISECONDS = 1000
+
+
+class _PageHandler(BaseHTTPRequestHandler):
+    page = b''
+
+    def do_GET(self) -> None:  # noqa: N802
+        """Serve the review page at any path."""
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(self.page)))
+        self.end_headers()
+        self.wfile.write(self.page)
+
+    def log_message(self, *args) -> None:
+        """Keep the requests out of the results."""
+
+
+def main() -> None:
+    """Print pages per second over HTTP, and live scrape times if asked."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--page-kb', type=int, default=_PAGE_KILOBYTES)
+    parser.add_argument('--restaurant')
+    arguments = parser.parse_args()
+    # Live pages carry scripts and styles the fixture leaves out.
+    padding = ' ' * (arguments.page_kb * 1024)
+    _PageHandler.page = (read_fixture('next_data_page.html') + padding).encode()
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _PageHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = 'http://127.0.0.1:{0}/reviews'.format(server.server_port)
+    live_policy = PACER.policy
+    # The pauses would measure the pacing limits, not the engine.
+    PACER.policy = PacingPolicy(mode=PacingMode.zero)
+    print('concurrency   pages/s   ms/page')
+    for concurrency in _CONCURRENCIES:
+        pages_per_second = asyncio.run(_http_throughput(url, concurrency))
+        print('{0:<11} {1:>9.0f} {2:>9.1f}'.format(
+            concurrency, pages_per_second, _MILLISECONDS / pages_per_second,
+        ))
+    server.shutdown()
+    PACER.policy = live_policy
+    if arguments.restaurant:
+        asyncio.run(_compare_live(arguments.restaurant))
+
+
+async def _http_throughput(url: str, concurrency: int) -> float:
+    http_engine = JustEatHTTPEngine(max_connections=concurrency)
+    slots = asyncio.Semaphore(concurrency)
+    started = time.perf_counter()
+    await asyncio.gather(*(
+        _fetch_page(http_engine, url, slots) for _ in range(_PAGES)
+    ))
+    elapsed = time.perf_counter() - started
+    await http_engine.aclose()
+    return _PAGES / elapsed
+
+
+async def _fetch_page(
+    http_engine: JustEatHTTPEngine,
+    url: str,
+    slots: asyncio.Semaphore,
+) -> None:
+    async with slots:
+        await http_engine.fetch_reviews(
+            url, ButtonLoadModalStrategy().parse_card,
+        )
+
+
+async def _compare_live(restaurant_slug: str) -> None:
+    http_engine = JustEatHTTPEngine()
+    print('path      reviews   seconds')
+    for path, engine in (('http', http_engine), ('browser', None)):
+        review_count, seconds = await _scrape_live(restaurant_slug, engine)
+        print('{0:<9} {1:>7} {2:>9.2f}'.format(path, review_count, seconds))
+    await http_engine.aclose()
+    await DRIVER_POOL.close()
+
+
+async def _scrape_live(
+    restaurant_slug: str,
+    http_engine: JustEatHTTPEngine | None,
+) -> tuple[int, float]:
+    # Every path starts cold, from no reviews scraped before.
+    JustEatDataSource.use_http_engine(http_engine)
+    JustEatDataSource.use_scrape_cache(
+        MemoryScrapeCache(), int(JustEatDataSource.scrape_ttl.total_seconds()),
+    )
+    JustEatDataSource.buffer_cache.clear()
+    JustEatDataSource.flights.clear()
+    started = time.perf_counter()
+    async with JustEatDataSource(restaurant_slug) as datasource:
+        page = await datasource.get_reviews(
+            PaginationOptions(limit=_LIVE_LIMIT),
+        )
+    return len(page.reviews), time.perf_counter() - started
+
+
+if __name__ == '__main__':
+    main()
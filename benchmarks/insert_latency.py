@@ -0,0 +1,65 @@
+"""Latency of adding a review as the store grows.
+
+Compares the ordered time index with re-sorting the whole list on every
+insert, as the XLSX datasource used to. Run with
+`python -m benchmarks.insert_latency`.
+"""
+import argparse
+import statistics
+import time
+
+from app.datasources.review_index import ReviewTimeIndex
+from app.datasources.review_store import ColumnarReviewStore
+from app.datasources.review_store import ReviewSegment
+from benchmarks.synthetic import review_frame
+from benchmarks.synthetic import reviews
+
+_SIZES = (10000, 100000, 500000)
+_INSERTS = 2000
+_RESORT_INSERTS = 20
+_MICROSECONDS = 1e6
+
+
+def main() -> None:
+    """Print insert latencies per store size."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', type=int, nargs='+', default=_SIZES)
+    parser.add_argument('--inserts', type=int, default=_INSERTS)
+    arguments = parser.parse_args()
+    new_reviews = reviews(arguments.inserts, seed=1)
+    print('rows      index mean   index p99    re-sort mean')
+    for size in arguments.sizes:
+        index_latencies = _index_latencies(size, new_reviews)
+        resort_latencies = _resort_latencies(size, new_reviews)
+        print('{0:<9} {1:>8.1f} us  {2:>8.1f} us  {3:>10.1f} us'.format(
+            size,
+            statistics.fmean(index_latencies),
+            statistics.quantiles(index_latencies, n=100)[-1],
+            statistics.fmean(resort_latencies),
+        ))
+
+
+def _index_latencies(size: int, new_reviews: list) -> list[float]:
+    segment = ReviewSegment.from_columns(review_frame(size))
+    review_index = ReviewTimeIndex(ColumnarReviewStore(segment))
+    latencies = []
+    for review in new_reviews:
+        started = time.perf_counter()
+        review_index.insert(review)
+        latencies.append((time.perf_counter() - started) * _MICROSECONDS)
+    return latencies
+
+
+def _resort_latencies(size: int, new_reviews: list) -> list[float]:
+    stored = reviews(size)
+    latencies = []
+    for review in new_reviews[:_RESORT_INSERTS]:
+        started = time.perf_counter()
+        stored.append(review)
+        stored.sort(key=lambda stored_review: stored_review.created_at)
+        latencies.append((time.perf_counter() - started) * _MICROSECONDS)
+    return latencies
+
+
+if __name__ == '__main__':
+    main()
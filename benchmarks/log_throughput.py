@@ -0,0 +1,99 @@
+"""Append throughput and compaction cost of the review log.
+
+Appends are timed per durability mode. Compaction folds a fixed amount
+of records on top of a growing history of compacted ones. Run with
+`python -m benchmarks.log_throughput`. The log is written to a temporary
+directory, pass `--directory` to measure another disk.
+"""
+import argparse
+import asyncio
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from app.datasources.review_log import LogPosition
+from app.datasources.review_log import ReviewLog
+from app.datasources.review_store import ReviewSegment
+from app.interface.enums import DurabilityMode
+from benchmarks.synthetic import review_frame
+from benchmarks.synthetic import reviews
+
+_APPENDS = 5000
+_PER_REQUEST_APPENDS = 200
+_HISTORIES = (0, 100000, 1000000)
+_NEW_RECORDS = 1000
+# Large enough that appends never trigger a compaction on their own.
+_NO_COMPACTION = 2 ** 62
+_MEBIBYTE = 2 ** 20
+
+
+def main() -> None:
+    """Print appends per second per mode and compaction costs."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--directory', type=Path)
+    parser.add_argument('--histories', type=int, nargs='+', default=_HISTORIES)
+    arguments = parser.parse_args()
+    with tempfile.TemporaryDirectory(dir=arguments.directory) as directory:
+        print('mode          appends   reviews/s')
+        for mode in DurabilityMode:
+            appends = _APPENDS
+            if mode == DurabilityMode.per_request:
+                appends = _PER_REQUEST_APPENDS
+            throughput = asyncio.run(
+                _append_throughput(Path(directory), mode, appends),
+            )
+            print('{0:<13} {1:>7} {2:>11.0f}'.format(
+                mode.value, appends, throughput,
+            ))
+        print('history   compaction   peak memory')
+        for history in arguments.histories:
+            seconds, peak = _compaction_cost(Path(directory), history)
+            print('{0:<9} {1:>8.3f} s {2:>9.1f} MiB'.format(
+                history, seconds, peak / _MEBIBYTE,
+            ))
+
+
+async def _append_throughput(
+    directory: Path,
+    mode: DurabilityMode,
+    appends: int,
+) -> float:
+    review_log = ReviewLog(
+        str(directory / '{0}.log'.format(mode.value)),
+        durability=mode,
+        compaction_bytes=_NO_COMPACTION,
+    )
+    new_reviews = reviews(appends)
+    review_log.start()
+    started = time.perf_counter()
+    await asyncio.gather(*map(review_log.append, new_reviews))
+    # The async mode is only done once the writer flushed everything.
+    await review_log.close()
+    return appends / (time.perf_counter() - started)
+
+
+def _compaction_cost(directory: Path, history: int) -> tuple[float, int]:
+    review_log = ReviewLog(str(directory / 'history{0}.log'.format(history)))
+    review_log.segment_file.write(
+        ReviewSegment.from_columns(review_frame(history)),
+        LogPosition(log_id='', offset=0).model_dump(),
+    )
+    asyncio.run(_log_new_records(review_log))
+    tracemalloc.start()
+    started = time.perf_counter()
+    review_log._compact()  # noqa: WPS437
+    seconds = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return seconds, peak
+
+
+async def _log_new_records(review_log: ReviewLog) -> None:
+    review_log.start()
+    await review_log.append(*reviews(_NEW_RECORDS, seed=1))
+    await review_log.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,118 @@
+"""Query latency of full-text search in both review backends.
+
+Also measures how late a 10 ms timer fires on the event loop while a
+SQLite search runs, which is how long requests would stall. Run with
+`python -m benchmarks.search_latency`.
+"""
+import argparse
+import asyncio
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from app.datasources.review_search_index import ReviewSearchIndex
+from app.datasources.review_store import ColumnarReviewStore
+from app.datasources.review_store import ReviewSegment
+from app.datasources.sqlite_datasource import SQLiteReviewDatasource
+from app.interface.schemas import PaginationOptions
+from benchmarks.synthetic import review_frame
+from benchmarks.synthetic import reviews
+
+_ROWS = 1000000
+_QUERIES = ('pizza', 'pizza buona', 'delivery late', 'word500', 'word19000')
+_REPEATS = 5
+_INSERT_CHUNK = 20000
+_TICK_SECONDS = 0.01
+_MILLISECONDS = 1000
+_PAGE = PaginationOptions(limit=10)
+
+
+def main() -> None:
+    """Print the median latency per query and backend."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=_ROWS)
+    arguments = parser.parse_args()
+    asyncio.run(_compare(arguments.rows))
+
+
+async def _compare(row_count: int) -> None:
+    search_index = await _memory_index(review_frame(row_count))
+    with tempfile.TemporaryDirectory() as directory:
+        datasource = await _sqlite_datasource(Path(directory), row_count)
+        print('query           memory      sqlite   loop stall')
+        for query in _QUERIES:
+            memory_latency = _median_ms(
+                search_index.search, query, None, 0, _PAGE.limit + 1,
+            )
+            sqlite_latency, stall = await _sqlite_latency(datasource, query)
+            print('{0:<13} {1:>7.2f} ms {2:>8.2f} ms {3:>7.2f} ms'.format(
+                query, memory_latency, sqlite_latency, stall,
+            ))
+
+
+async def _memory_index(frame: pd.DataFrame) -> ReviewSearchIndex:
+    store = ColumnarReviewStore(ReviewSegment.from_columns(frame))
+    search_index = ReviewSearchIndex(store)
+    search_index.start()
+    while not search_index.ready:
+        await asyncio.sleep(_TICK_SECONDS)
+    return search_index
+
+
+async def _sqlite_datasource(
+    directory: Path,
+    row_count: int,
+) -> SQLiteReviewDatasource:
+    spreadsheet = directory / 'empty.xlsx'
+    review_frame(0).to_excel(spreadsheet, index=False)
+    SQLiteReviewDatasource.load_from(
+        str(spreadsheet), str(directory / 'reviews.sqlite3'),
+    )
+    datasource = SQLiteReviewDatasource()
+    for seed, _ in enumerate(range(0, row_count, _INSERT_CHUNK)):
+        await datasource.add_reviews(*reviews(_INSERT_CHUNK, seed=seed))
+    return datasource
+
+
+async def _sqlite_latency(
+    datasource: SQLiteReviewDatasource,
+    query: str,
+) -> tuple[float, float]:
+    latencies = []
+    stalls = []
+    for _ in range(_REPEATS):
+        ticker = asyncio.create_task(_longest_tick_delay())
+        started = time.perf_counter()
+        await datasource.search_reviews(query, _PAGE)
+        latencies.append((time.perf_counter() - started) * _MILLISECONDS)
+        ticker.cancel()
+        stalls.append(await ticker)
+    return statistics.median(latencies), max(stalls)
+
+
+async def _longest_tick_delay() -> float:
+    longest = 0
+    try:
+        while True:  # noqa: WPS457
+            started = time.perf_counter()
+            await asyncio.sleep(_TICK_SECONDS)
+            delay = time.perf_counter() - started - _TICK_SECONDS
+            longest = max(longest, delay)
+    except asyncio.CancelledError:
+        return longest * _MILLISECONDS
+
+
+def _median_ms(search, *search_args) -> float:
+    latencies = []
+    for _ in range(_REPEATS):
+        started = time.perf_counter()
+        search(*search_args)
+        latencies.append((time.perf_counter() - started) * _MILLISECONDS)
+    return statistics.median(latencies)
+
+
+if __name__ == '__main__':
+    main()
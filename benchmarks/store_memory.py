@@ -0,0 +1,53 @@
+"""Memory per review of a list of models and of the columnar store.
+
+Run with `python -m benchmarks.store_memory`.
+"""
+import argparse
+import gc
+import tracemalloc
+from collections.abc import Callable
+from typing import Any
+
+import pandas as pd
+
+from app.datasources.review_store import ColumnarReviewStore
+from app.datasources.review_store import ReviewSegment
+from benchmarks.synthetic import review_frame
+from benchmarks.synthetic import reviews
+
+_SIZES = (100000, 1000000)
+
+
+def main() -> None:
+    """Print the bytes per review of both layouts per store size."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', type=int, nargs='+', default=_SIZES)
+    arguments = parser.parse_args()
+    print('rows      list of Review   columnar store')
+    for size in arguments.sizes:
+        frame = review_frame(size)
+        model_bytes = _retained_bytes(reviews, size)
+        store_bytes = _retained_bytes(_columnar_store, frame)
+        print('{0:<9} {1:>10.0f} B/row   {2:>10.0f} B/row'.format(
+            size, model_bytes / size, store_bytes / size,
+        ))
+
+
+def _columnar_store(frame: pd.DataFrame) -> ColumnarReviewStore:
+    return ColumnarReviewStore(ReviewSegment.from_columns(frame))
+
+
+def _retained_bytes(build: Callable[..., Any], *build_args: Any) -> int:
+    # Only what the built object keeps alive is counted.
+    gc.collect()
+    tracemalloc.start()
+    built = build(*build_args)
+    gc.collect()
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del built  # noqa: WPS420
+    return retained
+
+
+if __name__ == '__main__':
+    main()
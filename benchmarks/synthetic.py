@@ -0,0 +1,72 @@
+"""Synthetic reviews for the benchmarks, reproducible from a seed."""
+from datetime import datetime
+from datetime import timezone
+
+import numpy as np
+import pandas as pd
+
+from app.datasources.review_store import build_review
+from app.interface.schemas import Review
+
+_START = datetime(2015, 1, 1, tzinfo=timezone.utc)
+_SPAN_SECONDS = 10 * 365 * 24 * 3600
+_TEXT_WORDS = 12
+_MISSING_TEXT_SHARE = 0.33
+_SENTIMENTS = (-1, 0, 1)
+# Zipf-distributed words, so a few are common and most are rare.
+_VOCABULARY = tuple(
+    'pizza buona pasta delivery late cold hot tasty rude friendly'.split(),
+) + tuple('word{0}'.format(number) for number in range(20000))
+_ZIPF_EXPONENT = 1.3
+
+
+def review_frame(row_count: int, seed: int = 0) -> pd.DataFrame:
+    """Return validated review columns, newest first, like the XLSX has."""
+    generator = np.random.default_rng(seed)
+    offsets = generator.integers(0, _SPAN_SECONDS, row_count)
+    created_at = pd.Timestamp(_START) + pd.to_timedelta(
+        np.sort(offsets)[::-1], unit='s',
+    )
+    has_text = generator.random(row_count) >= _MISSING_TEXT_SHARE
+    return pd.DataFrame({
+        'created_at': created_at,
+        'reviewer_name': [
+            'Guest {0}'.format(number)
+            for number in generator.integers(0, row_count, row_count)
+        ],
+        'rating_tenths': generator.integers(10, 51, row_count),
+        'sentiment': pd.Series(
+            [
+                int(sentiment) if text else None
+                for sentiment, text in zip(
+                    generator.choice(_SENTIMENTS, row_count), has_text,
+                )
+            ],
+            dtype=object,
+        ),
+        'review_text': [
+            _text(generator) if text else None for text in has_text
+        ],
+    })
+
+
+def reviews(row_count: int, seed: int = 0) -> list[Review]:
+    """Return review models in random creation order."""
+    frame = review_frame(row_count, seed).sample(frac=1, random_state=seed)
+    return [
+        build_review(
+            created_at=row.created_at.value // 1000,
+            reviewer_name=row.reviewer_name,
+            rating_tenths=row.rating_tenths,
+            sentiment=row.sentiment,
+            review_text=row.review_text,
+        )
+        for row in frame.itertuples(index=False)
+    ]
+
+
+def _text(generator: np.random.Generator) -> str:
+    ranks = generator.zipf(_ZIPF_EXPONENT, _TEXT_WORDS) - 1
+    return ' '.join(
+        _VOCABULARY[rank % len(_VOCABULARY)] for rank in ranks
+    )
@@ -0,0 +1,89 @@
+import asyncio
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+import httpx
+import pandas as pd
+
+from app.datasources import MemoryXLSXDatasource
+from app.initializers.selenium import DRIVER_POOL
+from app.initializers.selenium import WebDriverPool
+from app.initializers.selenium import run_in_driver_thread
+from app.main import app
+
+_SCRAPE_SECONDS = 1
+_READ_LIMIT = 5
+_REVIEW_COUNT = 10
+# Reads take a fraction of a scrape call, not a wait for its end.
+_FAST_SHARE = 0.1
+
+
+@run_in_driver_thread
+def _blocking_scrape() -> None:
+    # Stands in for a WebDriver call that waits on the browser.
+    time.sleep(_SCRAPE_SECONDS)
+
+
+class DriverPoolTest(unittest.IsolatedAsyncioTestCase):
+    """The pool keeps blocking WebDriver calls off the event loop."""
+
+    async def test_xlsx_reads_stay_fast_during_a_scrape(self):
+        """A page of reviews is served while a scrape call blocks."""
+        with tempfile.TemporaryDirectory() as directory:
+            _load_reviews(Path(directory) / 'reviews.xlsx')
+        scrape = asyncio.create_task(_blocking_scrape())
+        await asyncio.sleep(0)
+        response, read_seconds = await _timed_read()
+        self.assertLess(read_seconds, _SCRAPE_SECONDS * _FAST_SHARE)
+        self.assertFalse(scrape.done())
+        await scrape
+        self.assertEqual(len(response.json()['reviews']), _READ_LIMIT)
+
+    async def test_scrapes_do_not_queue_behind_housekeeping(self):
+        """Scrape calls get a thread while sessions are being managed."""
+        pool = WebDriverPool(max_drivers=1)
+        housekeeping = asyncio.create_task(
+            pool._housekeep(time.sleep, _SCRAPE_SECONDS),  # noqa: WPS437
+        )
+        await asyncio.sleep(0)
+        started = time.monotonic()
+        await pool.run(time.sleep, 0)
+        self.assertLess(time.monotonic() - started, _SCRAPE_SECONDS)
+        await housekeeping
+        await pool.close()
+
+    async def test_pool_runs_calls_again_after_close(self):
+        """A closed pool opens its threads again, as after a restart."""
+        await DRIVER_POOL.run(time.sleep, 0)
+        await DRIVER_POOL.close()
+        self.assertEqual(await DRIVER_POOL.run(sum, [1, 2]), 3)
+        await DRIVER_POOL.close()
+
+
+async def _timed_read() -> tuple[httpx.Response, float]:
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app),
+        base_url='http://test',
+    ) as client:
+        started = time.perf_counter()
+        response = await client.get('/reviews/', params={'limit': _READ_LIMIT})
+        return response, time.perf_counter() - started
+
+
+def _load_reviews(xlsx_path: Path) -> None:
+    pd.DataFrame({
+        'data': pd.date_range('2024-01-01', periods=_REVIEW_COUNT, freq='D'),
+        'reviewer': [
+            'Reviewer {0}'.format(number) for number in range(_REVIEW_COUNT)
+        ],
+        'testo': 'Buona pizza',
+        'sentiment': 1,
+        'voto': 4.5,
+    }).to_excel(xlsx_path, index=False)
+    MemoryXLSXDatasource.load_from(str(xlsx_path), use_snapshot=False)
+
+
+if __name__ == '__main__':
+    unittest.main()
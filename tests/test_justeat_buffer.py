@@ -0,0 +1,75 @@
+from unittest import IsolatedAsyncioTestCase
+from unittest import main
+
+from app.datasources.justeat_datasource import JustEatDataSource
+from app.datasources.scrape_flight import ScrapeFlight
+from app.interface.schemas import PaginationOptions
+from tests.test_justeat_page import parse_fixture
+
+
+async def _scrape_nothing(flight: ScrapeFlight) -> None:
+    """Leave the buffer as it is."""
+
+
+class ReviewBufferTest(IsolatedAsyncioTestCase):
+    """Cards the browser reads are merged into the buffered reviews."""
+
+    async def asyncSetUp(self):
+        """Start from reviews read over HTTP, as a scrape does."""
+        JustEatDataSource.buffer_cache.clear()
+        self.datasource = JustEatDataSource('pizzeria-napoli')
+        JustEatDataSource.buffer_cache['pizzeria-napoli'] = (
+            self.datasource.scraped
+        )
+        self.flight = ScrapeFlight(
+            self.datasource.review_buffer, _scrape_nothing,
+        )
+        self.http_reviews = parse_fixture('next_data_page.html')
+        self.cards = parse_fixture('card_page.html')
+
+    def test_skips_cards_read_over_http(self):
+        """Cards that are the reviews read over HTTP are not added again."""
+        self.datasource.review_buffer.extend(self.http_reviews[:2])
+        self._merge(self.cards)
+        self.assertEqual(
+            self.datasource.review_buffer,
+            [*self.http_reviews[:2], self.cards[2]],
+        )
+
+    def test_replaces_reviews_that_differ_from_cards(self):
+        """Reviews read over HTTP make way for differing cards."""
+        self.datasource.review_buffer.extend(self.http_reviews[1:])
+        self._merge(self.cards)
+        self.assertEqual(self.datasource.review_buffer, self.cards)
+
+    def test_replaces_reviews_after_the_parsed_cards(self):
+        """Only reviews beyond the cards parsed so far are replaced."""
+        self.datasource.review_buffer.extend(self.cards[:1])
+        self.datasource.review_buffer.extend(self.http_reviews[2:])
+        self.datasource._parsed_cards = 1  # noqa: WPS437
+        self._merge(self.cards[1:])
+        self.assertEqual(self.datasource.review_buffer, self.cards)
+
+    def test_readers_keep_the_replaced_buffer(self):
+        """A replacement starts a new scrape, leaving the old one as is."""
+        self.datasource.review_buffer.extend(self.http_reviews[1:])
+        replaced = self.datasource.scraped
+        pagination = PaginationOptions(limit=len(self.http_reviews[1:]))
+        replaced_state = self.datasource.buffer_state(pagination)
+        self._merge(self.cards)
+        self.assertEqual(replaced.reviews, self.http_reviews[1:])
+        self.assertIs(self.flight.buffer, self.datasource.review_buffer)
+        self.assertIs(
+            JustEatDataSource.buffer_cache['pizzeria-napoli'],
+            self.datasource.scraped,
+        )
+        self.assertNotEqual(
+            self.datasource.buffer_state(pagination), replaced_state,
+        )
+
+    def _merge(self, cards):
+        self.datasource._merge_cards(cards, self.flight)  # noqa: WPS437
+
+
+if __name__ == '__main__':
+    main()
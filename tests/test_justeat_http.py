@@ -0,0 +1,68 @@
+from http import HTTPStatus
+from unittest import IsolatedAsyncioTestCase
+from unittest import main
+from unittest import mock
+
+import httpx
+
+from app.datasources.justeat_datasource import ButtonLoadModalStrategy
+from app.datasources.justeat_http import JustEatHTTPEngine
+from app.initializers.pacing import PACER
+from tests.test_justeat_page import read_fixture
+
+_URL = 'https://www.just-eat.co.uk/restaurants-pizzeria-napoli/reviews'
+
+
+def _refuse(request: httpx.Request) -> httpx.Response:
+    return httpx.Response(HTTPStatus.TOO_MANY_REQUESTS, request=request)
+
+
+def _serve_page(request: httpx.Request) -> httpx.Response:
+    return httpx.Response(
+        HTTPStatus.OK,
+        text=read_fixture('next_data_page.html'),
+        request=request,
+    )
+
+
+class HTTPEngineTest(IsolatedAsyncioTestCase):
+    """Review pages fetched over HTTP are paced as the browser is."""
+
+    async def test_pauses_before_each_page(self):
+        """Every page waits for a pause of the pacer first."""
+        http_engine = self._engine(_serve_page)
+        with mock.patch.object(PACER, 'pause') as pause:
+            await http_engine.fetch_reviews(
+                _URL, ButtonLoadModalStrategy().parse_card,
+            )
+            await http_engine.fetch_reviews(
+                _URL, ButtonLoadModalStrategy().parse_card,
+            )
+            self.assertEqual(pause.await_count, 2)
+
+    async def test_refusals_slow_down_the_host(self):
+        """A refused page lengthens the pauses on its host."""
+        http_engine = self._engine(_refuse)
+        with PACER.for_host(_URL):
+            scale = PACER._host_pace().scale  # noqa: WPS437
+        with mock.patch.object(PACER, 'pause'):
+            page_reviews = await http_engine.fetch_reviews(
+                _URL, ButtonLoadModalStrategy().parse_card,
+            )
+        self.assertEqual(page_reviews, [])
+        with PACER.for_host(_URL):
+            self.assertGreater(
+                PACER._host_pace().scale, scale,  # noqa: WPS437
+            )
+
+    def _engine(self, respond) -> JustEatHTTPEngine:
+        http_engine = JustEatHTTPEngine()
+        http_engine._client = httpx.AsyncClient(  # noqa: WPS437
+            transport=httpx.MockTransport(respond),
+        )
+        self.addAsyncCleanup(http_engine.aclose)
+        return http_engine
+
+
+if __name__ == '__main__':
+    main()
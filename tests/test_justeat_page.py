@@ -0,0 +1,74 @@
+import unittest
+from datetime import datetime
+from decimal import Decimal
+from pathlib import Path
+
+from app.datasources.justeat_datasource import ButtonLoadModalStrategy
+from app.datasources.justeat_page import parse_review_page
+from app.interface import schemas
+
+FIXTURES = Path(__file__).parent / 'fixtures'
+
+
+def read_fixture(name: str) -> str:
+    """Return a saved review page."""
+    return (FIXTURES / name).read_text()
+
+
+def parse_fixture(name: str) -> list[schemas.Review]:
+    """Parse a saved review page as the HTTP engine does."""
+    return parse_review_page(
+        read_fixture(name), ButtonLoadModalStrategy().parse_card,
+    )
+
+
+class ReviewPageTest(unittest.TestCase):
+    """Review pages are parsed without a browser."""
+
+    def test_reads_reviews_from_page_state(self):
+        """The reviews in the embedded state are read, in page order."""
+        page_reviews = parse_fixture('next_data_page.html')
+        self.assertEqual(
+            [review.reviewer_name for review in page_reviews],
+            ['Giulia', 'Marco', 'Anna'],
+        )
+        self.assertEqual(page_reviews[0].rating, Decimal('5.0'))
+        self.assertIsNone(page_reviews[1].review_text)
+        self.assertEqual(
+            page_reviews[2].review_text,
+            'Delivery was late and the pasta cold.',
+        )
+
+    def test_reads_timestamps_in_utc_notation(self):
+        """A trailing Z reads as UTC, also where Python does not read it."""
+        first_review = parse_fixture('next_data_page.html')[0]
+        self.assertEqual(
+            first_review.created_at,
+            datetime.fromisoformat('2024-05-03T19:42:10+00:00'),
+        )
+
+    def test_ignores_lookalike_lists_outside_reviews(self):
+        """Restaurants with a name, date and score are not reviews."""
+        page_reviews = parse_fixture('next_data_page.html')
+        self.assertNotIn(
+            'Trattoria Roma',
+            [review.reviewer_name for review in page_reviews],
+        )
+
+    def test_reads_review_cards_without_page_state(self):
+        """Pages without embedded state are read from their cards."""
+        page_reviews = parse_fixture('card_page.html')
+        self.assertEqual(len(page_reviews), 3)
+        self.assertEqual(page_reviews[1].rating, Decimal('3.5'))
+        self.assertEqual(
+            page_reviews[2].review_text,
+            'Delivery was late and the pasta cold.',
+        )
+
+    def test_page_without_reviews(self):
+        """A page with neither state nor cards has no reviews."""
+        self.assertEqual(parse_fixture('empty_page.html'), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
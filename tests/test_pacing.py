@@ -0,0 +1,37 @@
+import unittest
+
+from pydantic import ValidationError
+
+from app.initializers.pacing import Pacer
+from app.initializers.pacing import PacingPolicy
+from app.settings.settings import Settings
+
+
+class PacingTest(unittest.TestCase):
+    """Pauses are scaled within the bounds of the pacing policy."""
+
+    def test_rejects_scales_out_of_order(self):
+        """A minimum scale above the maximum one is not accepted."""
+        with self.assertRaises(ValueError):
+            Pacer(PacingPolicy(min_scale=2, max_scale=1))
+        with self.assertRaises(ValidationError):
+            Settings(pacing_min_scale=2, pacing_max_scale=1)
+
+    def test_rejects_scales_that_are_not_positive(self):
+        """Pauses cannot be scaled away entirely."""
+        with self.assertRaises(ValueError):
+            Pacer(PacingPolicy(min_scale=0))
+
+    def test_successes_stop_at_the_minimum_scale(self):
+        """A run of successes shortens the pauses down to the minimum."""
+        pacer = Pacer(PacingPolicy())
+        for _ in range(100):
+            pacer.record_success()
+        self.assertEqual(
+            pacer._host_pace().scale,  # noqa: WPS437
+            PacingPolicy().min_scale,
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
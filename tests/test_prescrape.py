@@ -0,0 +1,42 @@
+from unittest import IsolatedAsyncioTestCase
+from unittest import main
+from unittest import mock
+
+from app.datasources.justeat_datasource import JustEatDataSource
+from app.datasources.prescrape import PrescrapePlan
+from app.datasources.prescrape import PrescrapeScheduler
+from app.datasources.scrape_flight import ScrapeFlight
+from app.initializers.selenium import DRIVER_POOL
+
+
+async def _scrape_nothing(flight: ScrapeFlight) -> None:
+    """Leave the buffer as it is."""
+
+
+class PrescrapeTest(IsolatedAsyncioTestCase):
+    """Pre-scrapes leave a browser session to requests."""
+
+    async def test_skips_with_a_single_session(self):
+        """The only session of the pool is kept for requests."""
+        scheduler = PrescrapeScheduler(PrescrapePlan(
+            restaurant_slugs=('pizzeria-napoli',),
+        ))
+        patched = mock.patch.object(JustEatDataSource, 'prescrape')
+        with patched as prescrape:
+            await scheduler.run_round()
+            prescrape.assert_not_called()
+        self.assertEqual(DRIVER_POOL.max_drivers, 1)
+
+    async def test_gives_way_before_taking_a_browser(self):
+        """A pre-scrape lands without a session, so requests scrape anew."""
+        datasource = JustEatDataSource('pizzeria-napoli')
+        datasource.reserved_sessions = 1
+        flight = ScrapeFlight(datasource.review_buffer, _scrape_nothing)
+        checkouts = DRIVER_POOL.statistics().checkouts
+        await datasource._scrape_in_browser(flight)  # noqa: WPS437
+        self.assertTrue(flight.gave_way)
+        self.assertEqual(DRIVER_POOL.statistics().checkouts, checkouts)
+
+
+if __name__ == '__main__':
+    main()
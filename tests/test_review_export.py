@@ -0,0 +1,26 @@
+import unittest
+
+import httpx
+
+from app.main import app
+
+_UNPROCESSABLE_STATUS_CODE = 422
+
+
+class ReviewExportTest(unittest.IsolatedAsyncioTestCase):
+    """The store export offers the export formats only."""
+
+    async def test_rejects_server_sent_events(self):
+        """Server-sent events are only offered by the scrape stream."""
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app),
+            base_url='http://test',
+        ) as client:
+            response = await client.get(
+                '/reviews/export', params={'format': 'sse'},
+            )
+        self.assertEqual(response.status_code, _UNPROCESSABLE_STATUS_CODE)
+
+
+if __name__ == '__main__':
+    unittest.main()
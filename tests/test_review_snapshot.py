@@ -0,0 +1,48 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from app.datasources.review_snapshot import ReviewSnapshot
+from app.datasources.review_snapshot import SourceFingerprint
+from app.datasources.review_store import ReviewSegment
+from benchmarks.synthetic import review_frame
+
+_ROWS = 100
+_TRUNCATED_BYTES = 1001
+
+
+class ReviewSnapshotTest(unittest.TestCase):
+    """Snapshots are reused while the spreadsheet is unchanged."""
+
+    def setUp(self):
+        """Snapshot a stand-in spreadsheet in a temporary directory."""
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.source_path = Path(directory.name) / 'reviews.xlsx'
+        self.source_path.write_bytes(b'spreadsheet')
+        self.snapshot = ReviewSnapshot(str(self.source_path))
+        self.snapshot.write(ReviewSegment.from_columns(review_frame(_ROWS)))
+
+    def test_truncated_snapshot_is_ignored(self):
+        """A cut off snapshot is rebuilt instead of failing the start."""
+        snapshot_path = self.snapshot.segment_file.path
+        snapshot_size = snapshot_path.stat().st_size
+        os.truncate(snapshot_path, snapshot_size - _TRUNCATED_BYTES)
+        self.assertIsNone(self.snapshot.load())
+
+    def test_touched_source_is_fingerprinted_again(self):
+        """After a hash match, the new stat data is recorded."""
+        stat = self.source_path.stat()
+        os.utime(self.source_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+        self.assertEqual(len(self.snapshot.load()), _ROWS)
+        metadata, _ = self.snapshot.segment_file.read()
+        self.assertTrue(
+            SourceFingerprint.quick(self.source_path).matches(
+                SourceFingerprint.model_validate(metadata),
+            ),
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
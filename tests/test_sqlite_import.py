@@ -0,0 +1,47 @@
+import tempfile
+import unittest
+from decimal import Decimal
+from pathlib import Path
+
+import pandas as pd
+
+from app.datasources import SQLiteReviewDatasource
+
+_REVIEW_COUNT = 10
+_FIRST_RATING = 4.5
+
+
+class SpreadsheetImportTest(unittest.TestCase):
+    """The SQLite datasource follows changes of the spreadsheet."""
+
+    def setUp(self):
+        """Import a spreadsheet of equally rated reviews."""
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.xlsx_path = str(Path(directory.name) / 'reviews.xlsx')
+        self.database_path = str(Path(directory.name) / 'reviews.sqlite3')
+        self._import(rating=_FIRST_RATING)
+
+    def test_recounts_edited_ratings(self):
+        """Statistics follow ratings edited in place, at the same count."""
+        self._import(rating=2)
+        statistics = SQLiteReviewDatasource().get_statistics()
+        self.assertEqual(statistics.count, _REVIEW_COUNT)
+        self.assertEqual(statistics.mean_rating, Decimal(2))
+
+    def _import(self, rating: float) -> None:
+        pd.DataFrame({
+            'data': pd.date_range('2024-01-01', periods=_REVIEW_COUNT),
+            'reviewer': [
+                'Reviewer {0}'.format(number)
+                for number in range(_REVIEW_COUNT)
+            ],
+            'testo': 'Buona pizza',
+            'sentiment': 1,
+            'voto': rating,
+        }).to_excel(self.xlsx_path, index=False)
+        SQLiteReviewDatasource.load_from(self.xlsx_path, self.database_path)
+
+
+if __name__ == '__main__':
+    unittest.main()